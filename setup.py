@@ -11,7 +11,9 @@ with open('README.rst') as readme_file:
 with open('HISTORY.rst') as history_file:
     history = history_file.read()
 
-requirements = ['nltk>=3']
+requirements = []
+
+extras_requirements = {'nltk': ['nltk>=3']}
 
 setup_requirements = ['pytest-runner']
 
@@ -25,16 +27,17 @@ setup(
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
         'Natural Language :: English',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
     ],
     description="Python lemmatizer for Turkish",
     install_requires=requirements,
+    extras_require=extras_requirements,
     license="MIT license",
     long_description=readme + '\n\n' + history,
     include_package_data=True,
     keywords='trLemmer',
     name='trLemmer',
+    python_requires='>=3.7',
     packages=find_packages(include=['trLemmer']),
     setup_requires=setup_requirements,
     test_suite='tests',
@@ -9,7 +9,8 @@ from trLemmer.conditions import CombinedCondition, has, HasRootAttribute, Dictio
     HasPhoneticAttribute, DictionaryItemIsAny, NoSurfaceAfterDerivation, HasAnySuffixSurface, HasTail, \
     PreviousMorphemeIs, PreviousStateIs, LastDerivationIs, HasDerivation, PreviousStateIsNot, HasTailSequence, \
     ContainsMorphemeSequence, LastDerivationIsAny, PreviousGroupContains, CurrentGroupContainsAny, \
-    PreviousGroupContainsMorpheme, ContainsMorpheme, PreviousMorphemeIsAny, PreviousStateIsAny
+    PreviousGroupContainsMorpheme, ContainsMorpheme, PreviousMorphemeIsAny, PreviousStateIsAny, compile_condition, \
+    flatten_condition
 from trLemmer.lexicon import RootLexicon
 from trLemmer.morphology import MorphAnalyzer
 from trLemmer.morphotactics import SearchPath, StemTransition, noun_S, SurfaceTransition, SuffixTransition, \
@@ -172,7 +173,7 @@ def beyazlastirici_paths(mt_lexicon):
         st, surface = state
         transition = SurfaceTransition(surface, SuffixTransition(previous_state, st))
         surface_transitions.append(transition)
-        new_attrs = calculate_phonetic_attributes(surface, frozenset(attrs))
+        new_attrs = calculate_phonetic_attributes(surface, attrs)
         new_path = paths[-1].copy(transition, new_attrs)
         paths.append(new_path)
         previous_state = st
@@ -363,3 +364,37 @@ def test_PreviousStateIsAny(beyazlastirici_paths):
 # TODO: SecondaryPosIs
 # TODO: RootSurfaceIs
 # TODO: RootSurfaceIsAny
+
+
+def test_path_summary(beyazlastirici_paths):
+    """Tests that path summaries match a scan of path transitions"""
+    for path in beyazlastirici_paths:
+        summary = path.summary
+        derivations = [t.state for t in path.transitions if t.state.derivative]
+        assert summary.last_derivation == (derivations[-1] if derivations else None)
+        assert summary.morphemes == sum({t.state.morpheme_bit for t in path.transitions})
+    paths = beyazlastirici_paths
+    # <(beyaz_Adj)(beyaz:adjectiveRoot_ST + laş:become_S + verbRoot_S + tır:vCausTır_S + verbRoot_S + ıcı:vAgt_S>
+    assert paths[5].summary.current_group_states == vAgt_S.bit
+    assert paths[5].summary.previous_group_states == vCausTir_S.bit | verbRoot_S.bit
+    assert paths[-1].summary.current_group_states & nom_ST.bit
+
+
+def test_compile_condition(beyazlastirici_paths):
+    """Tests that compiled predicates return the same results as condition trees"""
+    conditions = [
+        has(PhoneticAttribute.LastLetterVowel),
+        not_have(PhoneticAttribute.ExpectsVowel).and_(HasDerivation()),
+        HasTail().and_(has(PhoneticAttribute.LastVowelBack).and_(not_have(PhoneticAttribute.LastLetterVowel))),
+        CurrentGroupContainsAny(vAgt_S).or_(HasAnySuffixSurface().not_()),
+        PreviousStateIs(verbRoot_S).or_(LastDerivationIs(become_S).and_not(HasTail())).not_(),
+        CombinedCondition('AND', [CombinedCondition('OR', [ContainsMorpheme(agt)]), HasTail().not_().not_()]),
+        CombinedCondition('OR', []),
+    ]
+    for condition in conditions:
+        predicate = compile_condition(condition)
+        for path in beyazlastirici_paths:
+            assert predicate(path) == condition.accept(path)
+    assert compile_condition(None) is None
+    flat = flatten_condition(HasTail().and_(HasDerivation().and_(has(PhoneticAttribute.LastVowelBack))).not_().not_())
+    assert flat.operator == 'AND' and len(flat.conditions) == 3
@@ -0,0 +1,61 @@
+import pytest
+
+from trLemmer.tokenizer import Sentence, Token, TurkishTokenizer, load_abbreviations, normalize_token
+
+
+@pytest.fixture(scope='module')
+def tokenizer():
+    return TurkishTokenizer()
+
+
+def test_abbreviations():
+    abbreviations = load_abbreviations()
+    assert {'Dr', 'Prof', 'Alm', 'vb', 'dk'} <= abbreviations
+    # lower case forms are only added for abbreviations without vowels
+    assert 'Ne' in abbreviations and 'ne' not in abbreviations
+
+
+def test_tokenize(tokenizer):
+    assert tokenizer.tokenize("Dr. Ali 3,5 kg elma aldı.") == ['Dr.', 'Ali', '3,5', 'kg', 'elma', 'aldı', '.']
+    assert tokenizer.tokenize("Ankara'da 1.000.000 kişi, 1990’larda 12:30'da.") == \
+        ["Ankara'da", '1.000.000', 'kişi', ',', '1990’larda', "12:30'da", '.']
+    assert tokenizer.tokenize("Türk-İslam... https://example.com/a?b=1. ali@veli.com.tr!?") == \
+        ['Türk-İslam', '...', 'https://example.com/a?b=1', '.', 'ali@veli.com.tr', '!?']
+    assert tokenizer.tokenize("") == []
+    # dotted letter chains and glued abbreviations
+    assert tokenizer.tokenize("T.C. Anayasası") == ['T.C.', 'Anayasası']
+    assert tokenizer.tokenize("Prof.Dr. Ali, Dr.Veli") == ['Prof.Dr.', 'Ali', ',', 'Dr.', 'Veli']
+
+
+def test_split_sentences(tokenizer):
+    text = "Dün geldi. Bugün gitti! \"Neden?\" dedi. Prof. Dr. Ahmet 3. sırada. Elma, armut vb. Sonra çıktı."
+    assert tokenizer.split_sentences(text) == [
+        'Dün geldi.', 'Bugün gitti!', '"Neden?" dedi.', 'Prof. Dr. Ahmet 3. sırada.', 'Elma, armut vb.',
+        'Sonra çıktı.']
+    assert tokenizer.split_sentences("Başlık\n\nPunctuation yok\nama satır var") == \
+        ['Başlık', 'Punctuation yok\nama satır var']
+    assert tokenizer.split_sentences('"Gel!" dedi. (Gitti.) Son') == ['"Gel!" dedi.', '(Gitti.)', 'Son']
+    assert tokenizer.split_sentences("  \n ") == []
+    # ordinals
+    assert tokenizer.split_sentences("1. Dünya Savaşı 1914'te başladı. Bitti.") == \
+        ["1. Dünya Savaşı 1914'te başladı.", 'Bitti.']
+    assert tokenizer.split_sentences("Sonuç 5.\n\nYarın gel.") == ['Sonuç 5.', 'Yarın gel.']
+    # abbreviations and initials
+    assert tokenizer.split_sentences("T.C. Anayasası kabul edildi.") == ['T.C. Anayasası kabul edildi.']
+    assert tokenizer.split_sentences("Prof.Dr. Ali geldi. Ali A. Veli gitti.") == \
+        ['Prof.Dr. Ali geldi.', 'Ali A. Veli gitti.']
+    assert tokenizer.split_sentences("Geldi.Gitti.") == ['Geldi.', 'Gitti.']
+    spans = tokenizer.sentence_spans("Bir. İki.")
+    assert spans == [(0, 4), (5, 9)]
+
+
+def test_sentence_tokens(tokenizer):
+    text = "  İSTİKLÂL Marşı'nı okudu.\nÂşık   geldi!"
+    (first, first_tokens), (second, second_tokens) = tokenizer.sentence_tokens(text)
+    assert first == Sentence("İSTİKLÂL Marşı'nı okudu.", 2, 26)
+    assert first_tokens[:2] == [Token('İSTİKLÂL', 'istiklal', 2, 10), Token("Marşı'nı", 'marşını', 11, 19)]
+    assert second.text == 'Âşık   geldi!' and second_tokens[0].normalized == 'aşık'
+    for sentence, tokens in [(first, first_tokens), (second, second_tokens)]:
+        assert text[sentence.start:sentence.end] == sentence.text
+        assert all(text[t.start:t.end] == t.text and t.normalized == normalize_token(t.text) for t in tokens)
+    assert tokenizer.tokens("") == [] and tokenizer.sentence_tokens("") == []
@@ -3,12 +3,16 @@
 
 """Tests for `trLemmer` package."""
 
+import time
+
 import pytest
 
-from trLemmer.attributes import SecondaryPos, PrimaryPos, calculate_phonetic_attributes
+from trLemmer.attributes import SecondaryPos, PrimaryPos, RootAttribute, PhoneticAttribute, \
+    calculate_phonetic_attributes, attributes_mask, attributes_of, word_attributes, append_attributes
 from trLemmer.lexicon import DictionaryItem, RootLexicon
 from trLemmer.morphology import MorphAnalyzer
-from trLemmer.morphotactics import StemTransition, SearchPath, root_S
+from trLemmer.rulebasedanalyzer import SearchLimits
+from trLemmer.morphotactics import StemTransition, SearchPath, StemTrie, root_S, noun_S
 
 
 @pytest.fixture
@@ -34,6 +38,30 @@ def dict_item():
     return DictionaryItem(lemma, root, primary_pos, secondary_pos, attrs, pronunciation, index)
 
 
+def test_attribute_masks():
+    attrs = calculate_phonetic_attributes("kitap")
+    assert isinstance(attrs, int)
+    assert attrs & PhoneticAttribute.LastLetterVoicelessStop
+    assert attrs & PhoneticAttribute.LastVowelBack and not attrs & PhoneticAttribute.LastVowelFrontal
+    mask = attributes_mask([RootAttribute.Voicing, RootAttribute.Doubling])
+    assert attributes_of(mask, RootAttribute) == [RootAttribute.Voicing, RootAttribute.Doubling]
+    item = DictionaryItem("hak", "hak", PrimaryPos.Noun, SecondaryPos.NONE, {RootAttribute.Doubling}, "hak", 0)
+    assert item.has_attribute(RootAttribute.Doubling) and not item.has_attribute(RootAttribute.Voicing)
+    assert item.has_any_attribute([RootAttribute.Voicing, RootAttribute.Doubling])
+
+
+def test_append_attributes():
+    kitap = calculate_phonetic_attributes("kitap")
+    # surfaces with vowels determine the attributes alone
+    assert calculate_phonetic_attributes("ı", kitap) == word_attributes("ı")
+    assert append_attributes(kitap, word_attributes("ları")) == calculate_phonetic_attributes("kitapları")
+    # surfaces without vowels keep the vowel attributes of the predecessor
+    attrs = calculate_phonetic_attributes("m", calculate_phonetic_attributes("kitabı"))
+    assert attrs & PhoneticAttribute.LastVowelBack and attrs & PhoneticAttribute.LastVowelUnrounded
+    assert attrs & PhoneticAttribute.HasNoVowel and not attrs & PhoneticAttribute.LastLetterVowel
+    assert calculate_phonetic_attributes("", kitap) == kitap
+
+
 def test_DictionaryItem_creation(dict_item):
     assert dict_item.lemma == 'ev'
 
@@ -60,6 +88,26 @@ def test_initial_search_path():
     assert p.stem_transition == transition
 
 
+def test_search_path_copy():
+    from trLemmer.morphotactics import SurfaceTransition, SuffixTransition, become_S, verbRoot_S
+    dict_item = DictionaryItem("beyaz", "beyaz", PrimaryPos.Adjective, SecondaryPos.NONE, [], "beyaz", 0)
+    stem = StemTransition(dict_item, noun_S, calculate_phonetic_attributes("beyaz"), "beyaz")
+    root = SearchPath.initial(stem, "laş")
+    become = root.copy(SurfaceTransition("laş", SuffixTransition(noun_S, become_S, "lAş")))
+    verb = become.copy(SurfaceTransition("", SuffixTransition(become_S, verbRoot_S)))
+    assert verb.parent is become and become.parent is root
+    assert [t.state for t in verb.transitions] == [noun_S, become_S, verbRoot_S]
+    assert [t.state for t in root.transitions] == [noun_S]
+    assert verb.previous_state is become_S and root.previous_state is None
+    assert verb.stem_transition is stem and verb.dict_item is dict_item
+    assert verb.tail == "" and verb.contains_suffix_with_surface and verb.contains_derivation
+    # paths refer to the input word with an offset
+    path = SearchPath.initial(stem, "beyazlaş", 5)
+    assert path.tail == "laş" and path.has_tail
+    path = path.copy(SurfaceTransition("laş", SuffixTransition(noun_S, become_S, "lAş")))
+    assert path.word == "beyazlaş" and path.pos == 8 and not path.has_tail
+
+
 """
 def test_stem_transition():
     from trLemmer.attributes import calculate_phonetic_attributes
@@ -122,6 +170,316 @@ def test_analysis(lex_from_lines):
     # assert 'meyve' in lemmer.lemmatize('meyvesiz')
 
 
+def test_shared_graph(lex_from_lines):
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    ud_lemmer = MorphAnalyzer(lexicon=RootLexicon.from_lines(["elma"]), formatter='UD', graph=lemmer.graph)
+    assert ud_lemmer.graph is lemmer.graph
+    assert ud_lemmer.lemmatize('elmalı') == lemmer.lemmatize('elmalı') == ['elma']
+    with pytest.raises(ValueError):
+        lemmer.graph.add_empty(root_S, noun_S)
+
+
+def test_analysis_cache(lex_from_lines):
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines, cache_size=2)
+    uncached = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, cache_size=None)
+    assert uncached.cache_info() is None
+    assert lemmer.lemmatize('Elmalı') == lemmer.lemmatize('elmalı') == uncached.lemmatize('elmalı')
+    assert lemmer.analyze('elmalı') == lemmer.analyze('elmalı') == uncached.analyze('elmalı')
+    info = lemmer.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (2, 2, 0, 2)
+    assert info.memory > 0
+    # lemma lists and analyses are separate entries, least recently used one is evicted.
+    assert lemmer.lemmatize('meyvesiz') == ['meyve']
+    assert lemmer.cache_info().evictions == 1
+    assert ('analyses', 'elmalı') in lemmer.cache and ('lemmas', 'elmalı') not in lemmer.cache
+    lemmer.cache_clear()
+    assert lemmer.cache_info() == (0, 0, 0, 2, 0, 0)
+
+
+def test_warm_cache(lex_from_lines, tmp_path):
+    from trLemmer.cache import frequent_words
+    assert frequent_words(top_n=4) == ['.', ',', 've', 'bir']
+    path = tmp_path / 'frequencies.txt'
+    path.write_text("elmalı 120\nmeyvesiz 80\n\nbeyazdı 3\n", encoding='utf8')
+    assert frequent_words(path) == ['elmalı', 'meyvesiz', 'beyazdı']
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines, cache_size=4, preload=2, preload_path=path)
+    assert lemmer.cache_info().currsize == 4
+    assert lemmer.lemmatize('elmalı') == ['elma']
+    assert lemmer.cache_info().hits == 1
+    # most frequent words are evicted last
+    assert lemmer.warm_cache(3, path) == 3
+    assert ('lemmas', 'elmalı') in lemmer.cache and ('lemmas', 'beyazdı') not in lemmer.cache
+
+
+def test_disk_cache(lex_from_lines, tmp_path):
+    from trLemmer.cache import AnalysisCache, DiskCache
+    path = tmp_path / 'analyses.db'
+    words = ['elmalı', 'meyvesiz', 'beyazlaştırıcı', 'adağı', 'xyz']
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines, cache_size=None, disk_cache=path)
+    results = [(lemmer.analyze(w), lemmer.lemmatize(w)) for w in words]
+    assert lemmer.disk_cache.info().currsize == 2 * len(words)
+    # a new analyzer reads results of the first one
+    reader = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, disk_cache=path)
+    assert [(reader.analyze(w), reader.lemmatize(w)) for w in words] == results
+    assert reader.disk_cache.info().hits == 2 * len(words)
+    # entries of a different lexicon are not visible
+    other = DiskCache(path, RootLexicon.from_lines(["elma"]))
+    assert other.get(('lemmas', 'elmalı')) is AnalysisCache.MISSING
+    assert other.get(('analyses', 'xyz')) is AnalysisCache.MISSING
+    assert other.info().currsize == 0 and other.info().misses == 2
+    # results depend on the morphotactics graph as well
+    from trLemmer.cache import analysis_version, graph_fingerprint
+    from trLemmer.morphotactics import MorphotacticsGraph, noun_S, a3sg_S
+    assert ' at 0x' not in graph_fingerprint(lemmer.graph)
+    graph = MorphotacticsGraph()
+    graph.add_empty(noun_S, a3sg_S)
+    version = analysis_version(lex_from_lines, graph=lemmer.graph)
+    assert version == analysis_version(lex_from_lines, graph=reader.graph)
+    assert version != analysis_version(lex_from_lines, graph=graph)
+
+
+def test_shared_graph(lex_from_lines):
+    # graph conditions refer to dictionary items by id, a graph built with a lexicon missing them works
+    # for a lexicon that has them.
+    small = MorphAnalyzer(lexicon=lex_from_lines)
+    shared = MorphAnalyzer(graph=small.graph)
+    lemmer = MorphAnalyzer()
+    for word in ['benim', 'bana', 'sana', 'kimse', 'onlar', 'değilim', 'bugünkü', 'hepimiz', 'gibime']:
+        assert shared.analyze(word) == lemmer.analyze(word)
+    assert len(lemmer.analyze('benim')) == 4
+
+
+def test_analysis_cache_threads(lex_from_lines):
+    from concurrent.futures import ThreadPoolExecutor
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines, cache_size=3)
+    uncached = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, cache_size=None)
+    words = ['elmalı', 'meyvesiz', 'beyazdı', 'adağı', 'elmalarımızdan'] * 40
+    expected = [sorted(uncached.lemmatize(w)) for w in words]
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lemmer.lemmatize, words))
+    assert [sorted(lemmas) for lemmas in results] == expected
+    info = lemmer.cache_info()
+    assert info.hits + info.misses == len(words) and info.currsize == 3
+
+
+def test_batch(lex_from_lines):
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    words = ['elmalı', 'Elmalı', 'meyvesiz', 'xyz', 'elmalı', 'beyazlaştırıcı']
+    assert lemmer.lemmatize_batch(words) == [lemmer.lemmatize(w) for w in words]
+    lemmer.cache_clear()
+    assert lemmer.analyze_batch(iter(words)) == [lemmer.analyze(w) for w in words]
+    # distinct normalized forms are analyzed once
+    assert lemmer.cache_info().misses == 4
+    batch = lemmer.lemmatize_batch(['elmalı', 'elmalı'])
+    batch[0].append('x')
+    assert batch[1] == ['elma']
+    assert lemmer.analyze_batch([]) == lemmer.lemmatize_batch([]) == []
+
+
+def test_parallel(lex_from_lines):
+    from trLemmer.parallel import ParallelMorphAnalyzer
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    text = "Elmalı meyvesiz. Beyazlaştırıcı elmalarımızdan. Adağı beyazdı. " * 10
+    with ParallelMorphAnalyzer(lemmer, workers=2, chunk_size=4) as parallel_lemmer:
+        assert parallel_lemmer.lemmatize_text(text) == lemmer.lemmatize_text(text)
+        pool = parallel_lemmer.pool
+        assert parallel_lemmer.analyze_text(text) == lemmer.analyze_text(text)
+        assert parallel_lemmer.pool is pool
+        assert parallel_lemmer.lemmatize_text(text, offsets=True) == lemmer.lemmatize_text(text, offsets=True)
+        assert parallel_lemmer.analyze_text(text, offsets=True) == lemmer.analyze_text(text, offsets=True)
+        # workers share the deadline of the call
+        assert parallel_lemmer.analyze_text("Meyveliydi elmalarımız.", timeout=-1)[0][1][0][0].truncated
+    assert parallel_lemmer._pool is None
+
+
+def test_stream(lex_from_lines, monkeypatch):
+    import io
+    from trLemmer import morphology
+    monkeypatch.setattr(morphology, 'STREAM_READ_SIZE', 7)
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    lines = ["Elmalı meyvesiz. Beyazlaştırıcı", "elmalarımızdan. Adağı", "beyazdı."]
+    text = "\n".join(lines)
+    expected = lemmer.lemmatize_text(text)
+    assert list(lemmer.lemmatize_stream(io.StringIO(text))) == expected
+    assert [sentence for sentence, _ in lemmer.lemmatize_stream(iter(lines))] == [s for s, _ in expected]
+    assert list(lemmer.analyze_stream(io.StringIO(text))) == lemmer.analyze_text(text)
+    # unfinished text is not split again for every short line
+    scanned = []
+    lines = ["elma armut kiraz"] * 5000
+
+    def splitter(piece):
+        scanned.append(len(piece))
+        return morphology.split_sentences(piece)
+    assert len(list(morphology.stream_sentences(iter(lines), splitter))) == 1
+    assert sum(scanned) < 3 * len("\n".join(lines))
+    # text without sentence ends is not kept indefinitely
+    monkeypatch.setattr(morphology, 'MAX_SENTENCE_LENGTH', 20)
+    assert len(list(morphology.stream_sentences(io.StringIO("elma " * 20)))) > 1
+
+
+def test_async(lex_from_lines):
+    import asyncio
+    from trLemmer.aio import AsyncMorphAnalyzer
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    words = ['elmalı', 'meyvesiz', 'elmalı', 'xyz', 'beyazlaştırıcı', 'elmalı']
+
+    async def run(executor):
+        async with AsyncMorphAnalyzer(lemmer, window=0.01, max_batch=3, executor=executor) as async_lemmer:
+            lemmas = await asyncio.gather(*[async_lemmer.lemmatize(w) for w in words])
+            analyses = await asyncio.gather(*[async_lemmer.analyze(w) for w in words])
+            lemmas[0].append('x')
+            return lemmas, analyses
+
+    for executor in ['thread', 'process']:
+        lemmas, analyses = asyncio.run(run(executor))
+        assert lemmas[1:] == [lemmer.lemmatize(w) for w in words[1:]]
+        assert analyses == [lemmer.analyze(w) for w in words]
+    with pytest.raises(ValueError):
+        AsyncMorphAnalyzer(lemmer, executor='fiber')
+
+
+def test_text_offsets(lex_from_lines):
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    text = "Elmalı  meyvesiz. BEYAZLAŞTIRICI elmalarımızdan!"
+    plain = lemmer.lemmatize_text(text)
+    with_offsets = lemmer.lemmatize_text(text, offsets=True)
+    assert [s.text for s, _ in with_offsets] == [s for s, _ in plain]
+    for (sentence, words), (_, plain_words) in zip(with_offsets, plain):
+        assert text[sentence.start:sentence.end] == sentence.text
+        assert [(token.text, lemmas) for token, lemmas in words] == plain_words
+        assert all(text[token.start:token.end] == token.text for token, _ in words)
+    token, lemmas = with_offsets[1][1][0]
+    assert (token.start, token.end, token.normalized, lemmas) == (18, 32, 'beyazlaştırıcı', ['beyaz'])
+    analyses = lemmer.analyze_text(text, offsets=True)
+    assert [parses for _, words in analyses for _, parses in words] == \
+        [parses for _, words in lemmer.analyze_text(text) for parses in words]
+
+
+def test_compiled_engine(lex_from_lines):
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    graph_lemmer = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, engine='graph')
+    compiled = lemmer.analyzer.compiled
+    assert len(compiled) == len(compiled.transitions)
+    assert compiled.states[compiled.state_id(noun_S)] is noun_S
+    for word in ['beyazlaştırıcı', 'elmalı', 'elmalarımızdan', 'meyvesiz', 'adağı', 'beyazdı']:
+        assert lemmer.analyze(word) == graph_lemmer.analyze(word)
+
+
+def test_search_limits(lex_from_lines, tmp_path):
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    words = ['beyazlaştırıcı', 'elmalarımızdan', 'meyvesizleştirilmişlerdenmişsiniz',
+             'elmalıymışsınızcasına']
+    for engine in ['compiled', 'graph']:
+        # cyclic paths are pruned at every step, analyses without repeating suffixes are kept.
+        pruning = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, engine=engine,
+                                search_limits=SearchLimits(prune_threshold=0))
+        for word in words:
+            result = pruning.analyzer.analyze_result(word)
+            assert not result.truncated
+            assert list(result.analyses) == lemmer.analyzer.analyze(word)
+        for limits in [SearchLimits(max_paths=2), SearchLimits(max_expansions=10)]:
+            bounded = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, engine=engine, search_limits=limits)
+            assert bounded.analyzer.analyze_result('elmalarımızdan').truncated
+            assert all(parse.truncated for parse in bounded.analyze('elmalarımızdan'))
+            assert not any(parse.truncated for parse in bounded.analyze('elma'))
+    assert not any(parse.truncated for parse in lemmer.analyze('elmalarımızdan'))
+    # states passed after every derivation do not count as repeats, pruned paths mark the result truncated.
+    full = MorphAnalyzer(cache_size=None)
+    for engine in ['compiled', 'graph']:
+        pruning = MorphAnalyzer(lexicon=full.lexicon, graph=full.graph, engine=engine,
+                                search_limits=SearchLimits(prune_threshold=0))
+        result = pruning.analyzer.analyze_result('ettirilmeyebilecekler')
+        assert len(result.analyses) == len(full.analyzer.analyze('ettirilmeyebilecekler')) == 2
+        assert not result.truncated
+        assert pruning.analyzer.analyze_result('ettirttirttirttirttir') == ((), True)
+    # garbage input does bounded work.
+    limited = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, search_limits=SearchLimits(max_expansions=50))
+    assert limited.analyzer.analyze_result('elmalar' * 200).analyses == ()
+    # cached results keep the flag.
+    bounded = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, search_limits=SearchLimits(max_paths=2),
+                            cache_size=None, disk_cache=tmp_path / 'cache.db')
+    bounded.analyze('elmalarımızdan')
+    assert bounded.disk_cache.get(('analyses', 'elmalarımızdan')).truncated
+
+
+def test_deadline(lex_from_lines):
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines)
+    graph_lemmer = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, engine='graph')
+    for analyzer in [lemmer.analyzer, graph_lemmer.analyzer]:
+        assert analyzer.analyze_result('elmalarımızdan', time.monotonic() - 1) == ((), True)
+        assert not analyzer.analyze_result('elmalarımızdan', time.monotonic() + 60).truncated
+        assert analyzer.stem_lemmas('elmalarımızdan') == ('elma',)
+        assert analyzer.stem_lemmas('xyz') == ()
+    # expired deadlines give truncated parses and stem lemmas, which are not cached.
+    parses = lemmer.analyze('elmalarımızdan', timeout=-1)
+    assert [(p.lemma, p.truncated) for p in parses] == [('Unk', True)]
+    assert lemmer.lemmatize('beyazlaştırıcı', timeout=-1) == ['beyaz']
+    assert lemmer.lemmatize_batch(['elmalı', 'xyz'], timeout=-1) == [['elma'], ['xyz']]
+    assert lemmer.lemmatize_text('Elmalı meyvesiz.', timeout=-1) == \
+        [('Elmalı meyvesiz.', [('Elmalı', ['elma']), ('meyvesiz', ['meyve']), ('.', ['.'])])]
+    assert lemmer.cache_info().currsize == 0
+    assert not any(p.truncated for p in lemmer.analyze('elmalarımızdan', timeout=60))
+    assert lemmer.lemmatize('elmalı', timeout=60) == ['elma']
+    assert lemmer.cache_info().currsize == 2
+    # cached results are returned after the deadline.
+    assert lemmer.analyze('elmalarımızdan', timeout=-1) == lemmer.analyze('elmalarımızdan')
+    assert lemmer.analyze_text('Elmalı.', timeout=-1)[0][1][0][0].truncated
+
+
+def test_lemma_search(lex_from_lines, monkeypatch):
+    from trLemmer import rulebasedanalyzer
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines, cache_size=None)
+    graph_lemmer = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, engine='graph')
+    words = ['beyazlaştırıcı', 'elmalarımızdan', 'adağı', 'beyaz', 'beyazdı', 'xyz']
+    expected = {w: tuple(dict.fromkeys(a.dict_item.lemma for a in lemmer.analyzer.analyze(w))) for w in words}
+    for analyzer in [lemmer.analyzer, graph_lemmer.analyzer]:
+        assert {w: analyzer.lemmas_result(w) for w in words} == {w: (expected[w], False) for w in words}
+    # lemma search stops following a lemma at its first accepted path.
+    assert len(lemmer.analyzer.search(lemmer.analyzer.initial_paths('adağı'), lemmas_only=True).paths) == 1
+    assert len(lemmer.analyzer.search(lemmer.analyzer.initial_paths('adağı')).paths) > 1
+    # analyses are not built for lemmatization.
+    monkeypatch.setattr(rulebasedanalyzer, 'parse_analysis', None)
+    assert lemmer.lemmatize('beyazlaştırıcı') == ['beyaz']
+    assert lemmer.lemmatize_batch(['elmalı', 'xyz']) == [['elma'], ['xyz']]
+
+
+def test_is_valid(lex_from_lines, tmp_path):
+    from trLemmer.cache import AnalysisCache
+    lemmer = MorphAnalyzer(lexicon=lex_from_lines, disk_cache=tmp_path / 'cache.db')
+    graph_lemmer = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, engine='graph')
+    words = ['beyazlaştırıcı', 'Elmalarımızdan', 'adağı', 'adakı', 'elmaxyz', 'xyz', '']
+    expected = [True, True, True, False, False, False, False]
+    for analyzer in [lemmer, graph_lemmer]:
+        assert [analyzer.is_valid(w) for w in words] == expected
+        assert analyzer.is_valid_batch(words + words) == expected + expected
+        assert len(analyzer.analyzer.first_path('adağı').paths) == 1
+    assert lemmer.analyzer.first_path('adağı').paths[0].dict_item.lemma == 'adak'
+    # negative results are cached, in memory and on disk.
+    assert lemmer.cache.get(('valid', 'elmaxyz')) is False
+    assert lemmer.disk_cache.get(('valid', 'elmaxyz')) is False
+    assert lemmer.disk_cache.get(('valid', 'adağı')) is True
+    # searches stopped by the limits are not cached.
+    limited = MorphAnalyzer(lexicon=lex_from_lines, graph=lemmer.graph, search_limits=SearchLimits(max_expansions=1),
+                            disk_cache=tmp_path / 'limited.db')
+    assert limited.analyzer.first_path('elmalarımızdan') == ([], True)
+    assert not limited.is_valid('elmalarımızdan')
+    assert limited.is_valid_batch(['elmalarımızdan']) == [False]
+    assert limited.cache.get(('valid', 'elmalarımızdan')) is AnalysisCache.MISSING
+    assert limited.disk_cache.get(('valid', 'elmalarımızdan')) is AnalysisCache.MISSING
+    assert limited.cache_info().currsize == 0
+
+
+def test_surface_table(lex_from_lines):
+    from trLemmer.compiled import surface_key
+    from trLemmer.morphotactics import generate_surface
+    compiled = MorphAnalyzer(lexicon=lex_from_lines).analyzer.compiled
+    for word in ['kitap', 'elma', 'gül', 'kuzu', 'ağaç']:
+        attrs = calculate_phonetic_attributes(word)
+        for outgoing in compiled.transitions:
+            for row in outgoing:
+                assert row.surfaces[surface_key(attrs)] == generate_surface(row.transition, attrs)
+
+
 def test_default_lexicon():
     lex = RootLexicon.default_text_dictionaries()
     print(len(lex))
@@ -129,9 +487,97 @@ def test_default_lexicon():
     assert len(lex) > 0
 
 
+def test_stem_trie():
+    trie = StemTrie()
+    for surface in ['ev', 'evlat', 'evli', 'e', 'elma', 'ev']:
+        trie.add(surface, surface)
+    assert trie.prefix_matches('evlatlar') == ['e', 'ev', 'ev', 'evlat']
+    assert trie.prefix_matches('elmalar') == ['e', 'elma']
+    assert trie.prefix_matches('araba') == []
+    assert trie.find('evl').transitions == []
+    assert trie.find('evle') is None
+    assert trie.find('evli').transitions == ['evli']
+
+
+def test_binary_lexicon():
+    lex = RootLexicon.from_binary()
+    text_lex = RootLexicon.default_text_dictionaries()
+    assert set(lex.id_dict) == set(text_lex.id_dict)
+    different = [id_ for id_, item in text_lex.id_dict.items()
+                 if (item.pronunciation, item.attributes) != (lex.id_dict[id_].pronunciation,
+                                                              lex.id_dict[id_].attributes)]
+    # dummy roots of compounds copy attributes of the first item with the referenced lemma ("oğul" of
+    # "âdemoğlu"), items of a lemma are ordered differently in the binary lexicon.
+    assert all(text_lex.id_dict[id_].has_attribute(RootAttribute.Dummy) for id_ in different)
+    assert len(different) < 25
+    assert lex.get_item_by_id('Bde_Noun_Abbrv').pronunciation == 'bedee'
+    assert lex.get_item_by_id('FIFA_Noun_Abbrv').pronunciation == 'fifa'
+    elma = lex.get_item_by_id('elma_Noun')
+    assert elma.root == 'elma'
+    assert elma.pronunciation == 'elma'
+    adak = lex.get_item_by_id('adak_Noun')
+    assert adak.has_attribute(RootAttribute.Voicing)
+    gelmek = lex.get_item_by_id('gelmek_Verb')
+    assert gelmek.root == 'gel'
+    # compound roots keep a reference to the original item
+    zeytinyag = lex.get_item_by_id('zeytinyağ_Noun')
+    assert zeytinyag.ref_item == lex.get_item_by_id('zeytinyağı_Noun')
+
+
+def test_guessed_abbreviations():
+    lemmer = MorphAnalyzer()
+    # abbreviations read as words with a guessed pronunciation do not take suffixes
+    words = ['gibi', 'kendi', 'para', 'baba', 'kafa', 'resim', 'Bursa', 'burda', 'Doğu', 'doğum', 'valla']
+    for word in words:
+        assert not any(p.dict_item.secondary_pos == SecondaryPos.Abbreviation
+                       for p in lemmer.analyzer.analyze(word.lower())), word
+    assert 'Gib' not in lemmer.lemmatize('gibi')
+    assert lemmer.lemmatize('Gib') == ['Gib']
+    assert lemmer.lemmatize("ABD'ye") == ['ABD']
+
+
+def test_snapshot(tmp_path, monkeypatch):
+    from trLemmer import snapshot
+    path = tmp_path / 'analyzer.snapshot'
+    lemmer = MorphAnalyzer.from_snapshot(path)
+    assert path.exists()
+    loaded = MorphAnalyzer.from_snapshot(path)
+    for word in ['beyazlaştıracak', 'gideceğimizi', 'zeytinyağı', 'benim']:
+        assert loaded.analyze(word) == lemmer.analyze(word)
+    # preloaded entries are stored in a snapshot without cache entries
+    assert MorphAnalyzer.from_snapshot(path, preload=20).cache_info().currsize > 0
+    assert MorphAnalyzer.from_snapshot(path).cache_info().currsize > 0
+    # warm cache entries are stored in the snapshot
+    lemmer.cache_clear()
+    lemmer.warm_cache(50)
+    lemmer.save_snapshot(path, with_cache=True)
+    warm = MorphAnalyzer.from_snapshot(path)
+    assert warm.cache_info().currsize == lemmer.cache_info().currsize > 0
+    assert warm.lemmatize('bir') == lemmer.lemmatize('bir')
+    assert warm.cache_info().hits == 1
+    # constructor arguments are accepted by workers loading the snapshot
+    from trLemmer.parallel import ParallelMorphAnalyzer
+    from trLemmer.rulebasedanalyzer import RuleBasedAnalyzer
+    with ParallelMorphAnalyzer(snapshot=path, workers=1, tokenizer='native', engine='graph') as parallel_lemmer:
+        assert type(parallel_lemmer.analyzer.analyzer) is RuleBasedAnalyzer
+        assert parallel_lemmer.lemmatize_text('Elmalar.') == lemmer.lemmatize_text('Elmalar.')
+    # loaded analyzers are freed like any other object
+    import gc
+    import weakref
+    morphotactics = weakref.ref(MorphAnalyzer.from_snapshot(path).morphotactics)
+    gc.collect()
+    assert morphotactics() is None
+    # snapshot is rebuilt when sources change
+    monkeypatch.setattr(snapshot, 'source_hash', lambda: 'changed')
+    assert snapshot.load_snapshot(path) is None
+    MorphAnalyzer.from_snapshot(path)
+    assert snapshot.load_snapshot(path) is not None
+
+
 def test_sentence():
     lemmer = MorphAnalyzer()
     sentence = "Hakkıdır hakka tapan milletimin istiklâl!"
     # sentence = "Seçimlerinde yaptıklarımız"
     result = lemmer._lemmatize_sentence(sentence)
     print(result)
+    assert [word for word, _ in result] == ['Hakkıdır', 'hakka', 'tapan', 'milletimin', 'istiklâl', '!']
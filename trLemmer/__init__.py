@@ -7,5 +7,7 @@ __email__ = 'obulat@gmail.com'
 __version__ = '0.1.0'
 
 from .morphology import MorphAnalyzer
+from .parallel import ParallelMorphAnalyzer
+from .rulebasedanalyzer import SearchLimits
 
-__all__ = ['MorphAnalyzer']
+__all__ = ['MorphAnalyzer', 'ParallelMorphAnalyzer', 'SearchLimits']
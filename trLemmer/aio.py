@@ -0,0 +1,141 @@
+"""
+Asyncio front end of the analyzer.
+
+Analysis is CPU bound and blocks the event loop. `AsyncMorphAnalyzer` collects words requested by
+coroutines during a short window, and analyzes them as one deduplicated batch on an executor.
+"""
+import asyncio
+import concurrent.futures
+import multiprocessing
+
+from trLemmer import parallel
+from trLemmer.morphology import MorphAnalyzer
+
+
+def _analyze_batch(words):
+    return parallel._analyzer.analyze_batch(words)
+
+
+def _lemmatize_batch(words):
+    return parallel._analyzer.lemmatize_batch(words)
+
+
+def _lemmatize_text(text):
+    return parallel._analyzer.lemmatize_text(text)
+
+
+def _analyze_text(text):
+    return parallel._analyzer.analyze_text(text)
+
+
+class AsyncMorphAnalyzer:
+    """
+    Awaitable analysis methods of a `MorphAnalyzer`.
+
+        >>> from trLemmer.aio import AsyncMorphAnalyzer
+        >>> async with AsyncMorphAnalyzer(window=0.002) as lemmer:
+        ...     lemmas = await lemmer.lemmatize('kitapları')
+
+    Words requested within `window` seconds, or until `max_batch` distinct words are pending, are
+    analyzed with one `analyze_batch` or `lemmatize_batch` call, and each caller gets the result of its
+    own word.
+
+    With `executor='thread'` batches run on a thread of this process. With `executor='process'` they run
+    in `workers` worker processes, forked with `analyzer` (only where the fork start method is
+    available), so several batches are analyzed in parallel.
+    """
+
+    def __init__(self, analyzer=None, window=0.005, max_batch=256, executor='thread', workers=1):
+        self.analyzer = analyzer if analyzer is not None else MorphAnalyzer()
+        self.window = window
+        self.max_batch = max_batch
+        if executor == 'thread':
+            self.executor = concurrent.futures.ThreadPoolExecutor(workers)
+            self._functions = {'analyze': self.analyzer.analyze_batch, 'lemmatize': self.analyzer.lemmatize_batch,
+                               'analyze_text': self.analyzer.analyze_text,
+                               'lemmatize_text': self.analyzer.lemmatize_text}
+        elif executor == 'process':
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context('fork'), initializer=parallel._init_worker,
+                initargs=(self.analyzer, None, {}))
+            self._functions = {'analyze': _analyze_batch, 'lemmatize': _lemmatize_batch,
+                               'analyze_text': _analyze_text, 'lemmatize_text': _lemmatize_text}
+        else:
+            raise ValueError(f"Unknown executor {executor}, should be 'thread' or 'process'")
+        # pending requests of each kind, futures of callers keyed by word.
+        self._pending = {'analyze': {}, 'lemmatize': {}}
+        self._flush_handles = {}
+        # batches running on the executor.
+        self._batches = set()
+
+    async def analyze(self, word):
+        """ Same as `MorphAnalyzer.analyze`. """
+        return await self._request('analyze', word)
+
+    async def lemmatize(self, word):
+        """ Same as `MorphAnalyzer.lemmatize`. """
+        return await self._request('lemmatize', word)
+
+    async def analyze_text(self, text):
+        """ Same as `MorphAnalyzer.analyze_text`, the text is analyzed on the executor. """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._functions['analyze_text'],
+                                                                text)
+
+    async def lemmatize_text(self, text):
+        """ Same as `MorphAnalyzer.lemmatize_text`, the text is lemmatized on the executor. """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._functions['lemmatize_text'],
+                                                                text)
+
+    def _request(self, kind, word):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending[kind]
+        pending.setdefault(word, []).append(future)
+        if len(pending) >= self.max_batch:
+            self._flush(kind)
+        elif kind not in self._flush_handles:
+            self._flush_handles[kind] = loop.call_later(self.window, self._flush, kind)
+        return future
+
+    def _flush(self, kind):
+        handle = self._flush_handles.pop(kind, None)
+        if handle is not None:
+            handle.cancel()
+        pending = self._pending[kind]
+        if not pending:
+            return
+        self._pending[kind] = {}
+        words = list(pending)
+        batch = asyncio.get_running_loop().run_in_executor(self.executor, self._functions[kind], words)
+        self._batches.add(batch)
+        batch.add_done_callback(self._batches.discard)
+        batch.add_done_callback(lambda f: _resolve(f, words, pending))
+
+    async def close(self):
+        """ Analyzes pending requests and stops the executor. """
+        for kind in self._pending:
+            self._flush(kind)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+def _resolve(batch, words, pending):
+    """ Sets results of a finished `batch` of `words` to the futures of their callers. """
+    exception = batch.exception() if not batch.cancelled() else asyncio.CancelledError()
+    results = batch.result() if exception is None else None
+    for i, word in enumerate(words):
+        for future in pending[word]:
+            if future.done():
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                # every caller gets its own list.
+                future.set_result(list(results[i]))
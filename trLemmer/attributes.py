@@ -1,7 +1,7 @@
 import functools
-from enum import Enum, auto
+from enum import Enum, IntFlag, auto
 import sys
-from typing import Set, Union, NamedTuple
+from typing import Union, NamedTuple
 
 # print(sys.path)
 # sys.path.pop(0)
@@ -78,8 +78,11 @@ class PosInfo(NamedTuple):
     secondary_pos: SecondaryPos = SecondaryPos.NONE
 
 
-class RootAttribute(Enum):
-    """These represents attributes of roots."""
+class RootAttribute(IntFlag):
+    """
+    These represents attributes of roots. Each attribute is a single bit, attributes of a dictionary item
+    are kept as an int bitmask.
+    """
 
     # Generally Present tense (Aorist) suffix has the form [Ir]; such as gel-ir, bul-ur, kapat-ır.
     # But for most verbs with single syllable and compound verbs it forms as [Ar].
@@ -239,10 +242,14 @@ class RootAttribute(Enum):
     Unknown = 0
 
 
-RootAttribute_set = {x.name: x for x in list(RootAttribute)}
+RootAttribute_set = dict(RootAttribute.__members__)
 
 
-class PhoneticAttribute(Enum):
+class PhoneticAttribute(IntFlag):
+    """
+    Phonetic attributes of a word or a search path. Each attribute is a single bit, attributes are kept
+    as an int bitmask.
+    """
     # Turkish vowels are: [a, e, ı, i, o, ö, u, ü]
     # Turkish consonants are: [b, c, ç, d, f, g, ğ, h, j, k, l, m, n, p, r, s, ş, t, v, y, z]
     HasVowel = auto()
@@ -279,92 +286,137 @@ class PhoneticAttribute(Enum):
     CannotTerminate = auto()
 
 
-no_vowel_attrs = [PhoneticAttribute.LastLetterConsonant, PhoneticAttribute.FirstLetterConsonant,
-                  PhoneticAttribute.HasNoVowel]
+def attributes_mask(attributes) -> int:
+    """ Bitmask of an iterable of `PhoneticAttribute` or `RootAttribute` values. """
+    mask = 0
+    for attribute in attributes:
+        mask |= attribute
+    return int(mask)
 
 
-@functools.lru_cache(maxsize=128, typed=False)
-def calculate_phonetic_attributes(word: str, predecessor_attrs=None) -> Set[PhoneticAttribute]:
+def attributes_of(mask: int, attribute_type):
+    """ List of `attribute_type` members set in `mask`, in definition order. """
+    return [attribute for attribute in attribute_type if mask & attribute]
+
+
+# plain int values of attributes, int operations with IntFlag members are much slower than with ints.
+_LastLetterVowel = int(PhoneticAttribute.LastLetterVowel)
+_LastLetterConsonant = int(PhoneticAttribute.LastLetterConsonant)
+_LastLetterVoiceless = int(PhoneticAttribute.LastLetterVoiceless)
+_LastLetterVoicelessStop = int(PhoneticAttribute.LastLetterVoicelessStop)
+_LastVowelBack = int(PhoneticAttribute.LastVowelBack)
+_LastVowelFrontal = int(PhoneticAttribute.LastVowelFrontal)
+_LastVowelRounded = int(PhoneticAttribute.LastVowelRounded)
+_LastVowelUnrounded = int(PhoneticAttribute.LastVowelUnrounded)
+_FirstLetterVowel = int(PhoneticAttribute.FirstLetterVowel)
+_FirstLetterConsonant = int(PhoneticAttribute.FirstLetterConsonant)
+_ExpectsConsonant = int(PhoneticAttribute.ExpectsConsonant)
+
+no_vowel_attrs = attributes_mask([PhoneticAttribute.LastLetterConsonant, PhoneticAttribute.FirstLetterConsonant,
+                                  PhoneticAttribute.HasNoVowel])
+
+
+_HasNoVowel = int(PhoneticAttribute.HasNoVowel)
+
+
+def _letter_attributes(letter: str) -> int:
+    if letter in tr.vowels_lower_set:
+        return _LastLetterVowel
+    result = _LastLetterConsonant
+    if letter in tr.consonants_voiceless_set:
+        result |= _LastLetterVoiceless
+        if letter in tr.consonants_voiceless_stop_set:
+            result |= _LastLetterVoicelessStop
+    return result
+
+
+def _vowel_attributes(vowel: str) -> int:
+    result = _LastVowelBack if vowel in tr.vowels_back_set else _LastVowelFrontal
+    return result | (_LastVowelRounded if vowel in tr.vowels_rounded_set else _LastVowelUnrounded)
+
+
+# attributes a letter contributes as the last letter of a word, and vowels as the last vowel.
+# Letters not in the tables are consonants with no other attribute.
+LAST_LETTER_ATTRIBUTES = {letter: _letter_attributes(letter) for letter in tr.all_lower_set}
+LAST_VOWEL_ATTRIBUTES = {vowel: _vowel_attributes(vowel) for vowel in tr.vowels_lower_set}
+
+
+@functools.lru_cache(maxsize=4096)
+def word_attributes(word: str) -> int:
+    """
+    Phonetic attributes of a non empty lower case `word` alone. Words without vowels get
+    HasNoVowel, their attributes depend on the preceding letters as well, see `append_attributes`.
+    """
+    result = LAST_LETTER_ATTRIBUTES.get(word[-1], _LastLetterConsonant)
+    for letter in reversed(word):
+        vowel_attributes = LAST_VOWEL_ATTRIBUTES.get(letter)
+        if vowel_attributes is not None:
+            result |= vowel_attributes
+            break
+    else:
+        return result | no_vowel_attrs
+    return result | (_FirstLetterVowel if word[0] in LAST_VOWEL_ATTRIBUTES else _FirstLetterConsonant)
+
+
+def append_attributes(predecessor_attrs: int, attrs: int) -> int:
+    """
+    Phonetic attributes of a word after a surface with `word_attributes` `attrs` is appended to a word with
+    `predecessor_attrs`. Only surfaces without vowels inherit attributes of the predecessor.
+    """
+    if attrs & _HasNoVowel:
+        return (attrs | predecessor_attrs) & ~(_LastLetterVowel | _ExpectsConsonant)
+    return attrs
+
+
+def calculate_phonetic_attributes(word: str, predecessor_attrs: int = None) -> int:
     # the word should be in lower case
     if len(word) == 0:
         return predecessor_attrs
-    result = set()
-    last_letter = word[-1]
-    if last_letter in tr.vowels_lower_set:
-        result.add(PhoneticAttribute.LastLetterVowel)
-        last_vowel = last_letter
-    else:
-        result.add(PhoneticAttribute.LastLetterConsonant)
-        if last_letter in tr.consonants_voiceless_set:
-            result.add(PhoneticAttribute.LastLetterConsonant)
-            result.add(PhoneticAttribute.LastLetterVoiceless)
-            if last_letter in tr.consonants_voiceless_stop_set:
-                result.add(PhoneticAttribute.LastLetterVoicelessStop)
-        last_vowel = tr.get_last_vowel(word)
-    if last_vowel is not None:
-        if last_vowel in tr.vowels_back_set:
-            result.add(PhoneticAttribute.LastVowelBack)
-        else:
-            result.add(PhoneticAttribute.LastVowelFrontal)
-        if last_vowel in tr.vowels_rounded_set:
-            result.add(PhoneticAttribute.LastVowelRounded)
-        else:
-            result.add(PhoneticAttribute.LastVowelUnrounded)
-    if word[0] in tr.vowels_lower_set:
-        result.add(PhoneticAttribute.FirstLetterVowel)
-    else:
-        result.add(PhoneticAttribute.FirstLetterConsonant)
-    if last_vowel is None:
-        result.update(predecessor_attrs)
-        result.update(no_vowel_attrs)
-        result.discard(PhoneticAttribute.LastLetterVowel)
-        result.discard(PhoneticAttribute.ExpectsConsonant)
-
-    return result
+    return append_attributes(predecessor_attrs or 0, word_attributes(word))
 
 
-def parse_attr_data(data: str) -> Set:
-    attrs: Set = set()
+def parse_attr_data(data: str) -> int:
+    attrs = 0
     tokens = [_.strip() for _ in data.split(",")]
     for s in tokens:
         if s not in RootAttribute_set:
             raise ValueError(f"Unrecognized attribute data {s} in data chunk:{data}")
         root_attribute = RootAttribute_set.get(s)
-        attrs.add(root_attribute)
-    return attrs
+        attrs |= root_attribute
+    return int(attrs)
 
 
-def infer_morphemic_attributes(word: str, pos_data, attrs: Set = None) -> Set:
-    result = attrs if attrs is not None else set()
+def infer_morphemic_attributes(word: str, pos_data, attrs: int = None) -> int:
+    result = attrs if attrs is not None else 0
     last = word[-1]
     last_char_is_vowel = tr.is_vowel(last)
     vowel_count = tr.vowel_count(word)
     if pos_data.primary_pos == PrimaryPos.Verb:
         #  if a verb ends with a wovel, and -Iyor suffix is appended, last vowel drops.
         if last_char_is_vowel:
-            result.add(RootAttribute.ProgressiveVowelDrop)
-            result.add(RootAttribute.Passive_In)
+            result |= RootAttribute.ProgressiveVowelDrop
+            result |= RootAttribute.Passive_In
         # if verb has more than 1 syllable and there is no Aorist_A label, add Aorist_I.
-        if vowel_count > 1 and RootAttribute.Aorist_A not in result:
-            result.add(RootAttribute.Aorist_I)
+        if vowel_count > 1 and not result & RootAttribute.Aorist_A:
+            result |= RootAttribute.Aorist_I
         # if verb has 1 syllable and there is no Aorist_I label, add Aorist_A
-        if vowel_count == 1 and RootAttribute.Aorist_A not in result:
-            result.add(RootAttribute.Aorist_A)
+        if vowel_count == 1 and not result & RootAttribute.Aorist_I:
+            result |= RootAttribute.Aorist_A
         if last == 'l':
-            result.add(RootAttribute.Passive_In)
+            result |= RootAttribute.Passive_In
         if last_char_is_vowel or (last == 'l' or last == 'r') and vowel_count > 1:
-            result.add(RootAttribute.Causative_t)
-    elif pos_data.primary_pos.value in ['Noun', 'Adjective', 'Duplicator']:
+            result |= RootAttribute.Causative_t
+    elif pos_data.primary_pos in (PrimaryPos.Noun, PrimaryPos.Adjective, PrimaryPos.Duplicator):
         # if a noun or adjective has more than one syllable and last letter is a stop consonant, add voicing.
         if vowel_count > 1 \
             and tr.is_voiceless_stop_consonant(last) \
             and pos_data.secondary_pos not in [SecondaryPos.ProperNoun, SecondaryPos.Abbreviation] \
-            and RootAttribute.NoVoicing not in result \
-            and RootAttribute.InverseHarmony not in result:
-            result.add(RootAttribute.Voicing)
-        if len(word) > 1 and (word.endswith('nk') or word.endswith('og')):
-            if RootAttribute.NoVoicing not in result and pos_data.secondary_pos != SecondaryPos.ProperNoun:
-                result.add(RootAttribute.Voicing)
-            elif vowel_count < 2 and RootAttribute.Voicing not in result:
-                result.add(RootAttribute.NoVoicing)
-    return result
+            and not result & RootAttribute.NoVoicing \
+            and not result & RootAttribute.InverseHarmony:
+            result |= RootAttribute.Voicing
+        if word.endswith('nk') or word.endswith('og'):
+            if not result & RootAttribute.NoVoicing and pos_data.secondary_pos != SecondaryPos.ProperNoun:
+                result |= RootAttribute.Voicing
+        elif vowel_count < 2 and not result & RootAttribute.Voicing:
+            result |= RootAttribute.NoVoicing
+    return int(result)
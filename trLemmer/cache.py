@@ -0,0 +1,278 @@
+"""
+Word level cache of analysis results.
+
+Word frequencies in running text follow Zipf's law, a small set of words makes up most of the tokens.
+`AnalysisCache` keeps results of recently analyzed words, so repeated words skip the graph search.
+`DiskCache` keeps results in an sqlite database, which processes and repeated runs can share.
+"""
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from trLemmer import __version__
+
+# words of a Turkish corpus, most frequent first.
+FREQUENT_WORDS_RESOURCE = Path(__file__).parent / 'resources' / 'tr' / 'first-10K'
+
+# version of the `encode_result` format and of search behaviour not covered by the limits, part of
+# `analysis_version`.
+CACHE_FORMAT = 2
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a cache. `memory` is an estimate of the cached data size in bytes for an `AnalysisCache`,
+    and the database file size for a `DiskCache`.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+    memory: int
+
+
+def _estimate_size(key, value) -> int:
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    if isinstance(key, tuple):
+        size += sum(sys.getsizeof(k) for k in key)
+    if isinstance(value, (tuple, list)):
+        size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+class AnalysisCache:
+    """
+    Thread safe least recently used cache with a fixed number of entries.
+
+        >>> cache = AnalysisCache(maxsize=2)
+        >>> cache.put(('lemmas', 'elma'), ('elma',))
+        >>> cache.get(('lemmas', 'elma'))
+        ('elma',)
+
+    Cached values are shared by all callers, they should be immutable.
+    """
+
+    # returned by `get` for keys that are not in the cache, None is a valid cached value.
+    MISSING = object()
+
+    def __init__(self, maxsize: int = 100000):
+        if maxsize < 1:
+            raise ValueError(f"Cache size should be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._memory = 0
+
+    def get(self, key: Hashable) -> Any:
+        """ Returns the cached value of `key` or `AnalysisCache.MISSING`. """
+        with self._lock:
+            value = self._entries.get(key, AnalysisCache.MISSING)
+            if value is AnalysisCache.MISSING:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """ Caches `value` for `key`. Least recently used entries are evicted when the cache is full. """
+        size = _estimate_size(key, value)
+        with self._lock:
+            if key in self._entries:
+                self._memory -= self._sizes[key]
+                self._entries.move_to_end(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._memory += size
+            while len(self._entries) > self.maxsize:
+                old_key, _ = self._entries.popitem(last=False)
+                self._memory -= self._sizes.pop(old_key)
+                self._evictions += 1
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """ (key, value) pairs of all entries, least recently used first. """
+        with self._lock:
+            return list(self._entries.items())
+
+    def update(self, entries: Iterable[Tuple[Hashable, Any]]):
+        """ Caches all (key, value) pairs of `entries`, in order. """
+        for key, value in entries:
+            self.put(key, value)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries),
+                             self._memory)
+
+    def clear(self):
+        """ Removes all entries and resets statistics. """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._hits = self._misses = self._evictions = self._memory = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def frequent_words(path=None, top_n: int = None) -> List[str]:
+    """
+    Reads a word frequency list, one word per line and most frequent first. Anything after the first
+    whitespace of a line (e.g. a count column) is ignored.
+    :param path: frequency list file, the bundled first-10K list by default.
+    :param top_n: number of words to read, all words if None.
+    """
+    words = []
+    with open(path if path is not None else FREQUENT_WORDS_RESOURCE, encoding='utf8') as f:
+        for line in f:
+            if top_n is not None and len(words) >= top_n:
+                break
+            fields = line.split()
+            if fields:
+                words.append(fields[0])
+    return words
+
+
+def graph_fingerprint(graph) -> str:
+    """
+    Description of the suffix transitions of a morphotactics `graph`: states, surface templates and
+    conditions of every transition, in a stable order.
+    """
+    lines = []
+    for state in sorted(graph.outgoing, key=lambda s: s.id_):
+        for transition in graph.transitions_from(state):
+            lines.append(f"{state.id_}>{transition.to_.id_}:{transition.surface_template}:{transition.condition!r}")
+    return '\n'.join(lines)
+
+
+def analysis_version(lexicon, limits=None, graph=None) -> str:
+    """
+    Hash of the package version, `CACHE_FORMAT`, the dictionary items of `lexicon`, search `limits`
+    (`SearchLimits`) and the morphotactics `graph`, cached results depend on all of them.
+    """
+    h = hashlib.sha256(f"{__version__}:{CACHE_FORMAT}".encode('utf8'))
+    if limits is not None:
+        h.update(repr(tuple(limits)).encode('utf8'))
+    if graph is not None:
+        h.update(graph_fingerprint(graph).encode('utf8'))
+    for item in sorted(lexicon.id_dict.values(), key=lambda i: i.id_):
+        h.update(f"{item.id_}:{item.pronunciation}:{item.attributes}\n".encode('utf8'))
+    return h.hexdigest()[:16]
+
+
+def encode_result(kind: str, value) -> str:
+    """ Compact encoding of a cached result, dictionary items and morphemes are stored by their ids. """
+    if kind in ('lemmas', 'valid'):
+        return json.dumps(value, ensure_ascii=False)
+    return json.dumps(
+        [[[a.dict_item.id_, a.stem, [[m.id_, surface] for m, surface in a.morphemes], a.derivation_count,
+           a.group_boundaries] for a in value.analyses], value.truncated],
+        ensure_ascii=False, separators=(',', ':'))
+
+
+def decode_result(kind: str, data: str, lexicon):
+    """ Decodes a result encoded with `encode_result`. Returns None if it refers to unknown items. """
+    from trLemmer.morphotactics import morphemes
+    from trLemmer.rulebasedanalyzer import AnalysisResult, SingleAnalysis
+    value = json.loads(data)
+    if kind == 'lemmas':
+        return tuple(value)
+    if kind == 'valid':
+        return value
+    analyses, truncated = value
+    result = []
+    for item_id, stem, morpheme_data, derivation_count, group_boundaries in analyses:
+        dict_item = lexicon.get_item_by_id(item_id)
+        if dict_item is None:
+            return None
+        result.append(SingleAnalysis(stem, [(morphemes[m], surface) for m, surface in morpheme_data],
+                                     derivation_count, dict_item, group_boundaries))
+    return AnalysisResult(tuple(result), truncated)
+
+
+class DiskCache:
+    """
+    Analysis results stored in an sqlite database. Entries are keyed by (kind, normalized word) and the
+    `analysis_version` of the lexicon, so databases can be shared by analyzers with different lexicons
+    and stale results are never returned. Many processes can read and write the same file.
+    """
+
+    def __init__(self, path, lexicon, version: str = None):
+        self.path = str(path)
+        self.lexicon = lexicon
+        self.version = version if version is not None else analysis_version(lexicon)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (version TEXT, kind TEXT, word TEXT, value TEXT, "
+                "PRIMARY KEY (version, kind, word)) WITHOUT ROWID")
+
+    def _connection(self):
+        # sqlite connections can not be shared by threads or inherited by forked processes.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=60)
+            # write ahead log lets readers work while another process writes.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: Tuple[str, str]) -> Any:
+        """ Returns the stored result for (kind, word) `key` or `AnalysisCache.MISSING`. """
+        kind, word = key
+        row = self._connection().execute(
+            "SELECT value FROM results WHERE version = ? AND kind = ? AND word = ?",
+            (self.version, kind, word)).fetchone()
+        value = decode_result(kind, row[0], self.lexicon) if row is not None else None
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return AnalysisCache.MISSING
+            self._hits += 1
+        return value
+
+    def put(self, key: Tuple[str, str], value):
+        kind, word = key
+        with self._connection() as connection:
+            connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                               (self.version, kind, word, encode_result(kind, value)))
+
+    def info(self) -> CacheInfo:
+        count, = self._connection().execute("SELECT COUNT(*) FROM results WHERE version = ?",
+                                            (self.version,)).fetchone()
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, 0, None, count, os.path.getsize(self.path))
+
+    def clear(self):
+        """ Removes entries of all versions and resets statistics. """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM results")
+        with self._lock:
+            self._hits = self._misses = 0
+
+    def close(self):
+        """ Closes the connection of the calling thread. """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
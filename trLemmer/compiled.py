@@ -0,0 +1,286 @@
+"""
+Compiled morphotactics tables.
+
+`MorphotacticsGraph` keeps outgoing transitions as lists of `SuffixTransition` objects keyed by
+`MorphemeState`. During search that means a dictionary lookup per path, property calls for every
+transition and string comparisons for every suffix template token. `CompiledGraph` converts a frozen
+graph into integer indexed tables once, and `CompiledAnalyzer` runs the search on those tables.
+"""
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from trLemmer import tr
+from trLemmer.attributes import PhoneticAttribute, word_attributes
+from trLemmer.conditions import compile_condition
+from trLemmer.morphotactics import SearchPath, SuffixTransition, SurfaceTransition
+from trLemmer.rulebasedanalyzer import RuleBasedAnalyzer, SearchLimits, SearchResult
+
+# integer codes of suffix template token types.
+LETTER, A_VOWEL, I_VOWEL, APPEND, DEVOICE_FIRST, LAST_VOICED, LAST_NOT_VOICED = range(7)
+NO_TOKEN = -1
+
+TOKEN_CODES = {
+    "LETTER": LETTER,
+    "A_VOWEL": A_VOWEL,
+    "I_VOWEL": I_VOWEL,
+    "APPEND": APPEND,
+    "DEVOICE_FIRST": DEVOICE_FIRST,
+    "LAST_VOICED": LAST_VOICED,
+    "LAST_NOT_VOICED": LAST_NOT_VOICED,
+}
+
+_LastLetterVowel = int(PhoneticAttribute.LastLetterVowel)
+_LastLetterVoiceless = int(PhoneticAttribute.LastLetterVoiceless)
+_LastVowelBack = int(PhoneticAttribute.LastVowelBack)
+_LastVowelFrontal = int(PhoneticAttribute.LastVowelFrontal)
+_LastVowelUnrounded = int(PhoneticAttribute.LastVowelUnrounded)
+_CannotTerminate = int(PhoneticAttribute.CannotTerminate)
+_ExpectsVowel = int(PhoneticAttribute.ExpectsVowel)
+_ExpectsConsonant = int(PhoneticAttribute.ExpectsConsonant)
+_HasNoVowel = int(PhoneticAttribute.HasNoVowel)
+
+# surface of a suffix template only depends on these attributes of the preceding letters.
+SURFACE_ATTRIBUTES = (_LastLetterVowel, _LastLetterVoiceless, _LastVowelBack, _LastVowelFrontal,
+                      _LastVowelUnrounded)
+SURFACE_MASK = _LastLetterVowel | _LastLetterVoiceless | _LastVowelBack | _LastVowelFrontal | _LastVowelUnrounded
+
+
+def surface_key(phonetic_attributes: int) -> int:
+    """ Key of `phonetic_attributes` in suffix surface tables. """
+    return phonetic_attributes & SURFACE_MASK
+
+
+class CompiledTransition(NamedTuple):
+    """
+    A suffix transition as a row of the outgoing transitions table of a state.
+    `surfaces[surface_key(attributes)]` is the surface form generated after a path with `attributes`,
+    or None if template cannot be realized with those attributes. `attributes` holds `word_attributes` of
+    the surfaces with the same keys.
+    """
+    target: int
+    tokens: Tuple[Tuple[int, str], ...]
+    surfaces: Dict[int, Optional[str]]
+    attributes: Dict[int, int]
+    predicate: Optional[Callable]
+    last_token: int
+    transition: SuffixTransition
+
+    @property
+    def has_surface_form(self):
+        return len(self.tokens) > 0
+
+
+def compile_template(transition: SuffixTransition):
+    return tuple((TOKEN_CODES[token.type_], token.letter) for token in transition.token_list)
+
+
+def compiled_surface(tokens, phonetic_attributes) -> str:
+    """ Same as `morphotactics.generate_surface`, for integer coded template tokens. """
+    index = 0
+    result = []
+    for code, letter in tokens:
+        if code == LETTER or code == LAST_VOICED or code == LAST_NOT_VOICED:
+            result.append(letter)
+        elif code == A_VOWEL:
+            if index == 0 and phonetic_attributes & _LastLetterVowel:
+                continue
+            if phonetic_attributes & _LastVowelBack:
+                result.append("a")
+            elif phonetic_attributes & _LastVowelFrontal:
+                result.append("e")
+            else:
+                raise ValueError(f"Cannot generate A form from {phonetic_attributes}")
+        elif code == I_VOWEL:
+            if index == 0 and phonetic_attributes & _LastLetterVowel:
+                continue
+            elif phonetic_attributes & _LastVowelFrontal:
+                result.append("i" if phonetic_attributes & _LastVowelUnrounded else "ü")
+            elif phonetic_attributes & _LastVowelBack:
+                result.append("ı" if phonetic_attributes & _LastVowelUnrounded else "u")
+            else:
+                raise ValueError(f"Cannot generate I form from {phonetic_attributes}")
+        elif code == APPEND:
+            if phonetic_attributes & _LastLetterVowel:
+                result.append(letter)
+        elif code == DEVOICE_FIRST:
+            result.append(tr.devoice(letter) if phonetic_attributes & _LastLetterVoiceless else letter)
+        index += 1
+    return "".join(result)
+
+
+def surface_table(tokens) -> Dict[int, Optional[str]]:
+    """ Surface forms of template `tokens` for all surface keys. """
+    table = {}
+    for n in range(1 << len(SURFACE_ATTRIBUTES)):
+        key = 0
+        for bit, attribute in enumerate(SURFACE_ATTRIBUTES):
+            if n & (1 << bit):
+                key |= attribute
+        try:
+            table[key] = compiled_surface(tokens, key)
+        except ValueError:
+            table[key] = None
+    return table
+
+
+class CompiledGraph:
+    """
+    Integer indexed form of a frozen `MorphotacticsGraph`.
+    States and morphemes get consecutive ids, `transitions[state_id]` holds the outgoing transitions of
+    a state with target state ids and integer coded surface templates. `terminal`, `derivative` and
+    `state_morphemes` (morpheme ids) are indexed by state id as well.
+    """
+
+    def __init__(self, graph):
+        states = {}
+        for state, transitions in graph.outgoing.items():
+            states.setdefault(state, len(states))
+            for transition in transitions:
+                states.setdefault(transition.to_, len(states))
+        self.state_ids = states
+        self.states = list(states)
+        self.morpheme_ids = {}
+        for state in self.states:
+            self.morpheme_ids.setdefault(state.morpheme.id_, len(self.morpheme_ids))
+        self.state_morphemes = tuple(self.morpheme_ids[s.morpheme.id_] for s in self.states)
+        self.terminal = tuple(s.terminal for s in self.states)
+        self.derivative = tuple(s.derivative for s in self.states)
+        self.transitions = tuple(
+            tuple(self._compile_transition(t) for t in graph.transitions_from(state))
+            for state in self.states
+        )
+
+    def _compile_transition(self, transition: SuffixTransition) -> CompiledTransition:
+        tokens = compile_template(transition)
+        surfaces = surface_table(tokens)
+        return CompiledTransition(
+            self.state_ids[transition.to_],
+            tokens,
+            surfaces,
+            {key: word_attributes(surface) for key, surface in surfaces.items() if surface},
+            transition.predicate if transition.predicate is not None else compile_condition(transition.condition),
+            tokens[-1][0] if tokens else NO_TOKEN,
+            transition,
+        )
+
+    def state_id(self, state):
+        """ Id of `state`, or None if state has no transitions in the graph. """
+        return self.state_ids.get(state)
+
+    def __len__(self):
+        return len(self.states)
+
+
+class CompiledAnalyzer(RuleBasedAnalyzer):
+    """
+    Rule based analyzer that searches the `CompiledGraph` of the morphotactics graph instead of the
+    object graph. It produces the same analyses as `RuleBasedAnalyzer`.
+    """
+
+    def __init__(self, morphotactics, limits: SearchLimits = None):
+        super().__init__(morphotactics, limits)
+        self.compiled = CompiledGraph(self.graph)
+
+    def search(self, current_paths, deadline: float = None, lemmas_only=False) -> SearchResult:
+        state_id = self.compiled.state_id
+        transitions = self.compiled.transitions
+        terminal = self.compiled.terminal
+        max_expansions = self.limits.max_expansions
+        # frontiers up to this size need no pruning.
+        bound_size = min(self.limits.prune_threshold, self.limits.max_paths)
+        expansions = 0
+        truncated = False
+        found = set() if lemmas_only else None
+        # search frontier holds (state id, path) pairs.
+        frontier = [(state_id(p.current_state), p) for p in current_paths]
+        result = []
+        while frontier:
+            if deadline is not None and time.monotonic() > deadline:
+                truncated = True
+                break
+            if len(frontier) > bound_size or expansions + len(frontier) > max_expansions:
+                frontier, dropped = self.bound_paths(frontier, expansions)
+                truncated |= dropped
+            expansions += len(frontier)
+            new_frontier = []
+            for sid, path in frontier:
+                if found is not None and path.stem_transition.dict_item.lemma in found:
+                    continue
+                if path.pos == len(path.word):
+                    is_terminal = path.terminal if sid is None else terminal[sid]
+                    if is_terminal and not path.phonetic_attributes & _CannotTerminate:
+                        result.append(path)
+                        if found is not None:
+                            found.add(path.stem_transition.dict_item.lemma)
+                        continue
+                if sid is None:
+                    continue
+                self.advance_compiled(path, transitions[sid], new_frontier)
+            frontier = new_frontier
+        return SearchResult(result, truncated)
+
+    def first_path(self, word) -> SearchResult:
+        state_id = self.compiled.state_id
+        transitions = self.compiled.transitions
+        terminal = self.compiled.terminal
+        max_expansions = self.limits.max_expansions
+        # prefix matches are ordered by length, longest stems are popped first.
+        stack = [(state_id(p.current_state), p) for p in self.initial_paths(word)]
+        expansions = 0
+        while stack:
+            if expansions >= max_expansions:
+                return SearchResult([], True)
+            expansions += 1
+            sid, path = stack.pop()
+            if path.pos == len(path.word):
+                is_terminal = path.terminal if sid is None else terminal[sid]
+                if is_terminal and not path.phonetic_attributes & _CannotTerminate:
+                    return SearchResult([path], False)
+            if sid is None:
+                continue
+            new_frontier = []
+            self.advance_compiled(path, transitions[sid], new_frontier)
+            new_frontier.reverse()
+            stack.extend(new_frontier)
+        return SearchResult([], False)
+
+    @staticmethod
+    def advance_compiled(path: SearchPath, outgoing, new_frontier):
+        """
+        Appends (state id, path) pairs for all `outgoing` compiled transitions that `path` can pass
+        to `new_frontier`.
+        """
+        word = path.word
+        pos = path.pos
+        has_tail = pos < len(word)
+        attrs = path.phonetic_attributes
+        key = attrs & SURFACE_MASK
+        for target, tokens, surfaces, surface_attributes, predicate, last_token, transition in outgoing:
+            if not tokens:
+                # epsilon (empty) transition. Use existing attributes.
+                if predicate is None or predicate(path):
+                    new_frontier.append((target, path.copy(SurfaceTransition("", transition), attrs)))
+                continue
+            if not has_tail:
+                continue
+            surface = surfaces[key]
+            if surface is None:
+                # raises the error for attributes template cannot be realized with.
+                surface = compiled_surface(tokens, attrs)
+            if not word.startswith(surface, pos):
+                continue
+            if predicate is not None and not predicate(path):
+                continue
+            if pos + len(surface) == len(word):
+                attributes = attrs
+            else:
+                # attributes of the appended surface, only surfaces without vowels inherit from the path.
+                attributes = surface_attributes[key]
+                if attributes & _HasNoVowel:
+                    attributes = (attributes | attrs) & ~(_LastLetterVowel | _ExpectsConsonant)
+            attributes &= ~_CannotTerminate
+            if last_token == LAST_VOICED:
+                attributes |= _ExpectsConsonant
+            elif last_token == LAST_NOT_VOICED:
+                attributes |= _ExpectsVowel | _CannotTerminate
+            new_frontier.append((target, path.copy(SurfaceTransition(surface, transition), attributes)))
@@ -1,9 +1,43 @@
 from typing import Union
 
-from trLemmer.attributes import RootAttribute, PhoneticAttribute
+from trLemmer.attributes import RootAttribute, PhoneticAttribute, attributes_mask
+
+# Morphemes and morpheme states are numbered with bits, so search paths can keep sets of them as int
+# bitsets and history conditions can be checked with a single `&`.
+_morpheme_bits = {}
+
+
+def morpheme_bit(morpheme):
+    bit = _morpheme_bits.get(morpheme.id_)
+    if bit is None:
+        bit = _morpheme_bits[morpheme.id_] = 1 << len(_morpheme_bits)
+    return bit
+
+
+def morphemes_mask(morphemes):
+    mask = 0
+    for morpheme in morphemes:
+        mask |= morpheme_bit(morpheme)
+    return mask
+
+
+def states_mask(states):
+    mask = 0
+    for state in states:
+        mask |= state.bit
+    return mask
+
+
+def _item_id(dict_item):
+    # graph conditions refer to dictionary items by id, so a graph can be used with any lexicon.
+    return dict_item if dict_item is None or isinstance(dict_item, str) else dict_item.id_
 
 
 class Condition:
+    # relative cost of `accept`, used for ordering clauses when conditions are compiled.
+    # 0: flags and phonetic attributes of the path, 1: dictionary item and previous state,
+    # 2: path summary, 3: scans path transitions.
+    cost = 2
 
     def accept(self, path):
         raise NotImplementedError
@@ -67,6 +101,9 @@ class CombinedCondition(Condition):
                     return True
             return False
 
+    def __repr__(self):
+        return f"({f' {self.operator} '.join(repr(c) for c in self.conditions)})"
+
     def __len__(self):
         if len(self.conditions) == 0:
             return 0
@@ -97,11 +134,14 @@ def not_have(attribute: Union[RootAttribute, PhoneticAttribute]):
 
 # tested
 class HasRootAttribute(Condition):
+    cost = 1
+
     def __init__(self, attribute):
         self.attribute = attribute
+        self.mask = int(attribute)
 
     def accept(self, path):
-        return path.dict_item.has_attribute(self.attribute)  # TODO test
+        return path.dict_item.attributes & self.mask != 0
 
     def __repr__(self):
         return f"HasRootAttribute({self.attribute})"
@@ -109,11 +149,14 @@ class HasRootAttribute(Condition):
 
 # tested
 class HasAnyRootAttribute(Condition):
+    cost = 1
+
     def __init__(self, attributes):
         self.attributes = attributes
+        self.mask = attributes_mask(attributes)
 
     def accept(self, path):
-        return path.dict_item.has_any_attribute(self.attributes)
+        return path.dict_item.attributes & self.mask != 0
 
     def __repr__(self):
         return f"HasAnyRootAttribute({self.attributes})"
@@ -121,11 +164,14 @@ class HasAnyRootAttribute(Condition):
 
 # tested
 class HasPhoneticAttribute(Condition):
+    cost = 0
+
     def __init__(self, attribute):
         self.attribute = attribute
+        self.mask = int(attribute)
 
     def accept(self, path):
-        return self.attribute in path.phonetic_attributes
+        return path.phonetic_attributes & self.mask != 0
 
     def __repr__(self):
         return f"HasPhoneticAttribute({self.attribute})"
@@ -133,17 +179,22 @@ class HasPhoneticAttribute(Condition):
 
 # tested
 class DictionaryItemIs(Condition):
+    """ Accepts paths of the dictionary item with the given id. `dict_item` can be an item or its id. """
+    cost = 1
+
     def __init__(self, dict_item):
-        self.dict_item = dict_item
+        self.dict_item = _item_id(dict_item)
 
     def accept(self, path):
-        return self.dict_item is not None and path.dict_item == self.dict_item
+        return self.dict_item is not None and path.dict_item.id_ == self.dict_item
 
     def __repr__(self):
         return f"DictionaryItemIs({self.dict_item})"
 
 
 class SecondaryPosIs(Condition):
+    cost = 1
+
     def __init__(self, pos):
         self.pos = pos
 
@@ -156,18 +207,23 @@ class SecondaryPosIs(Condition):
 
 # tested
 class DictionaryItemIsAny(Condition):
+    """ Accepts paths of any of the dictionary items, given as items or ids, or a single list of them. """
+    cost = 1
+
     def __init__(self, *items):
-        # Temporary:
-        self.items = [item for item in items if item is not None]
+        if len(items) == 1 and isinstance(items[0], (list, tuple)):
+            items = items[0]
+        self.items = {_item_id(item) for item in items if item is not None}
 
     def accept(self, path):
-        return path.dict_item in self.items
+        return path.dict_item.id_ in self.items
 
     def __repr__(self):
-        return f"DictionaryItemIsAny({self.items})"
+        return f"DictionaryItemIsAny({sorted(self.items)})"
 
 
 class HasAnySuffixSurface(Condition):
+    cost = 0
 
     def accept(self, path):
         return path.contains_suffix_with_surface
@@ -179,15 +235,18 @@ class HasAnySuffixSurface(Condition):
 # tested
 class HasTail(Condition):
     # accepts if path has letters to consume.
+    cost = 0
 
     def accept(self, path):
-        return len(path.tail) != 0
+        return path.pos < len(path.word)
 
     def __repr__(self):
         return "HasTail{}"
 
 
 class HasTailSequence(Condition):
+    cost = 3
+
     def __init__(self, *morphemes):
         self.morphemes = morphemes
 
@@ -205,6 +264,8 @@ class HasTailSequence(Condition):
 
 
 class ContainsMorphemeSequence(Condition):
+    cost = 3
+
     def __init__(self, *morphemes):
         self.morphemes = morphemes
 
@@ -228,6 +289,8 @@ class ContainsMorphemeSequence(Condition):
 
 # tested
 class PreviousMorphemeIs(Condition):
+    cost = 1
+
     def __init__(self, morpheme):
         self.morpheme = morpheme
 
@@ -241,6 +304,8 @@ class PreviousMorphemeIs(Condition):
 
 # tested
 class PreviousStateIs(Condition):
+    cost = 1
+
     def __init__(self, state):
         self.state = state
 
@@ -254,6 +319,8 @@ class PreviousStateIs(Condition):
 
 # tested
 class PreviousStateIsNot(Condition):
+    cost = 1
+
     def __init__(self, state):
         self.state = state
 
@@ -266,6 +333,8 @@ class PreviousStateIsNot(Condition):
 
 
 class RootSurfaceIs(Condition):
+    cost = 1
+
     def __init__(self, surface):
         self.surface = surface
 
@@ -277,6 +346,8 @@ class RootSurfaceIs(Condition):
 
 
 class RootSurfaceIsAny(Condition):
+    cost = 1
+
     def __init__(self, *surfaces):
         self.surfaces = surfaces
 
@@ -298,11 +369,7 @@ class LastDerivationIs(Condition):
         self.state = state
 
     def accept(self, path):
-        suffixes = path.transitions
-        for sf in reversed(suffixes):
-            if sf.state.derivative:
-                return sf.state == self.state
-        return False
+        return path.summary.last_derivation is self.state
 
     def __repr__(self):
         return f"LastDerivationIs({self.state})"
@@ -312,11 +379,7 @@ class LastDerivationIs(Condition):
 class HasDerivation(Condition):
 
     def accept(self, path):
-        suffixes = path.transitions
-        for suffix in suffixes:
-            if suffix.state.derivative:
-                return True
-        return False
+        return path.summary.last_derivation is not None
 
     def __repr__(self):
         return "HasDerivation"
@@ -326,13 +389,11 @@ class HasDerivation(Condition):
 class LastDerivationIsAny(Condition):
     def __init__(self, *states):
         self.states = states
+        self.mask = states_mask(states)
 
     def accept(self, path):
-        suffixes = path.transitions
-        for sf in reversed(suffixes):
-            if sf.state.derivative:
-                return sf.state in self.states
-        return False
+        last_derivation = path.summary.last_derivation
+        return last_derivation is not None and (last_derivation.bit & self.mask) != 0
 
     def __repr__(self):
         return f"LastDerivationIsAny({self.states})"
@@ -346,16 +407,10 @@ class CurrentGroupContainsAny(Condition):
 
     def __init__(self, *states):
         self.states = states
+        self.mask = states_mask(states)
 
     def accept(self, path):
-        suffixes = path.transitions
-        for sf in reversed(suffixes):
-            if sf.state in self.states:
-                return True
-            if sf.state.derivative:
-                return False
-
-        return False
+        return (path.summary.current_group_states & self.mask) != 0
 
     def __repr__(self):
         return f"CurrentGroupContainsAny({self.states})"
@@ -369,22 +424,10 @@ class PreviousGroupContains(Condition):
 
     def __init__(self, *states):
         self.states = states
+        self.mask = states_mask(states)
 
     def accept(self, path):
-        suffixes = path.transitions
-        last_index = len(suffixes) - 1
-        sf = suffixes[last_index]
-        while not sf.state.derivative:
-            if last_index == 0:
-                return False
-            last_index -= 1
-            sf = suffixes[last_index]
-        for sf in reversed(suffixes[:last_index]):
-            if sf.state in self.states:
-                return True
-            if sf.state.derivative:
-                return False
-        return False
+        return (path.summary.previous_group_states & self.mask) != 0
 
     def __repr__(self):
         return f"PreviousGroupContains({self.states})"
@@ -398,22 +441,10 @@ class PreviousGroupContainsMorpheme(Condition):
 
     def __init__(self, *morphemes):
         self.morphemes = morphemes
+        self.mask = morphemes_mask(morphemes)
 
     def accept(self, path):
-        suffixes = path.transitions
-        last_index = len(suffixes) - 1
-        sf = suffixes[last_index]
-        while not sf.state.derivative:
-            if last_index == 0:
-                return False
-            last_index -= 1
-            sf = suffixes[last_index]
-        for sf in reversed(suffixes[:last_index]):
-            if sf.state.morpheme in self.morphemes:
-                return True
-            if sf.state.derivative:
-                return False
-        return False
+        return (path.summary.previous_group_morphemes & self.mask) != 0
 
     def __repr__(self):
         morpheme_str = ', '.join([m.id_ for m in self.morphemes])
@@ -428,13 +459,7 @@ class NoSurfaceAfterDerivation(Condition):
     """
 
     def accept(self, path):
-        suffixes = path.transitions
-        for sf in reversed(suffixes):
-            if sf.state.derivative or sf.is_derivational_or_root:  # TODO: check this
-                return True
-            if not len(sf.surface) == 0:
-                return False
-        return True
+        return not path.summary.surface_after_derivation
 
     def __repr__(self):
         return "NoSurfaceAfterDerivation{}"
@@ -443,13 +468,10 @@ class NoSurfaceAfterDerivation(Condition):
 class ContainsMorpheme(Condition):
     def __init__(self, *morphemes):
         self.morphemes = morphemes
+        self.mask = morphemes_mask(morphemes)
 
     def accept(self, path):
-        suffixes = path.transitions
-        for suffix in suffixes:
-            if suffix.state.morpheme in self.morphemes:
-                return True
-        return False
+        return (path.summary.morphemes & self.mask) != 0
 
     def __repr__(self):
         morphemes_str = ', '.join([m.id_ for m in self.morphemes])
@@ -458,6 +480,8 @@ class ContainsMorpheme(Condition):
 
 class PreviousMorphemeIsAny(Condition):
     """Second before last morpheme"""
+    cost = 1
+
     def __init__(self, *morphemes):
         self.morphemes = morphemes
 
@@ -470,6 +494,7 @@ class PreviousMorphemeIsAny(Condition):
 
 
 class PreviousStateIsAny(Condition):
+    cost = 1
 
     def __init__(self, *states):
         self.states = states
@@ -477,3 +502,104 @@ class PreviousStateIsAny(Condition):
     def accept(self, path):
         previous_state = path.previous_state
         return previous_state is not None and previous_state in self.states
+
+    def __repr__(self):
+        return f"PreviousStateIsAny({self.states})"
+
+
+def condition_cost(condition):
+    if type(condition) == CombinedCondition:
+        return sum(condition_cost(c) for c in condition.conditions)
+    if type(condition) == NotCondition:
+        return condition_cost(condition.condition)
+    return condition.cost
+
+
+def flatten_condition(condition):
+    """
+    Returns a condition equal to `condition` where nested AND and OR groups are merged into their
+    parents, single element groups are replaced by their element and double negations are removed.
+    """
+    if type(condition) == NotCondition:
+        inner = flatten_condition(condition.condition)
+        if type(inner) == NotCondition:
+            return inner.condition
+        return NotCondition(inner)
+    if type(condition) != CombinedCondition or len(condition.conditions) == 0:
+        return condition
+    if len(condition.conditions) == 1:
+        return flatten_condition(condition.conditions[0])
+    conditions = []
+    for c in condition.conditions:
+        c = flatten_condition(c)
+        if type(c) == CombinedCondition and c.operator == condition.operator and len(c.conditions) > 0:
+            conditions.extend(c.conditions)
+        else:
+            conditions.append(c)
+    return CombinedCondition(condition.operator, conditions)
+
+
+def compile_condition(condition):
+    """
+    Compiles a condition tree into a single predicate function of a search path, that returns the same
+    result as `condition.accept`. Condition tree is flattened, clauses of AND and OR groups are ordered
+    by their cost and phonetic attribute checks of an AND group are merged into one set operation.
+    Returns None if condition is None.
+    """
+    if condition is None:
+        return None
+    return _predicate(flatten_condition(condition))
+
+
+def _predicate(condition):
+    if type(condition) == HasPhoneticAttribute:
+        return _attributes_predicate(condition.mask, 0)
+    if type(condition) == NotCondition:
+        inner = condition.condition
+        if type(inner) == HasPhoneticAttribute:
+            return _attributes_predicate(0, inner.mask)
+        inner_predicate = _predicate(inner)
+        return lambda path: not inner_predicate(path)
+    if type(condition) != CombinedCondition or len(condition.conditions) < 2:
+        return condition.accept
+    clauses = sorted(condition.conditions, key=condition_cost)
+    if condition.operator == 'AND':
+        required, forbidden, rest = 0, 0, []
+        for c in clauses:
+            if type(c) == HasPhoneticAttribute:
+                required |= c.mask
+            elif type(c) == NotCondition and type(c.condition) == HasPhoneticAttribute:
+                forbidden |= c.condition.mask
+            else:
+                rest.append(c)
+        predicates = [_predicate(c) for c in rest]
+        if required or forbidden:
+            predicates.insert(0, _attributes_predicate(required, forbidden))
+        return _all(predicates)
+    return _any([_predicate(c) for c in clauses])
+
+
+def _attributes_predicate(required: int, forbidden: int):
+    if not forbidden:
+        if required & (required - 1) == 0:
+            return lambda path: path.phonetic_attributes & required != 0
+        return lambda path: path.phonetic_attributes & required == required
+    if not required:
+        return lambda path: path.phonetic_attributes & forbidden == 0
+    return lambda path: path.phonetic_attributes & (required | forbidden) == required
+
+
+def _all(predicates):
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda path: first(path) and second(path)
+    return lambda path: all(p(path) for p in predicates)
+
+
+def _any(predicates):
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda path: first(path) or second(path)
+    return lambda path: any(p(path) for p in predicates)
@@ -2,10 +2,10 @@ import re
 from collections import namedtuple
 from enum import Enum
 from pathlib import Path
-from typing import List, Set
+from typing import Iterable, List, Union
 
 from trLemmer.attributes import RootAttribute, PrimaryPos, SecondaryPos, primary_pos_set, \
-    secondary_pos_set, parse_attr_data, infer_morphemic_attributes, PosInfo
+    secondary_pos_set, parse_attr_data, infer_morphemic_attributes, PosInfo, attributes_mask
 from trLemmer import tr
 
 
@@ -150,15 +150,21 @@ def replace_english_specific_chars(word):
     return ''.join([replacement.get(sym, sym) for sym in word])
 
 
+def has_turkish_syllables(word):
+    """
+    Checks if `word` can be split into Turkish syllables: it has a vowel, does not start or end with two
+    consonants and has no three consecutive consonants.
+    """
+    pattern = ''.join('V' if tr.is_vowel(c) else 'C' for c in word)
+    return 'V' in pattern and not pattern.startswith('CC') and not pattern.endswith('CC') and 'CCC' not in pattern
+
+
 def guess_for_abbreviation(word):
-    """Tries to guess turkish abbreviation pronunciation."""
-    syllables = tr.vowel_count(word)
-
-    first_two_cons = False
-    if len(word) > 2:
-        if tr.contains_vowel(word[:2]):
-            first_two_cons = True
-    if syllables == 0 or len(word) < 3 or first_two_cons:
+    """
+    Tries to guess turkish abbreviation pronunciation. Abbreviations that can not be read as a Turkish word
+    are pronounced letter by letter.
+    """
+    if len(word) < 3 or not has_turkish_syllables(word):
         return to_turkish_letter_pronunciation(word)
     else:
         return replace_english_specific_chars(word)
@@ -174,6 +180,118 @@ class MetaDataId(Enum):
     INDEX = "Index"
 
 
+# Enum numbering used in the binary (protobuf) lexicon resource. Primary POS values are shifted by one
+# relative to `PrimaryPos`, root attributes mostly follow `RootAttribute` definition order (starting from 1)
+# except for a few entries that were reordered in the serialized format. Root attributes are mapped to bits.
+BINARY_PRIMARY_POS = {i + 1: pos for i, pos in enumerate(PrimaryPos)}
+BINARY_SECONDARY_POS = {i: pos for i, pos in enumerate(list(SecondaryPos)[:18])}
+BINARY_SECONDARY_POS.update({
+    8: SecondaryPos.NONE,
+    19: SecondaryPos.Abbreviation,
+    50: SecondaryPos.PCDat,
+    51: SecondaryPos.PCAcc,
+    52: SecondaryPos.PCIns,
+    53: SecondaryPos.PCNom,
+    54: SecondaryPos.PCGen,
+    55: SecondaryPos.PCAbl,
+})
+BINARY_ROOT_ATTRIBUTES = {i: attr for i, attr in enumerate(RootAttribute, 1)}
+BINARY_ROOT_ATTRIBUTES.update({
+    18: RootAttribute.Ext,
+    19: RootAttribute.Runtime,
+    20: RootAttribute.Dummy,
+    21: RootAttribute.NonReciprocal,
+})
+BINARY_ROOT_ATTRIBUTES = {value: int(attr) for value, attr in BINARY_ROOT_ATTRIBUTES.items()}
+
+
+def read_varint(data: bytes, pos: int):
+    """Reads a protobuf base 128 varint from `data` starting at `pos`, returns (value, new position)."""
+    b = data[pos]
+    if b < 0x80:
+        return b, pos + 1
+    result = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def parse_binary_dict_item(data: bytes, start: int, end: int):
+    """
+    Parses a single serialized dictionary item. Root and pronunciation are only stored when they
+    differ from the lower case lemma and the root respectively.
+    :return: a tuple of DictionaryItem and the id of the referenced item (or None).
+    """
+    lemma = root = pronunciation = ref_id = None
+    primary_pos = None
+    secondary_pos = SecondaryPos.NONE
+    attributes = 0
+    index = 0
+    pos = start
+    while pos < end:
+        key, pos = read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+            if field == 5:
+                primary_pos = BINARY_PRIMARY_POS[value]
+            elif field == 6:
+                secondary_pos = BINARY_SECONDARY_POS[value]
+            elif field == 7:
+                attributes |= BINARY_ROOT_ATTRIBUTES[value]
+            elif field == 8:
+                index = value
+        elif wire_type == 2:
+            length, pos = read_varint(data, pos)
+            chunk_end = pos + length
+            if field == 7:
+                # packed root attributes
+                while pos < chunk_end:
+                    value, pos = read_varint(data, pos)
+                    attributes |= BINARY_ROOT_ATTRIBUTES[value]
+                continue
+            value = data[pos:chunk_end].decode('utf8')
+            pos = chunk_end
+            if field == 1:
+                lemma = value
+            elif field == 2:
+                root = value
+            elif field == 3:
+                pronunciation = value
+            elif field == 4:
+                ref_id = value
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type} in binary lexicon item at {start}")
+    if lemma is None or primary_pos is None:
+        raise ValueError(f"Binary lexicon item at {start} has no lemma or primary pos")
+    root = tr.lower(lemma) if root is None else root
+    if pronunciation is None:
+        # pronunciations are not stored when they equal the lemma lower cased without Turkish rules,
+        # which differs from the root for a few abbreviations ("FIFA": root "fıfa", pronunciation "fifa").
+        pronunciation = lemma.lower() if tr.lower(lemma) == root and lemma.lower() != root else root
+    item = DictionaryItem(lemma=lemma, root=root, primary_pos=primary_pos, secondary_pos=secondary_pos,
+                          attrs=attributes, pronunciation=pronunciation, index=index)
+    return item, ref_id
+
+
+def read_binary_dict_items(data: bytes):
+    """Yields (DictionaryItem, reference id) tuples from a serialized lexicon."""
+    pos = 0
+    end = len(data)
+    while pos < end:
+        key, pos = read_varint(data, pos)
+        if key & 7 != 2:
+            raise ValueError(f"Malformed binary lexicon, unexpected key {key} at {pos}")
+        length, pos = read_varint(data, pos)
+        yield parse_binary_dict_item(data, pos, pos + length)
+        pos += length
+
+
 #  A function that parses raw word and metadata information. Represents a single line in dictionary.
 def parse_line_data(line):
     word = line.split(" ")[0]
@@ -332,7 +450,7 @@ class TextLexiconProcessor:
         attributes = infer_morphemic_attributes(pronunciation, pos_info, parsed_attributes)
         if pronunciation_guessed and (
             secondary_pos == SecondaryPos.ProperNoun or secondary_pos == SecondaryPos.Abbreviation):
-            attributes.add(RootAttribute.PronunciationGuessed)
+            attributes |= RootAttribute.PronunciationGuessed
             # here if there is an item with same lemma and pos values but attributes are different,
             # we increment the index.
         while True:
@@ -384,12 +502,12 @@ class TextLexiconProcessor:
                 ref_items = self.lexicon.get_matching_items(r)  # check lexicon for [kuyruk]
                 if len(ref_items) > 0:
                     ref_item = sorted(ref_items, key=lambda item: item.index)[0]
-                    attr_set = ref_item.attributes.copy()
+                    attr_set = ref_item.attributes
                 else:
-                    attr_set = infer_morphemic_attributes(root, pos_info, set())
-                attr_set.add(RootAttribute.CompoundP3sgRoot)
-                if RootAttribute.Ext in item.attributes:
-                    attr_set.add(RootAttribute.Ext)
+                    attr_set = infer_morphemic_attributes(root, pos_info, 0)
+                attr_set |= RootAttribute.CompoundP3sgRoot
+                if item.has_attribute(RootAttribute.Ext):
+                    attr_set |= RootAttribute.Ext
                 index = 0
                 dict_item_id = f"{root}_{item.primary_pos.value}"
                 if self.lexicon.id_dict.get(dict_item_id) is not None:
@@ -397,9 +515,7 @@ class TextLexiconProcessor:
                     # generate a fake lemma for atkuyruk, use kuyruk's attributes.
                     # But do not allow voicing.
                 fake_root = DictionaryItem(root, root, item.primary_pos, item.secondary_pos, attr_set, root, index)
-                fake_root.attributes.add(RootAttribute.Dummy)
-                if RootAttribute.Voicing in fake_root.attributes:
-                    fake_root.attributes.remove(RootAttribute.Voicing)
+                fake_root.attributes = int((fake_root.attributes | RootAttribute.Dummy) & ~RootAttribute.Voicing)
                 fake_root.reference_item = item
                 self.lexicon.add(fake_root)
         return self.lexicon
@@ -427,7 +543,7 @@ class DictionaryItem:
     :param secondary_pos: Secondary POS information
     :type secondary_pos: SecondaryPos
     :param attrs: Attributes that this item carries. Such as voicing or vowel drop.
-    :type attrs: RootAttribute
+    :type attrs: int bitmask of RootAttribute values, or an iterable of them.
     :param pronunciation: Pronunciations of the item. TODO: This should be
     converted to an actual 'Pronunciation' item
     :type pronunciation: str
@@ -440,7 +556,7 @@ class DictionaryItem:
                  root: str,
                  primary_pos: PrimaryPos,
                  secondary_pos: SecondaryPos,
-                 attrs: Set,
+                 attrs: Union[int, Iterable[RootAttribute]],
                  pronunciation: str,
                  index: int):
         """
@@ -454,7 +570,7 @@ class DictionaryItem:
         self.secondary_pos = secondary_pos
         # normalized_lemma: if this is a Verb, removes -mek -mak suffix.Otherwise returns the `lemma`
         self.normalized_lemma = self.lemma[:-3] if self.primary_pos == PrimaryPos.Verb else self.lemma
-        self.attributes = attrs
+        self.attributes = int(attrs) if isinstance(attrs, int) else attributes_mask(attrs)
         self.root = root
         self.index = index
         self.id_ = self.generate_id()
@@ -468,11 +584,10 @@ class DictionaryItem:
         return f"DictionaryItem({self.id_})"
 
     def has_any_attribute(self, root_attrs):
-
-        return bool(set(root_attrs) & self.attributes)
+        return (self.attributes & attributes_mask(root_attrs)) != 0
 
     def has_attribute(self, attr):
-        return attr in self.attributes
+        return (self.attributes & attr) != 0
 
     def generate_id(self):
         result = [self.lemma, self.primary_pos.value]  # shortForm is value
@@ -500,6 +615,7 @@ class RootLexicon:
         "tr/abbreviations.dict",
         "tr/person-names.dict"
     ]
+    BINARY_LEXICON_RESOURCE = "tr/lexicon.bin"
 
     def __init__(self):
         self.item_set = set()
@@ -518,6 +634,25 @@ class RootLexicon:
         processor.process_lines(lines)
         return lexicon
 
+    @classmethod
+    def from_binary(cls, path=None):
+        """
+        Loads a lexicon serialized in binary (protobuf) format. By default the bundled
+        resources/tr/lexicon.bin is used, it contains the same items as the default text dictionaries
+        with all attributes already inferred, so no text parsing is necessary.
+        :param path: path to a binary lexicon file.
+        """
+        path = cls.RESOURCES_DIR / cls.BINARY_LEXICON_RESOURCE if path is None else Path(path)
+        lexicon = cls()
+        references = []
+        for item, ref_id in read_binary_dict_items(path.read_bytes()):
+            lexicon.add(item)
+            if ref_id is not None:
+                references.append((item, ref_id))
+        for item, ref_id in references:
+            item.ref_item = lexicon.id_dict.get(ref_id)
+        return lexicon
+
     @classmethod
     def from_lines(cls, lines: List):
         lexicon = cls()
@@ -1,16 +1,21 @@
 # -*- coding: utf-8 -*-
 import collections
+import time
 
-from nltk.tokenize import word_tokenize, sent_tokenize
-from trLemmer import tr
+from trLemmer.cache import AnalysisCache, CacheInfo, DiskCache, analysis_version, frequent_words
+from trLemmer.compiled import CompiledAnalyzer
 from trLemmer.formatters import UDFormatter, DefaultFormatter
 from trLemmer.lexicon import RootLexicon
 from trLemmer.morphotactics import TurkishMorphotactics
-from trLemmer.rulebasedanalyzer import RuleBasedAnalyzer
-from typing import List, Tuple
+from trLemmer.rulebasedanalyzer import DEFAULT_LIMITS, AnalysisResult, RuleBasedAnalyzer, SearchLimits
+from trLemmer.snapshot import read_snapshot, save_snapshot
+from trLemmer.tokenizer import NltkTokenizer, Sentence, Token, TurkishTokenizer, normalize_token
+from typing import Iterable, Iterator, List, Optional, Tuple, Union, TextIO
 
 """Main module."""
 
+DEFAULT_CACHE_SIZE = 100000
+
 _Parse = collections.namedtuple('Parse', 'word, lemma, morphemes, formatted')
 
 
@@ -18,24 +23,105 @@ class Parse(_Parse):
     """
     Parse result wrapper. Based on https://github.com/kmike/pymorphy2/blob/master/pymorphy2/analyzer.py
     TODO: Decide which methods to add
+
+    `truncated` is True for parses of a word whose search hit the search limits of the analyzer, some
+    analyses of the word may be missing.
     """
-    pass
+    truncated = False
+
+
+_default_tokenizer = TurkishTokenizer()
+
+
+def make_tokenizer(name="native"):
+    """ Returns a tokenizer of `MorphAnalyzer.tokenizers`, the native one is shared. """
+    if name == "native":
+        return _default_tokenizer
+    return MorphAnalyzer.tokenizers[name]()
 
 
 def split_sentences(text):
     """ Splits text into sentences, returns a list of sentences."""
-    return sent_tokenize(text, language="turkish")
+    return _default_tokenizer.split_sentences(text)
+
+
+# size of the pieces file objects are read in, and maximum length of text kept without a sentence end.
+STREAM_READ_SIZE = 1 << 16
+MAX_SENTENCE_LENGTH = 1 << 20
+
+
+def _text_pieces(source: Union[str, TextIO, Iterable[str]]) -> Iterator[str]:
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, 'read'):
+        while True:
+            piece = source.read(STREAM_READ_SIZE)
+            if not piece:
+                return
+            yield piece
+    else:
+        # items of an iterable are lines, line ends separate words of consecutive lines.
+        for line in source:
+            yield line if line.endswith('\n') else line + '\n'
+
+
+def stream_sentences(source: Union[str, TextIO, Iterable[str]], splitter=None) -> Iterator[str]:
+    """
+    Splits text read from `source` into sentences and yields them one by one. `source` can be a
+    string, a text file object or an iterable of lines. Only the last, possibly unfinished sentence of the
+    text read so far is kept in memory; text longer than MAX_SENTENCE_LENGTH without a sentence end is
+    yielded as a sentence.
+    :param splitter: function that splits text into sentences, `split_sentences` by default.
+    """
+    splitter = splitter if splitter is not None else split_sentences
+    buffer = ''
+    pending = []
+    pending_length = 0
+    for piece in _text_pieces(source):
+        pending.append(piece)
+        pending_length += len(piece)
+        # unfinished sentence is split again only with at least as much new text as its own length,
+        # so every character is scanned a bounded number of times, however short the pieces are.
+        if pending_length < max(STREAM_READ_SIZE, len(buffer)):
+            continue
+        buffer += ''.join(pending)
+        pending = []
+        pending_length = 0
+        sentences = splitter(buffer)
+        if not sentences:
+            buffer = ''
+            continue
+        # last sentence may continue in the next piece, it is kept with the whitespace after it.
+        yield from sentences[:-1]
+        start = buffer.rfind(sentences[-1])
+        buffer = buffer[start:] if start >= 0 else sentences[-1]
+        if len(buffer) > MAX_SENTENCE_LENGTH:
+            yield buffer
+            buffer = ''
+    buffer += ''.join(pending)
+    if buffer:
+        yield from splitter(buffer)
 
 
 def _normalize(word):
-    word = tr.normalize_circumflex(tr.lower(word))
     # TODO: Decide what to do with apostrophes
-    word = word.replace("'", "")
-    return word
+    return normalize_token(word)
+
+
+def _lemmas_of(analyses):
+    return tuple(dict.fromkeys(a.dict_item.lemma for a in analyses))
+
 
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    return time.monotonic() + timeout if timeout is not None else None
 
-def _tokenize_sentence(sentence):
-    return word_tokenize(sentence.replace("'", "").replace("’", ""), language="turkish")
+
+class _Uncached(Exception):
+    """ Raised by `compute` of `MorphAnalyzer._cached` with a `result` that may be incomplete and is not cached. """
+
+    def __init__(self, result):
+        super().__init__(result)
+        self.result = result
 
 
 class MorphAnalyzer:
@@ -50,14 +136,39 @@ class MorphAnalyzer:
         >>> import trLemmer
         >>> lemmer = trLemmer.MorphAnalyzer()
 
-    Analyzer uses default text dictionaries
+    Analyzer uses the bundled binary lexicon, which contains the default text dictionaries
     (TODO: sources), as well as an optional unknown word analyzer).
     You can also add your own dictionary files in .txt format, with
     each word on its own line.
 
         # >>> lemmer.add_dictionary(path='/path/to/file')
 
-    TrLemmer can analyze or lemmatize words and sentences.
+    Morphotactics graph is immutable once built, analyzers with different formatters or lexicons
+    can share it instead of building their own:
+
+        >>> ud_lemmer = trLemmer.MorphAnalyzer(formatter='UD', graph=lemmer.graph)
+
+    Search runs on integer indexed tables compiled from the graph. `engine='graph'` selects the
+    analyzer that walks the object graph directly, both return the same analyses. Search of a word is
+    bounded by `search_limits` (see `SearchLimits`), parses of words that hit them are marked `truncated`:
+
+        >>> limits = trLemmer.SearchLimits(max_paths=100)
+        >>> strict_lemmer = trLemmer.MorphAnalyzer(graph=lemmer.graph, search_limits=limits)
+
+    Results are cached per normalized word, up to `cache_size` words are kept. `cache_size=None`
+    disables the cache. The cache can be shared by threads, `cache_info()` reports its statistics.
+    `preload` most frequent words of the bundled first-10K list (or of the `preload_path` frequency file)
+    are analyzed at startup, so the first requests find them in the cache:
+
+        >>> warm_lemmer = trLemmer.MorphAnalyzer(graph=lemmer.graph, preload=10000)
+
+    With `disk_cache` set to a file path, words missing in the memory cache are looked up in an sqlite
+    database before they are analyzed, and new results are written to it. Worker processes and repeated
+    runs can share the database file. Entries are keyed by a hash of the lexicon, see `DiskCache`.
+
+    TrLemmer can analyze or lemmatize words and sentences. Texts are split into sentences and words with
+    the built in `TurkishTokenizer`, `tokenizer='nltk'` selects the nltk punkt tokenizer (requires nltk and
+    its punkt data).
 
         >>> lemmer.lemmatize('beyazlaştırmak')
         ['beyaz']
@@ -68,6 +179,7 @@ class MorphAnalyzer:
     analyze_text: for texts, to be split by sentences and analyzed by sentences
     lemmatize: for one word only
     lemmatize_text: for texts, to be split by sentences and lemmatized by sentences
+    is_valid: for one word only, whether the word has any analysis
     _analyze_sentence: for inner use, when analyze_text is used, chooses which Parse to use for each word
     _lemmatize_sentence: for inner use, when lemmatize_text is used, chooses which Parse to use for each word
 
@@ -75,77 +187,318 @@ class MorphAnalyzer:
     """
 
     formatters = {"UD": UDFormatter}
+    engines = {"compiled": CompiledAnalyzer, "graph": RuleBasedAnalyzer}
+    tokenizers = {"native": TurkishTokenizer, "nltk": NltkTokenizer}
 
-    def __init__(self, lexicon=None, formatter=None):
-        self.lexicon = (
-            lexicon if lexicon is not None else RootLexicon.default_text_dictionaries()
-        )
-        self.morphotactics = TurkishMorphotactics(self.lexicon)
-        self.analyzer = RuleBasedAnalyzer(self.morphotactics)
+    def __init__(self, lexicon=None, formatter=None, morphotactics=None, graph=None, engine="compiled",
+                 cache_size=DEFAULT_CACHE_SIZE, preload=0, preload_path=None, disk_cache=None,
+                 tokenizer="native", search_limits: SearchLimits = None):
+        if morphotactics is not None:
+            self.lexicon = morphotactics.lexicon
+            self.morphotactics = morphotactics
+        else:
+            self.lexicon = (
+                lexicon if lexicon is not None else RootLexicon.from_binary()
+            )
+            self.morphotactics = TurkishMorphotactics(self.lexicon, graph)
+        self.analyzer = MorphAnalyzer.engines[engine](self.morphotactics, search_limits)
         self.formatter = (
             DefaultFormatter(True)
             if formatter is None
             else MorphAnalyzer.formatters[formatter]()
         )
+        self.tokenizer = make_tokenizer(tokenizer)
+        self.cache = AnalysisCache(cache_size) if cache_size else None
+        self.disk_cache = (DiskCache(disk_cache, self.lexicon,
+                                     analysis_version(self.lexicon, self.analyzer.limits, self.morphotactics.graph))
+                           if disk_cache is not None else None)
+        if preload:
+            self.warm_cache(preload, preload_path)
+
+    @classmethod
+    def from_snapshot(cls, path, formatter=None, engine="compiled", cache_size=DEFAULT_CACHE_SIZE, preload=0,
+                      preload_path=None, disk_cache=None, tokenizer="native", search_limits: SearchLimits = None):
+        """
+        Creates an analyzer from a snapshot file written by `save_snapshot`. If the file does not exist,
+        or it was created from different dictionaries or package version, analyzer is built
+        from the default lexicon and the snapshot is (re)written.
+        Cache entries stored in the snapshot are loaded into the cache. If there are none, `preload`
+        words are analyzed, and a rewritten snapshot stores them.
+        :param path: path to the snapshot file.
+        :param formatter: formatter name, same as in the constructor.
+        :param engine: search engine name, same as in the constructor.
+        :param cache_size: maximum number of cached words, same as in the constructor.
+        :param preload: number of frequent words to analyze, same as in the constructor.
+        :param preload_path: word frequency file, same as in the constructor.
+        :param disk_cache: path of the sqlite cache database, same as in the constructor.
+        :param tokenizer: tokenizer name, same as in the constructor.
+        :param search_limits: search limits, same as in the constructor. Cache entries of the snapshot are
+        only loaded with the default limits.
+        """
+        snapshot = read_snapshot(path)
+        if snapshot is not None:
+            analyzer = cls(formatter=formatter, morphotactics=snapshot.morphotactics, engine=engine,
+                           cache_size=cache_size, disk_cache=disk_cache, tokenizer=tokenizer,
+                           search_limits=search_limits)
+            if analyzer.cache is not None and snapshot.cache_entries and analyzer.analyzer.limits == DEFAULT_LIMITS:
+                analyzer.cache.update(snapshot.cache_entries)
+            elif preload:
+                analyzer.warm_cache(preload, preload_path)
+                if analyzer.cache is not None and analyzer.analyzer.limits == DEFAULT_LIMITS:
+                    analyzer.save_snapshot(path, with_cache=True)
+            return analyzer
+        analyzer = cls(formatter=formatter, engine=engine, cache_size=cache_size, preload=preload,
+                       preload_path=preload_path, disk_cache=disk_cache, tokenizer=tokenizer,
+                       search_limits=search_limits)
+        analyzer.save_snapshot(path, with_cache=bool(preload) and analyzer.analyzer.limits == DEFAULT_LIMITS)
+        return analyzer
+
+    def save_snapshot(self, path, with_cache=False):
+        """
+        Saves lexicon, morphotactics graph and stem transitions to `path`. If `with_cache` is True,
+        entries of the analysis cache are stored as well.
+        """
+        cache_entries = self.cache.items() if with_cache and self.cache is not None else ()
+        save_snapshot(self.morphotactics, path, cache_entries)
+
+    @property
+    def graph(self):
+        return self.morphotactics.graph
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """ Hits, misses, evictions, size and estimated memory of the word cache, None if it is disabled. """
+        return self.cache.info() if self.cache is not None else None
+
+    def cache_clear(self):
+        if self.cache is not None:
+            self.cache.clear()
+
+    def _cached(self, kind: str, normalized_word: str, compute, deadline: float = None):
+        """
+        Returns `compute(normalized_word, deadline)`, cached separately for each `kind` of result. The memory
+        cache is checked first, then the disk cache. Results computed after the `deadline` may be truncated
+        by it, they are not cached, neither are results that `compute` raises with `_Uncached`.
+        """
+        key = (kind, normalized_word)
+        if self.cache is not None:
+            result = self.cache.get(key)
+            if result is not AnalysisCache.MISSING:
+                return result
+        if self.disk_cache is not None:
+            result = self.disk_cache.get(key)
+            if result is not AnalysisCache.MISSING:
+                if self.cache is not None:
+                    self.cache.put(key, result)
+                return result
+        try:
+            result = compute(normalized_word, deadline)
+        except _Uncached as e:
+            return e.result
+        if deadline is not None and time.monotonic() > deadline:
+            return result
+        if self.disk_cache is not None:
+            self.disk_cache.put(key, result)
+        if self.cache is not None:
+            self.cache.put(key, result)
+        return result
+
+    def warm_cache(self, top_n=10000, path=None) -> int:
+        """
+        Analyzes `top_n` most frequent words and caches their analyses and lemmas.
+        :param top_n: number of words to analyze.
+        :param path: word frequency file, one word per line and most frequent first.
+        By default the bundled first-10K list is used.
+        :return: number of words analyzed.
+        """
+        if self.cache is None:
+            return 0
+        words = frequent_words(path, top_n)
+        # most frequent words are cached last, so they are evicted last.
+        for word in reversed(words):
+            normalized_word = _normalize(word)
+            analyses = self._analyses(normalized_word)
+            self.cache.put(('analyses', normalized_word), analyses)
+            lemmas = self._lemmas_or_stems(normalized_word, _lemmas_of(analyses.analyses), analyses.truncated)
+            self.cache.put(('lemmas', normalized_word), lemmas)
+        return len(words)
 
-    def _parse(self, word: str):
+    def _analyses(self, normalized_word: str, deadline: float = None) -> AnalysisResult:
+        return self.analyzer.analyze_result(normalized_word, deadline)
+
+    def _lemmas(self, normalized_word: str, deadline: float = None):
+        lemmas, truncated = self.analyzer.lemmas_result(normalized_word, deadline)
+        return self._lemmas_or_stems(normalized_word, lemmas, truncated)
+
+    def _lemmas_or_stems(self, normalized_word: str, lemmas: tuple, truncated: bool):
+        # truncated searches without results fall back to lemmas of the stems.
+        if truncated and not lemmas:
+            return self.analyzer.stem_lemmas(normalized_word)
+        return lemmas
+
+    def _valid(self, normalized_word: str, deadline: float = None) -> bool:
+        result = self.analyzer.first_path(normalized_word)
+        if result.truncated:
+            # the search stopped before finding a path, the word may still be valid.
+            raise _Uncached(False)
+        return bool(result.paths)
+
+    def _parse(self, word: str, deadline: float = None):
         """ Parses a word and returns SingleAnalysis result. """
-        normalized_word = _normalize(word)
-        return self.analyzer.analyze(normalized_word)
+        return self._cached('analyses', _normalize(word), self._analyses, deadline)
 
-    def analyze(self, word) -> List[Parse]:
-        analysis = self._parse(word)
-        if len(analysis) == 0:
-            return [Parse(word, 'Unk', 'Unk', 'Unk')]
+    def _parse_batch(self, kind: str, words: List[str], compute, deadline: float = None) -> dict:
+        """
+        Returns results of `compute` for `words` as a dictionary keyed by the input word. Every distinct
+        normalized form is looked up or analyzed once.
+        """
+        normalized = {word: _normalize(word) for word in dict.fromkeys(words)}
+        results = self._results(kind, normalized.values(), compute, deadline)
+        return {word: results[n] for word, n in normalized.items()}
+
+    def _results(self, kind: str, normalized_words: Iterable[str], compute, deadline: float = None) -> dict:
+        """ Results of `compute` keyed by normalized word, for distinct `normalized_words`. """
+        return {n: self._cached(kind, n, compute, deadline) for n in set(normalized_words)}
+
+    def _analyze_tokens(self, tokens: List[Token], deadline: float = None) -> List[List[Parse]]:
+        analyses = self._results('analyses', (t.normalized for t in tokens), self._analyses, deadline)
+        parses = {}
         result = []
-        for a in analysis:
-            if a is not None:
-                formatted = self.formatter.format(a)
-                morpheme_list = [m[0].id_ for m in a.morphemes]
-                result.append(Parse(word, a.dict_item.lemma, morpheme_list, formatted))
-            else:
-                result.append(Parse(word, 'Unk', 'Unk', 'Unk'))
+        for token in tokens:
+            key = (token.text, token.normalized)
+            if key not in parses:
+                parses[key] = self._format(token.text, analyses[token.normalized])
+            result.append(list(parses[key]))
+        return result
+
+    def _lemmatize_tokens(self, tokens: List[Token], deadline: float = None) -> List[List[str]]:
+        lemmas = self._results('lemmas', (t.normalized for t in tokens), self._lemmas, deadline)
+        return [list(lemmas[t.normalized]) if lemmas[t.normalized] else [t.text] for t in tokens]
+
+    def analyze(self, word, timeout: float = None) -> List[Parse]:
+        """
+        Analyses of `word`. With a `timeout` (in seconds) search stops when the time is up, and parses
+        found so far are returned marked `truncated`.
+        """
+        return self._format(word, self._parse(word, _deadline(timeout)))
+
+    def analyze_batch(self, words: Iterable[str], timeout: float = None) -> List[List[Parse]]:
+        """
+        Analyzes `words` and returns their analyses in input order, same as `analyze` for each word.
+        Repeated words are analyzed once. `timeout` is the time budget of the whole batch.
+        """
+        words = list(words)
+        analyses = self._parse_batch('analyses', words, self._analyses, _deadline(timeout))
+        parses = {word: self._format(word, analysis) for word, analysis in analyses.items()}
+        return [list(parses[word]) for word in words]
+
+    def _format(self, word, analysis: AnalysisResult) -> List[Parse]:
+        if len(analysis.analyses) == 0:
+            result = [Parse(word, 'Unk', 'Unk', 'Unk')]
+        else:
+            result = []
+            for a in analysis.analyses:
+                if a is not None:
+                    formatted = self.formatter.format(a)
+                    morpheme_list = [m[0].id_ for m in a.morphemes]
+                    result.append(Parse(word, a.dict_item.lemma, morpheme_list, formatted))
+                else:
+                    result.append(Parse(word, 'Unk', 'Unk', 'Unk'))
+        if analysis.truncated:
+            for parse in result:
+                parse.truncated = True
         return result
 
-    def lemmatize(self, word):
-        analysis = self._parse(word)
-        if len(analysis) == 0:
+    def lemmatize(self, word, timeout: float = None):
+        """
+        Lemmas of `word`. With a `timeout` (in seconds) search stops when the time is up, if no analysis was
+        found by then the lemmas of the longest dictionary stems the word starts with are returned.
+        """
+        lemmas = self._cached('lemmas', _normalize(word), self._lemmas, _deadline(timeout))
+        if len(lemmas) == 0:
             return [word]
         else:
-            return list(set([a.dict_item.lemma for a in analysis]))
+            return list(lemmas)
 
-    def lemmatize_text(self, text: str) -> List[Tuple[str, List]]:
+    def lemmatize_batch(self, words: Iterable[str], timeout: float = None) -> List[List[str]]:
+        """
+        Lemmatizes `words` and returns their lemmas in input order, same as `lemmatize` for each word.
+        Repeated words are analyzed once. `timeout` is the time budget of the whole batch.
+        """
+        words = list(words)
+        lemmas = self._parse_batch('lemmas', words, self._lemmas, _deadline(timeout))
+        return [list(lemmas[word]) if lemmas[word] else [word] for word in words]
+
+    def is_valid(self, word) -> bool:
+        """
+        Returns True if `word` has at least one analysis. Search is depth first and stops at the first
+        successful path, which is much cheaper than `analyze`. Results are cached, negative ones as well.
+        Words whose search hits `search_limits` are reported as invalid, and are not cached.
+        """
+        return self._cached('valid', _normalize(word), self._valid)
+
+    def is_valid_batch(self, words: Iterable[str]) -> List[bool]:
+        """ Same as `is_valid` for each of `words`, in input order. Repeated words are checked once. """
+        words = list(words)
+        valid = self._parse_batch('valid', words, self._valid)
+        return [valid[word] for word in words]
+
+    def lemmatize_text(self, text: str, offsets=False, timeout: float = None) -> List[Tuple[str, List]]:
         """
         This method will eventually use some form of disambiguation for lemmatizing.
         Currently it simply returns all lemmas available for each word in each sentence.
         :param text: The text which needs lemmatization. It will be split into sentences,
         each of which will be lemmatized by word
+        :param offsets: if True, sentences are `Sentence` and words are `Token` tuples, both with
+        (start, end) offsets in `text`.
+        :param timeout: time budget of the call in seconds, same as in `lemmatize`.
         :return: A list of tuples: sentence and a list of list of lemmas for all words
         """
-        result = []
-        sentences = split_sentences(text)
-        for sentence in sentences:
-            sentence_lemmas = self._lemmatize_sentence(sentence)
-            result.append((sentence, sentence_lemmas))
-        return result
+        deadline = _deadline(timeout)
+        return [self._lemmatized(sentence, tokens, offsets, deadline)
+                for sentence, tokens in self.tokenizer.sentence_tokens(text)]
 
-    def analyze_text(self, text, verbose=False):
-        result = []
-        sentences = sent_tokenize(text, language="turkish")
-        for sentence in sentences:
-            sentence_analysis = self._analyze_sentence(sentence)
-            result.append((sentence, sentence_analysis))
-        return result
+    def analyze_text(self, text, verbose=False, offsets=False, timeout: float = None):
+        """
+        Analyzes all words of all sentences in `text`.
+        :param offsets: if True, sentences are `Sentence` tuples, and analyses of each word are paired
+        with its `Token`; both have (start, end) offsets in `text`.
+        :param timeout: time budget of the call in seconds, same as in `analyze`.
+        :return: A list of tuples: sentence and analyses of its words.
+        """
+        deadline = _deadline(timeout)
+        return [self._analyzed(sentence, tokens, offsets, deadline)
+                for sentence, tokens in self.tokenizer.sentence_tokens(text)]
+
+    def _lemmatized(self, sentence: Sentence, tokens: List[Token], offsets=False, deadline: float = None):
+        """ Result of `lemmatize_text` for a single sentence and its tokens. """
+        lemmas = self._lemmatize_tokens(tokens, deadline)
+        if offsets:
+            return sentence, list(zip(tokens, lemmas))
+        return sentence.text, [(token.text, lemma_list) for token, lemma_list in zip(tokens, lemmas)]
+
+    def _analyzed(self, sentence: Sentence, tokens: List[Token], offsets=False, deadline: float = None):
+        """ Result of `analyze_text` for a single sentence and its tokens. """
+        analyses = self._analyze_tokens(tokens, deadline)
+        if offsets:
+            return sentence, list(zip(tokens, analyses))
+        return sentence.text, analyses
+
+    def lemmatize_stream(self, source: Union[str, TextIO, Iterable[str]]) -> Iterator[Tuple[str, List]]:
+        """
+        Same as `lemmatize_text`, for text read incrementally from a file object or an iterable of lines.
+        Yields (sentence, lemmas) pairs one sentence at a time, memory use does not grow with the text.
+        """
+        for sentence in stream_sentences(source, self.tokenizer.split_sentences):
+            yield sentence, self._lemmatize_sentence(sentence)
+
+    def analyze_stream(self, source: Union[str, TextIO, Iterable[str]]) -> Iterator[Tuple[str, List]]:
+        """ Same as `analyze_text`, yields (sentence, analyses) pairs of text read from `source`. """
+        for sentence in stream_sentences(source, self.tokenizer.split_sentences):
+            yield sentence, self._analyze_sentence(sentence)
 
     def _analyze_sentence(self, sentence):
-        result = []
-        for word in _tokenize_sentence(sentence):
-            result.append(self.analyze(word))
-        return result
+        return self._analyze_tokens(self.tokenizer.tokens(sentence))
 
     def _lemmatize_sentence(self, sentence: str) -> List[Tuple[str, List[str]]]:
-        result = []
-        words = _tokenize_sentence(sentence)
-        for word in words:
-            result.append((word, self.lemmatize(word)))
-        return result
+        tokens = self.tokenizer.tokens(sentence)
+        return [(token.text, lemmas) for token, lemmas in zip(tokens, self._lemmatize_tokens(tokens))]
@@ -1,5 +1,6 @@
+import itertools
 import sys, os
-from typing import List, Set, NamedTuple, Optional
+from typing import List, NamedTuple, Optional
 
 # sys.path.pop(0)
 # print(sys.path)
@@ -12,6 +13,7 @@ from trLemmer.attributes import (
     RootAttribute,
     SecondaryPos,
     calculate_phonetic_attributes,
+    attributes_of,
 )
 from trLemmer.conditions import (
     Condition,
@@ -24,6 +26,8 @@ from trLemmer.conditions import (
     ContainsMorphemeSequence,
     NoSurfaceAfterDerivation,
     HasTailSequence,
+    compile_condition,
+    morpheme_bit,
     LastDerivationIs,
     PreviousMorphemeIs,
     DictionaryItemIs,
@@ -56,15 +60,24 @@ class Morpheme(NamedTuple):
         return self.id_ == other.id_
 
 
+_state_numbers = itertools.count()
+
+
 class MorphemeState:
+    """
+    A state in morphotactics graph. States only describe the morpheme and its properties,
+    outgoing transitions are kept in a `MorphotacticsGraph`, so states can be shared by graphs.
+    `bit` and `morpheme_bit` identify the state and its morpheme in search path bitsets.
+    """
+
     def __init__(self, id_, morpheme, terminal=False, derivative=False, pos_root=False):
         self.id_ = id_
         self.morpheme = morpheme
         self.terminal = terminal
         self.derivative = derivative
         self.pos_root = pos_root
-        self.outgoing = []
-        self.incoming = []
+        self.bit = 1 << next(_state_numbers)
+        self.morpheme_bit = morpheme_bit(morpheme)
 
     def __str__(self):
         return f"[{self.id_}:{self.morpheme.id_}]"
@@ -72,51 +85,60 @@ class MorphemeState:
     def __repr__(self):
         return f"MorphemeState({self.id_}, {self.morpheme.id_})"
 
-    def add_outgoing(self, *suffix_transitions):
-        for transition in suffix_transitions:
-            if transition in self.outgoing:
-                # Outgoing transition {transition} already exists in {self}")
-                continue
 
-            self.outgoing.append(transition)
-        return self
+class MorphotacticsGraph:
+    """
+    Outgoing suffix transitions of morpheme states. A graph is filled by `TurkishMorphotactics.make_graph()`
+    and frozen afterwards: transition lists become tuples and no more transitions can be added. A frozen
+    graph can be referenced by any number of analyzers.
+    """
+
+    def __init__(self):
+        self.outgoing = {}
+        self.frozen = False
 
-    def add_incoming(self, suffix_transitions):
+    def transitions_from(self, state):
+        return self.outgoing.get(state, ())
+
+    def add_outgoing(self, state, *suffix_transitions):
+        if self.frozen:
+            raise ValueError(f"Cannot add transitions to {state}, graph is frozen")
+        outgoing = self.outgoing.setdefault(state, [])
         for transition in suffix_transitions:
-            if transition in self.incoming:
-                print(f"Incoming transition {transition} already exists in {self}")
+            if transition in outgoing:
+                # Outgoing transition {transition} already exists in {state}")
                 continue
-            self.incoming.append(transition)
-        return self
+            outgoing.append(transition)
+        return state
 
-    def add(self, to_, template, condition=None):
-        transition = SuffixTransition(self, to_, template, condition)
-        self.add_outgoing(transition)  # type: SuffixTransition
-        return self
+    def add(self, from_, to_, template, condition=None):
+        return self.add_outgoing(from_, SuffixTransition(from_, to_, template, condition))
 
-    def add_all(self, transitions):
+    def add_all(self, from_, transitions):
         for transition in transitions:
-            self.add(*transition)
+            self.add(from_, *transition)
 
-    def add_empty(self, to_, condition=None):
-        transition = SuffixTransition(self, to_, "", condition)
-        self.add_outgoing(transition)
-        return self
+    def add_empty(self, from_, to_, condition=None):
+        return self.add_outgoing(from_, SuffixTransition(from_, to_, "", condition))
 
-    def copy_outgoing_transitions_from(self, state):
-        for transition in state.outgoing:
+    def copy_outgoing_transitions_from(self, to_state, from_state):
+        for transition in self.transitions_from(from_state):
             copy = transition.get_copy()
-            copy.from_ = self
-            self.add_outgoing(transition)
-
-    def remove_transitions_to(self, morpheme: Morpheme):
-        transitions = []
-        for transition in self.outgoing:
-            if transition.to_.morpheme == morpheme:
-                transitions.append(transition)
-
-        for transition in transitions:
-            self.outgoing.remove(transition)
+            copy.from_ = to_state
+            self.add_outgoing(to_state, copy)
+
+    def remove_transitions_to(self, state, morpheme: Morpheme):
+        if self.frozen:
+            raise ValueError(f"Cannot remove transitions from {state}, graph is frozen")
+        self.outgoing[state] = [t for t in self.transitions_from(state) if t.to_.morpheme != morpheme]
+
+    def freeze(self):
+        self.outgoing = {state: tuple(transitions) for state, transitions in self.outgoing.items()}
+        for transitions in self.outgoing.values():
+            for transition in transitions:
+                transition.compile()
+        self.frozen = True
+        return self
 
 
 morphemes = {}
@@ -761,6 +783,87 @@ imekA3pl_ST = MorphemeState("imekA3pl_ST", a3pl, True, False, False)
 imekCop_ST = MorphemeState("qCop_ST", cop, True, False, False)
 
 
+class StemTrieNode:
+    """
+    A node of `StemTrie`. `label` is the part of the stem surface on the edge leading to this node.
+    Most nodes are leaves, their `children` is None instead of an empty dict.
+    """
+    __slots__ = ("label", "children", "transitions")
+
+    def __init__(self, label="", children=None, transitions=None):
+        self.label = label
+        self.children = children
+        self.transitions = [] if transitions is None else transitions
+
+    def __reduce__(self):
+        # default pickling of slotted objects is several times slower to load.
+        return StemTrieNode, (self.label, self.children, self.transitions)
+
+
+class StemTrie:
+    """
+    Compressed character trie of stem surfaces. Edges carry whole substrings, so nodes only exist where
+    surfaces branch or end. All stems that are prefixes of a word are found in a single walk, which stops
+    as soon as no stem continues the prefix.
+    """
+
+    def __init__(self):
+        self.root = StemTrieNode()
+
+    def add(self, surface, transition):
+        node = self.root
+        pos = 0
+        while pos < len(surface):
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(surface[pos])
+            if child is None:
+                child = StemTrieNode(surface[pos:])
+                node.children[surface[pos]] = child
+                node = child
+                break
+            label = child.label
+            common = 1
+            limit = min(len(label), len(surface) - pos)
+            while common < limit and label[common] == surface[pos + common]:
+                common += 1
+            if common < len(label):
+                # split the edge, a new node is inserted where the surfaces diverge.
+                middle = StemTrieNode(label[:common], {label[common]: child})
+                child.label = label[common:]
+                node.children[surface[pos]] = middle
+                child = middle
+            node = child
+            pos += common
+        node.transitions.append(transition)
+
+    def find(self, surface):
+        """Returns the node of the exact `surface`, or None."""
+        node = self.root
+        pos = 0
+        while pos < len(surface):
+            child = node.children.get(surface[pos]) if node.children is not None else None
+            if child is None or not surface.startswith(child.label, pos):
+                return None
+            node = child
+            pos += len(child.label)
+        return node
+
+    def prefix_matches(self, word):
+        matches = []
+        node = self.root
+        pos = 0
+        length = len(word)
+        while pos < length and node.children is not None:
+            node = node.children.get(word[pos])
+            if node is None or not word.startswith(node.label, pos):
+                break
+            pos += len(node.label)
+            if node.transitions:
+                matches.extend(node.transitions)
+        return matches
+
+
 class StemTransitionsMapBased:
     """
     Generates StemTransition objects from the dictionary item.
@@ -805,8 +908,7 @@ class StemTransitionsMapBased:
     def __init__(self, morphotactics):
         self.lexicon: RootLexicon = morphotactics.lexicon
         self.morphotactics = morphotactics
-        self.multi_stems = {}
-        self.single_stems = {}
+        self.stems = StemTrie()
         self.different_stem_items = {}
         for dict_item in self.lexicon.items:
             if dict_item is None:
@@ -817,10 +919,7 @@ class StemTransitionsMapBased:
     def generate_transitions(self, dict_item):
 
         def has_modifier_attribute(item):
-            for attr in item.attributes:
-                if attr in StemTransitionsMapBased.modifiers:
-                    return True
-            return False
+            return item.has_any_attribute(StemTransitionsMapBased.modifiers)
 
         if dict_item.id_ in StemTransitionsMapBased.special_roots:
             return self.handle_special_roots(dict_item)
@@ -835,10 +934,10 @@ class StemTransitionsMapBased:
     def generate_modified_root_nodes(self, dict_item: DictionaryItem):
         result = list(dict_item.pronunciation)
         original_attrs = calculate_phonetic_attributes(dict_item.pronunciation)
-        modified_attrs = original_attrs.copy()
+        modified_attrs = original_attrs
         modified_root_state = None
         unmodified_root_state = None
-        for attr in dict_item.attributes:
+        for attr in attributes_of(dict_item.attributes, RootAttribute):
             if attr == RootAttribute.Voicing:
                 last = dict_item.pronunciation[-1]
                 voiced = tr.voice(last)
@@ -849,44 +948,37 @@ class StemTransitionsMapBased:
                 if dict_item.lemma.endswith("nk"):
                     voiced = "g"
                 result[-1] = voiced
-                if PhoneticAttribute.LastLetterVoicelessStop in modified_attrs:
-                    modified_attrs.discard(PhoneticAttribute.LastLetterVoicelessStop)
-                original_attrs.add(PhoneticAttribute.ExpectsConsonant)
-                modified_attrs.add(PhoneticAttribute.ExpectsVowel)
-                modified_attrs.add(PhoneticAttribute.CannotTerminate)
+                modified_attrs &= ~PhoneticAttribute.LastLetterVoicelessStop
+                original_attrs |= PhoneticAttribute.ExpectsConsonant
+                modified_attrs |= PhoneticAttribute.ExpectsVowel | PhoneticAttribute.CannotTerminate
             elif attr == RootAttribute.Doubling:
                 result.append(result[-1])
-                original_attrs.add(PhoneticAttribute.ExpectsConsonant)
-                modified_attrs.add(PhoneticAttribute.ExpectsVowel)
-                modified_attrs.add(PhoneticAttribute.CannotTerminate)
+                original_attrs |= PhoneticAttribute.ExpectsConsonant
+                modified_attrs |= PhoneticAttribute.ExpectsVowel | PhoneticAttribute.CannotTerminate
             elif attr == RootAttribute.LastVowelDrop:
                 last_letter = result[-1]
                 if tr.is_vowel(last_letter):
                     result.pop()
-                    modified_attrs.add(PhoneticAttribute.ExpectsConsonant)
-                    modified_attrs.add(PhoneticAttribute.CannotTerminate)
+                    modified_attrs |= PhoneticAttribute.ExpectsConsonant | PhoneticAttribute.CannotTerminate
                 else:
                     result.pop(-2)
                     if dict_item.primary_pos != PrimaryPos.Verb:
-                        original_attrs.add(PhoneticAttribute.ExpectsConsonant)
+                        original_attrs |= PhoneticAttribute.ExpectsConsonant
                     else:
                         unmodified_root_state = verbLastVowelDropUnmodRoot_S
                         modified_root_state = verbLastVowelDropModRoot_S
-                modified_attrs.add(PhoneticAttribute.ExpectsVowel)
-                modified_attrs.add(PhoneticAttribute.CannotTerminate)
+                modified_attrs |= PhoneticAttribute.ExpectsVowel | PhoneticAttribute.CannotTerminate
             elif attr == RootAttribute.InverseHarmony:
-                original_attrs.add(PhoneticAttribute.LastVowelFrontal)
-                if PhoneticAttribute.LastVowelBack in original_attrs:
-                    original_attrs.discard(PhoneticAttribute.LastVowelBack)
-                modified_attrs.add(PhoneticAttribute.LastVowelFrontal)
-                if PhoneticAttribute.LastVowelBack in modified_attrs:
-                    modified_attrs.discard(PhoneticAttribute.LastVowelBack)
+                original_attrs |= PhoneticAttribute.LastVowelFrontal
+                original_attrs &= ~PhoneticAttribute.LastVowelBack
+                modified_attrs |= PhoneticAttribute.LastVowelFrontal
+                modified_attrs &= ~PhoneticAttribute.LastVowelBack
             elif attr == RootAttribute.ProgressiveVowelDrop:
                 if len(result) > 1:
                     result.pop()
                     if tr.contains_vowel("".join(result)):
                         modified_attrs = calculate_phonetic_attributes("".join(result))
-                    modified_attrs.add(PhoneticAttribute.LastLetterDropped)
+                    modified_attrs |= PhoneticAttribute.LastLetterDropped
             else:
                 continue
         if unmodified_root_state is None:
@@ -953,8 +1045,9 @@ class StemTransitionsMapBased:
                 calculate_phonetic_attributes(m),
                 surface=m,
             )
-            modified.attrs.add(PhoneticAttribute.ExpectsConsonant)
-            modified.attrs.add(PhoneticAttribute.CannotTerminate)
+            modified.attrs = int(
+                modified.attrs | PhoneticAttribute.ExpectsConsonant | PhoneticAttribute.CannotTerminate
+            )
             return [original, modified]
         elif item_id in ["ben_Pron_Pers", "sen_Pron_Pers"]:
             original = StemTransition(dict_item, unmodified_root_state, original_attrs)
@@ -972,8 +1065,8 @@ class StemTransitionsMapBased:
                     calculate_phonetic_attributes("san"),
                     surface="san",
                 )
-            original.attrs.add(PhoneticAttribute.UnModifiedPronoun)
-            modified.attrs.add(PhoneticAttribute.ModifiedPronoun)
+            original.attrs = int(original.attrs | PhoneticAttribute.UnModifiedPronoun)
+            modified.attrs = int(modified.attrs | PhoneticAttribute.ModifiedPronoun)
             return [original, modified]
         elif item_id in ["demek_Verb", "yemek_Verb"]:
             original = StemTransition(dict_item, vDeYeRoot_S, original_attrs)
@@ -1004,8 +1097,8 @@ class StemTransitionsMapBased:
                 calculate_phonetic_attributes(modified_root),
                 surface=modified_root,
             )
-            original.attrs.add(PhoneticAttribute.UnModifiedPronoun)
-            modified.attrs.add(PhoneticAttribute.ModifiedPronoun)
+            original.attrs = int(original.attrs | PhoneticAttribute.UnModifiedPronoun)
+            modified.attrs = int(modified.attrs | PhoneticAttribute.ModifiedPronoun)
             return [original, modified]
         else:
             raise ValueError(
@@ -1013,44 +1106,22 @@ class StemTransitionsMapBased:
             )
 
     def add_stem_transition(self, stem_transition):
-        surface_form = stem_transition.surface
-        if surface_form in self.multi_stems:
-            self.multi_stems[surface_form].append(stem_transition)
-        elif surface_form in self.single_stems:
-            existing_form = self.single_stems.get(surface_form)
-            self.multi_stems[surface_form] = [existing_form, stem_transition]
-            self.single_stems.pop(surface_form)
-        else:
-            self.single_stems[surface_form] = stem_transition
+        self.stems.add(stem_transition.surface, stem_transition)
 
     def remove_stem_node(self, stem_transition):
-        surface_form = stem_transition.surface
-        if surface_form in self.multi_stems:
-            self.multi_stems["surface_form"].remove(stem_transition)
-        elif (
-            surface_form in self.single_stems
-            and self.single_stems["surface_form"].dict_item == stem_transition.dict_item
-        ):
-            self.single_stems.pop(surface_form)
-
-        # if (!differentStemItems.containsEntry(stemTransition.item, stemTransition)) {
-        #   differentStemItems.remove(stemTransition.item, stemTransition)
+        node = self.stems.find(stem_transition.surface)
+        if node is not None:
+            node.transitions = [
+                transition for transition in node.transitions
+                if transition.dict_item != stem_transition.dict_item
+            ]
 
     def transitions_from_stem(self, stem):
-        if stem in self.single_stems:
-            return [self.single_stems.get(stem)]
-        elif stem in self.multi_stems:
-            return self.multi_stems.get(stem)
-        else:
-            return []
+        node = self.stems.find(stem)
+        return [] if node is None else node.transitions
 
     def prefix_matches(self, prefix):
-        matches = []
-        current_string = ""
-        for letter in prefix:
-            current_string += letter
-            matches.extend(self.transitions_from_stem(current_string))
-        return matches
+        return self.stems.prefix_matches(prefix)
 
     def transitions_from_item(self, dict_item):
         if dict_item in self.different_stem_items:
@@ -1083,9 +1154,21 @@ class StemTransitionsMapBased:
 
 
 class TurkishMorphotactics:
-    def __init__(self, lexicon: RootLexicon):
+    """
+    Morphotactics graph and stem transitions for a lexicon.
+    :param lexicon: lexicon used for generating stem transitions.
+    :param graph: an already built graph. If None, a new graph is built from the lexicon. Graphs are
+    immutable after they are built, so they can be shared between morphotactics with different lexicons.
+    """
+
+    def __init__(self, lexicon: RootLexicon, graph: MorphotacticsGraph = None):
         self.lexicon = lexicon
-        self.make_graph()
+        if graph is None:
+            self.graph = MorphotacticsGraph()
+            self.make_graph()
+            self.graph.freeze()
+        else:
+            self.graph = graph
         self.item_root_states = {
             "değil_Verb": nVerbDegil_S,
             "imek_Verb": imekRoot_S,
@@ -1121,11 +1204,11 @@ class TurkishMorphotactics:
         """
 
         # ev-ε-?-?
-        noun_S.add_empty(a3sg_S, not_have(RootAttribute.ImplicitPlural))
+        self.graph.add_empty(noun_S, a3sg_S, not_have(RootAttribute.ImplicitPlural))
 
         # ev-ler-?-?.
-        noun_S.add(
-            a3pl_S,
+        self.graph.add(
+            noun_S, a3pl_S,
             "lAr",
             not_have(RootAttribute.ImplicitPlural).and_(
                 not_have(RootAttribute.CompoundP3sg)
@@ -1133,58 +1216,58 @@ class TurkishMorphotactics:
         )
 
         # Allow only implicit plural `hayvanat`.
-        noun_S.add_empty(a3pl_S, has(RootAttribute.ImplicitPlural))
+        self.graph.add_empty(noun_S, a3pl_S, has(RootAttribute.ImplicitPlural))
 
         # --- Compound Handling ---------
         # for compound roots like "zeytinyağ-" generate two transitions
         # NounCompound--(ε)--> a3sgCompound --(ε)--> pNonCompound_S --> Nom_S
-        nounCompoundRoot_S.add_empty(
-            a3sgCompound_S, has(RootAttribute.CompoundP3sgRoot)
+        self.graph.add_empty(
+            nounCompoundRoot_S, a3sgCompound_S, has(RootAttribute.CompoundP3sgRoot)
         )
 
-        a3sgCompound_S.add_empty(pnonCompound_S)
-        a3sgCompound_S.add(p3pl_S, "lArI")
+        self.graph.add_empty(a3sgCompound_S, pnonCompound_S)
+        self.graph.add(a3sgCompound_S, p3pl_S, "lArI")
 
         # ---- For compund derivations -----------------
-        pnonCompound_S.add_empty(nom_S)
-        nom_S.add(become_S, "lAş")
-        nom_S.add(acquire_S, "lAn")
+        self.graph.add_empty(pnonCompound_S, nom_S)
+        self.graph.add(nom_S, become_S, "lAş")
+        self.graph.add(nom_S, acquire_S, "lAn")
         # for "zeytinyağlı"
-        nom_S.add(with_S, "lI", ContainsMorpheme(with_, without).not_())
+        self.graph.add(nom_S, with_S, "lI", ContainsMorpheme(with_, without).not_())
         # for "zeytinyağsız"
-        nom_S.add(without_S, "sIz", ContainsMorpheme(with_, without).not_())
+        self.graph.add(nom_S, without_S, "sIz", ContainsMorpheme(with_, without).not_())
         # for "zeytinyağlık"
         not_ = NotCondition
         containsNess = ContainsMorpheme(ness)
-        nom_S.add(ness_S, "lI~k", not_(containsNess))
-        nom_S.add(ness_S, "lI!ğ", not_(containsNess))
+        self.graph.add(nom_S, ness_S, "lI~k", not_(containsNess))
+        self.graph.add(nom_S, ness_S, "lI!ğ", not_(containsNess))
         # for "zeytinyağcı"
-        nom_S.add(agt_S, ">cI", not_(ContainsMorpheme(agt)))
+        self.graph.add(nom_S, agt_S, ">cI", not_(ContainsMorpheme(agt)))
         # for "zeytinyağsı"
-        nom_S.add(justLike_S, "+msI", not_(ContainsMorpheme(justLike)))
+        self.graph.add(nom_S, justLike_S, "+msI", not_(ContainsMorpheme(justLike)))
         # for "zeytinyağcık"
-        nom_S.add(
-            dim_S, ">cI~k", HasAnySuffixSurface().not_().and_not(ContainsMorpheme(dim))
+        self.graph.add(
+            nom_S, dim_S, ">cI~k", HasAnySuffixSurface().not_().and_not(ContainsMorpheme(dim))
         )
-        nom_S.add(
-            dim_S, ">cI!ğ", HasAnySuffixSurface().not_().and_not(ContainsMorpheme(dim))
+        self.graph.add(
+            nom_S, dim_S, ">cI!ğ", HasAnySuffixSurface().not_().and_not(ContainsMorpheme(dim))
         )
         # "zeytinyağcağız"
-        nom_S.add(dim_S, "cAğIz", HasAnySuffixSurface().not_())
+        self.graph.add(nom_S, dim_S, "cAğIz", HasAnySuffixSurface().not_())
 
         # for compound roots like "zeytinyağ-lar-ı" generate two transition
         # NounCompound--(lAr)--> a3plCompound ---> p3sg_S, P1sg etc.
-        nounCompoundRoot_S.add(
-            a3plCompound_S, "lAr", has(RootAttribute.CompoundP3sgRoot)
+        self.graph.add(
+            nounCompoundRoot_S, a3plCompound_S, "lAr", has(RootAttribute.CompoundP3sgRoot)
         )
 
         # but for pnon connection, we use lArI
-        nounCompoundRoot_S.add(
-            a3plCompound2_S, "lArI", has(RootAttribute.CompoundP3sgRoot)
+        self.graph.add(
+            nounCompoundRoot_S, a3plCompound2_S, "lArI", has(RootAttribute.CompoundP3sgRoot)
         )
 
-        a3plCompound_S.add_all(
-            [
+        self.graph.add_all(
+            a3plCompound_S, [
                 (p3sg_S, "I"),
                 (p2sg_S, "In"),
                 (p1sg_S, "Im"),
@@ -1195,8 +1278,8 @@ class TurkishMorphotactics:
         )
 
         # this path is used for plural analysis (A3pl+Pnon+Nom) of compound words.
-        a3plCompound2_S.add_empty(pnonCompound2_S)
-        pnonCompound2_S.add_empty(nom_ST)
+        self.graph.add_empty(a3plCompound2_S, pnonCompound2_S)
+        self.graph.add_empty(pnonCompound2_S, nom_ST)
 
         # ------
 
@@ -1205,8 +1288,8 @@ class TurkishMorphotactics:
         abbreviation = SecondaryPosIs(SecondaryPos.Abbreviation)
         possessionCond = not_have(RootAttribute.FamilyMember).and_not(abbreviation)
 
-        a3sg_S.add_all(
-            [
+        self.graph.add_all(
+            a3sg_S, [
                 (pnon_S, "", not_have(RootAttribute.FamilyMember)),  # ev
                 (p1sg_S, "Im", possessionCond),  # evim
                 (
@@ -1231,11 +1314,11 @@ class TurkishMorphotactics:
         )  # evleri
 
         # ev-ler-ε-?
-        a3pl_S.add_empty(pnon_S, not_have(RootAttribute.FamilyMember))
+        self.graph.add_empty(a3pl_S, pnon_S, not_have(RootAttribute.FamilyMember))
 
         # ev-ler-im-?
-        a3pl_S.add_all(
-            [
+        self.graph.add_all(
+            a3pl_S, [
                 (p1sg_S, "Im", possessionCond),
                 (p2sg_S, "In", possessionCond),
                 (
@@ -1256,10 +1339,10 @@ class TurkishMorphotactics:
         )
 
         # --- handle su - akarsu roots. ----
-        nounSuRoot_S.add_empty(a3sgSu_S)
-        nounSuRoot_S.add(a3pl_S, "lar")
-        a3sgSu_S.add_all(
-            [
+        self.graph.add_empty(nounSuRoot_S, a3sgSu_S)
+        self.graph.add(nounSuRoot_S, a3pl_S, "lar")
+        self.graph.add_all(
+            a3sgSu_S, [
                 (pnon_S, ""),
                 (p1sg_S, "yum"),
                 (p2sg_S, "yun"),
@@ -1271,7 +1354,7 @@ class TurkishMorphotactics:
         )
 
         # ev-?-ε-ε (ev, evler).
-        pnon_S.add_empty(nom_ST, not_have(RootAttribute.FamilyMember))
+        self.graph.add_empty(pnon_S, nom_ST, not_have(RootAttribute.FamilyMember))
 
         equCond1 = (
             ContainsMorpheme(adj, futPart, presPart, narrPart, pastPart)
@@ -1282,8 +1365,8 @@ class TurkishMorphotactics:
         equCond = PreviousMorphemeIs(a3pl).or_(equCond1)  # allow `yapabildiğince`
 
         # Not allow "zetinyağı-ya" etc.
-        pnon_S.add_all(
-            [
+        self.graph.add_all(
+            pnon_S, [
                 (dat_ST, "+yA", not_have(RootAttribute.CompoundP3sg)),  # ev-e
                 (abl_ST, ">dAn", not_have(RootAttribute.CompoundP3sg)),  # ev-den
                 (loc_ST, ">dA", not_have(RootAttribute.CompoundP3sg)),  # evde
@@ -1298,8 +1381,8 @@ class TurkishMorphotactics:
                 (ins_ST, "+ylA"),  # evle, zeytinyağıyla
             ]
         )
-        pnon_S.add_all(
-            [
+        self.graph.add_all(
+            pnon_S, [
                 (
                     dat_ST,
                     "+nA",
@@ -1330,10 +1413,10 @@ class TurkishMorphotactics:
         # This transition is for words like "içeri" or "dışarı".
         # Those words implicitly contains Dative suffix.
         # But It is also possible to add dative suffix +yA to those words such as "içeri-ye".
-        pnon_S.add_empty(dat_ST, HasRootAttribute(RootAttribute.ImplicitDative))
+        self.graph.add_empty(pnon_S, dat_ST, HasRootAttribute(RootAttribute.ImplicitDative))
 
-        p1sg_S.add_all(
-            [
+        self.graph.add_all(
+            p1sg_S, [
                 (nom_ST, ""),  # evim
                 (dat_ST, "A"),  # evime
                 (loc_ST, "dA"),  # evimde
@@ -1345,8 +1428,8 @@ class TurkishMorphotactics:
             ]
         )
 
-        p2sg_S.add_all(
-            [
+        self.graph.add_all(
+            p2sg_S, [
                 (nom_ST, ""),  # evin
                 (dat_ST, "A"),  # evine
                 (loc_ST, "dA"),  # evinde
@@ -1358,8 +1441,8 @@ class TurkishMorphotactics:
             ]
         )
 
-        p3sg_S.add_all(
-            [
+        self.graph.add_all(
+            p3sg_S, [
                 (nom_ST, ""),  # evi
                 (dat_ST, "nA"),  # evine
                 (loc_ST, "ndA"),  # evinde
@@ -1371,8 +1454,8 @@ class TurkishMorphotactics:
             ]
         )
 
-        p1pl_S.add_all(
-            [
+        self.graph.add_all(
+            p1pl_S, [
                 (nom_ST, ""),  # evimiz
                 (dat_ST, "A"),  # evimize
                 (loc_ST, "dA"),  # evimizde
@@ -1383,8 +1466,8 @@ class TurkishMorphotactics:
                 (acc_ST, "I"),  # evimizi
             ]
         )
-        p2pl_S.add_all(
-            [
+        self.graph.add_all(
+            p2pl_S, [
                 (nom_ST, ""),  # eviniz
                 (dat_ST, "A"),  # evinize
                 (loc_ST, "dA"),  # evinizde
@@ -1396,8 +1479,8 @@ class TurkishMorphotactics:
             ]
         )
 
-        p3pl_S.add_all(
-            [
+        self.graph.add_all(
+            p3pl_S, [
                 (nom_ST, ""),  # evleri
                 (dat_ST, "nA"),  # evlerine
                 (loc_ST, "ndA"),  # evlerinde
@@ -1414,27 +1497,27 @@ class TurkishMorphotactics:
         # There are two almost identical suffix transitions with templates ">cI~k" and ">cI!ğ"
         # This was necessary for some simplification during analysis. This way there will be only one
         # surface form generated for each transition.
-        nom_ST.add(dim_S, ">cI~k", HasAnySuffixSurface().not_().and_not(abbreviation))
-        nom_ST.add(dim_S, ">cI!ğ", HasAnySuffixSurface().not_().and_not(abbreviation))
+        self.graph.add(nom_ST, dim_S, ">cI~k", HasAnySuffixSurface().not_().and_not(abbreviation))
+        self.graph.add(nom_ST, dim_S, ">cI!ğ", HasAnySuffixSurface().not_().and_not(abbreviation))
 
         # ev-ε-ε-ε-ceğiz (evceğiz)
-        nom_ST.add(dim_S, "cAğIz", HasAnySuffixSurface().not_().and_not(abbreviation))
+        self.graph.add(nom_ST, dim_S, "cAğIz", HasAnySuffixSurface().not_().and_not(abbreviation))
 
         # connect dim to the noun root.
-        dim_S.add_empty(noun_S)
+        self.graph.add_empty(dim_S, noun_S)
 
         emptyAdjNounSeq = ContainsMorphemeSequence(adj, zero, noun, a3sg, pnon, nom)
 
-        nom_ST.add(
-            ness_S,
+        self.graph.add(
+            nom_ST, ness_S,
             "lI~k",
             NoSurfaceAfterDerivation()
                 .and_not(containsNess)
                 .and_not(emptyAdjNounSeq)
                 .and_not(abbreviation),
         )
-        nom_ST.add(
-            ness_S,
+        self.graph.add(
+            nom_ST, ness_S,
             "lI!ğ",
             NoSurfaceAfterDerivation()
                 .and_not(containsNess)
@@ -1443,14 +1526,14 @@ class TurkishMorphotactics:
         )
 
         # connect `ness` to the noun root.
-        ness_S.add_empty(noun_S)
+        self.graph.add_empty(ness_S, noun_S)
 
-        nom_ST.add(
-            agt_S, ">cI", NoSurfaceAfterDerivation().and_not(ContainsMorpheme(adj, agt))
+        self.graph.add(
+            nom_ST, agt_S, ">cI", NoSurfaceAfterDerivation().and_not(ContainsMorpheme(adj, agt))
         )
 
         # connect `ness` to the noun root.
-        agt_S.add_empty(noun_S)
+        self.graph.add_empty(agt_S, noun_S)
 
         # here we do not allow an adjective to pass here.
         # such as, adj->zero->noun->ε-ε-ε->zero->Verb is not acceptable because there is already a
@@ -1459,42 +1542,42 @@ class TurkishMorphotactics:
         noun2VerbZeroDerivationCondition = HasTail().and_not(
             NoSurfaceAfterDerivation().and_(LastDerivationIs(adjZeroDeriv_S))
         )
-        nom_ST.add_empty(nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
+        self.graph.add_empty(nom_ST, nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
 
         # elma-ya-yım elma-ya-ydı
-        dat_ST.add_empty(nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
+        self.graph.add_empty(dat_ST, nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
 
         # elma-dan-ım elma-dan-dı
-        abl_ST.add_empty(nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
+        self.graph.add_empty(abl_ST, nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
 
         # elma-da-yım elma-da-ydı
-        loc_ST.add_empty(nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
+        self.graph.add_empty(loc_ST, nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
 
         # elma-yla-yım elma-yla-ydı
-        ins_ST.add_empty(nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
+        self.graph.add_empty(ins_ST, nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
 
         # elma-nın-ım elma-nın-dı
-        gen_ST.add_empty(nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
+        self.graph.add_empty(gen_ST, nounZeroDeriv_S, noun2VerbZeroDerivationCondition)
 
-        nounZeroDeriv_S.add_empty(nVerb_S)
+        self.graph.add_empty(nounZeroDeriv_S, nVerb_S)
 
         # meyve-li
 
         noSurfaceAfterDerivation = NoSurfaceAfterDerivation()
-        nom_ST.add(
-            with_S,
+        self.graph.add(
+            nom_ST, with_S,
             "lI",
             noSurfaceAfterDerivation.and_not(ContainsMorpheme(with_, without)),
         )
 
-        nom_ST.add(
-            without_S,
+        self.graph.add(
+            nom_ST, without_S,
             "sIz",
             noSurfaceAfterDerivation.and_not(ContainsMorpheme(with_, without, inf1)),
         )
 
-        nom_ST.add(
-            justLike_S,
+        self.graph.add(
+            nom_ST, justLike_S,
             "+msI",
             noSurfaceAfterDerivation.and_not(
                 ContainsMorpheme(justLike, futPart, pastPart, presPart, adj)
@@ -1502,191 +1585,191 @@ class TurkishMorphotactics:
         )
 
         # TODO: test order
-        nom_ST.add(
-            justLike_S,
+        self.graph.add(
+            nom_ST, justLike_S,
             "ImsI",
             not_have(PhoneticAttribute.LastLetterVowel)
                 .and_(noSurfaceAfterDerivation)
                 .and_not(ContainsMorpheme(justLike, futPart, pastPart, presPart, adj)),
         )
 
-        nom_ST.add(
-            related_S,
+        self.graph.add(
+            nom_ST, related_S,
             "sAl",
             noSurfaceAfterDerivation.and_not(ContainsMorpheme(with_, without, related)),
         )
 
         # connect With to Adjective root.
-        with_S.add_empty(adjectiveRoot_ST)
-        without_S.add_empty(adjectiveRoot_ST)
-        related_S.add_empty(adjectiveRoot_ST)
+        self.graph.add_empty(with_S, adjectiveRoot_ST)
+        self.graph.add_empty(without_S, adjectiveRoot_ST)
+        self.graph.add_empty(related_S, adjectiveRoot_ST)
 
-        justLike_S.add_empty(adjectiveRoot_ST)
+        self.graph.add_empty(justLike_S, adjectiveRoot_ST)
 
         # meyve-de-ki
         notRelRepetition = HasTailSequence(rel, adj, zero, noun, a3sg, pnon, loc).not_()
-        loc_ST.add(rel_S, "ki", notRelRepetition)
-        rel_S.add_empty(adjectiveRoot_ST)
+        self.graph.add(loc_ST, rel_S, "ki", notRelRepetition)
+        self.graph.add_empty(rel_S, adjectiveRoot_ST)
 
         # for covering dünkü, anki, yarınki etc. Unlike Oflazer, We also allow dündeki etc.
         # TODO: Use a more general grouping, not using Secondary Pos
 
         time = NoSurfaceAfterDerivation().and_(SecondaryPosIs(SecondaryPos.Time))
 
-        dun = self.lexicon.get_item_by_id("dün_Noun_Time")
-        gun = self.lexicon.get_item_by_id("gün_Noun_Time")
-        bugun = self.lexicon.get_item_by_id("bugün_Noun_Time")
-        ileri = self.lexicon.get_item_by_id("ileri_Noun")
-        geri = self.lexicon.get_item_by_id("geri_Noun")
-        ote = self.lexicon.get_item_by_id("öte_Noun")
-        beri = self.lexicon.get_item_by_id("beri_Noun")
+        dun = "dün_Noun_Time"
+        gun = "gün_Noun_Time"
+        bugun = "bugün_Noun_Time"
+        ileri = "ileri_Noun"
+        geri = "geri_Noun"
+        ote = "öte_Noun"
+        beri = "beri_Noun"
 
         time2 = DictionaryItemIsAny(dun, gun, bugun)
-        nom_ST.add(rel_S, "ki", time.and_not(time2))
-        nom_ST.add(rel_S, "ki", DictionaryItemIsAny(ileri, geri, ote, beri))
-        nom_ST.add(rel_S, "kü", time2.and_(time))
+        self.graph.add(nom_ST, rel_S, "ki", time.and_not(time2))
+        self.graph.add(nom_ST, rel_S, "ki", DictionaryItemIsAny(ileri, geri, ote, beri))
+        self.graph.add(nom_ST, rel_S, "kü", time2.and_(time))
 
         # After Genitive suffix, Rel suffix makes a Pronoun derivation.
-        gen_ST.add(relToPron_S, "ki")
-        relToPron_S.add_empty(pronAfterRel_S)
+        self.graph.add(gen_ST, relToPron_S, "ki")
+        self.graph.add_empty(relToPron_S, pronAfterRel_S)
 
         verbDeriv = ContainsMorpheme(inf1, inf2, inf3, pastPart, futPart)
 
-        nom_ST.add(
-            become_S,
+        self.graph.add(
+            nom_ST, become_S,
             "lAş",
             noSurfaceAfterDerivation.and_not(ContainsMorpheme(adj)).and_not(verbDeriv),
         )
-        become_S.add_empty(verbRoot_S)
+        self.graph.add_empty(become_S, verbRoot_S)
 
-        nom_ST.add(
-            acquire_S,
+        self.graph.add(
+            nom_ST, acquire_S,
             "lAn",
             noSurfaceAfterDerivation.and_not(ContainsMorpheme(adj)).and_not(verbDeriv),
         )
 
-        acquire_S.add_empty(verbRoot_S)
+        self.graph.add_empty(acquire_S, verbRoot_S)
 
         # Inf1 mak makes noun derivation. However, it cannot get any possessive or plural suffix.
         # Also cannot be followed by Dat, Gen, Acc case suffixes.
         # So we create a path only for it.
-        nounInf1Root_S.add_empty(a3sgInf1_S)
-        a3sgInf1_S.add_empty(pnonInf1_S)
-        pnonInf1_S.add_empty(nom_ST)
-        pnonInf1_S.add(abl_ST, "tAn")
+        self.graph.add_empty(nounInf1Root_S, a3sgInf1_S)
+        self.graph.add_empty(a3sgInf1_S, pnonInf1_S)
+        self.graph.add_empty(pnonInf1_S, nom_ST)
+        self.graph.add(pnonInf1_S, abl_ST, "tAn")
 
-        pnonInf1_S.add(loc_ST, "tA")
-        pnonInf1_S.add(ins_ST, "lA")
+        self.graph.add(pnonInf1_S, loc_ST, "tA")
+        self.graph.add(pnonInf1_S, ins_ST, "lA")
 
-        nounActOfRoot_S.add_empty(a3sgActOf_S)
-        nounActOfRoot_S.add(a3plActOf_S, "lar")
-        a3sgActOf_S.add_empty(pnonActOf)
-        a3plActOf_S.add_empty(pnonActOf)
-        pnonActOf.add_empty(nom_ST)
+        self.graph.add_empty(nounActOfRoot_S, a3sgActOf_S)
+        self.graph.add(nounActOfRoot_S, a3plActOf_S, "lar")
+        self.graph.add_empty(a3sgActOf_S, pnonActOf)
+        self.graph.add_empty(a3plActOf_S, pnonActOf)
+        self.graph.add_empty(pnonActOf, nom_ST)
 
     def connect_last_vowel_drop_words(self):
-        nounLastVowelDropRoot_S.add_empty(a3sgLastVowelDrop_S)
-        nounLastVowelDropRoot_S.add(a3PlLastVowelDrop_S, "lAr")
-        a3sgLastVowelDrop_S.add_empty(pNonLastVowelDrop_S)
-        a3PlLastVowelDrop_S.add_empty(pNonLastVowelDrop_S)
-        pNonLastVowelDrop_S.add(loc_ST, ">dA")
-        pNonLastVowelDrop_S.add(abl_ST, ">dAn")
+        self.graph.add_empty(nounLastVowelDropRoot_S, a3sgLastVowelDrop_S)
+        self.graph.add(nounLastVowelDropRoot_S, a3PlLastVowelDrop_S, "lAr")
+        self.graph.add_empty(a3sgLastVowelDrop_S, pNonLastVowelDrop_S)
+        self.graph.add_empty(a3PlLastVowelDrop_S, pNonLastVowelDrop_S)
+        self.graph.add(pNonLastVowelDrop_S, loc_ST, ">dA")
+        self.graph.add(pNonLastVowelDrop_S, abl_ST, ">dAn")
 
-        adjLastVowelDropRoot_S.add_empty(zeroLastVowelDrop_S)
-        postpLastVowelDropRoot_S.add_empty(zeroLastVowelDrop_S)
-        zeroLastVowelDrop_S.add_empty(nounLastVowelDropRoot_S)
+        self.graph.add_empty(adjLastVowelDropRoot_S, zeroLastVowelDrop_S)
+        self.graph.add_empty(postpLastVowelDropRoot_S, zeroLastVowelDrop_S)
+        self.graph.add_empty(zeroLastVowelDrop_S, nounLastVowelDropRoot_S)
 
     def connect_proper_nouns_and_abbreviations(self):
         # ---- Proper noun handling -------
         # TODO: consider adding single quote after an overhaul.
-        # nounProper_S.add(puncProperSeparator_S, "'")
-        nounProper_S.add_empty(a3sg_S)
-        nounProper_S.add(a3pl_S, "lAr")
-        puncProperSeparator_S.add_empty(a3sg_S)
-        puncProperSeparator_S.add(a3pl_S, "lAr")
+        # self.graph.add(nounProper_S, puncProperSeparator_S, "'")
+        self.graph.add_empty(nounProper_S, a3sg_S)
+        self.graph.add(nounProper_S, a3pl_S, "lAr")
+        self.graph.add_empty(puncProperSeparator_S, a3sg_S)
+        self.graph.add(puncProperSeparator_S, a3pl_S, "lAr")
 
         # ---- Abbreviation Handling -------
         # TODO: consider restricting possessive, most derivation and plural suffixes.
-        nounAbbrv_S.add_empty(a3sg_S)
-        nounAbbrv_S.add(a3pl_S, "lAr")
+        self.graph.add_empty(nounAbbrv_S, a3sg_S)
+        self.graph.add(nounAbbrv_S, a3pl_S, "lAr")
 
         # ----- This is for catching words that cannot have a suffix.
-        nounNoSuffix_S.add_empty(nounA3sgNoSuffix_S)
-        nounA3sgNoSuffix_S.add_empty(nounPnonNoSuffix_S)
-        nounPnonNoSuffix_S.add_empty(nounNomNoSuffix_ST)
+        self.graph.add_empty(nounNoSuffix_S, nounA3sgNoSuffix_S)
+        self.graph.add_empty(nounA3sgNoSuffix_S, nounPnonNoSuffix_S)
+        self.graph.add_empty(nounPnonNoSuffix_S, nounNomNoSuffix_ST)
 
     def connect_adjective_states(self):
         # zero morpheme derivation. Words like "yeşil-i" requires Adj to Noun conversion.
         # Since noun suffixes are not derivational a "Zero" morpheme is used for this.
         # Transition has a HasTail() condition because Adj->Zero->Noun+A3sg+Pnon+Nom) is not allowed.
-        adjectiveRoot_ST.add_empty(adjZeroDeriv_S, HasTail())
+        self.graph.add_empty(adjectiveRoot_ST, adjZeroDeriv_S, HasTail())
 
-        adjZeroDeriv_S.add_empty(noun_S)
+        self.graph.add_empty(adjZeroDeriv_S, noun_S)
 
-        adjZeroDeriv_S.add_empty(nVerb_S)
+        self.graph.add_empty(adjZeroDeriv_S, nVerb_S)
 
-        adjectiveRoot_ST.add(aLy_S, ">cA")
-        aLy_S.add_empty(advRoot_ST)
+        self.graph.add(adjectiveRoot_ST, aLy_S, ">cA")
+        self.graph.add_empty(aLy_S, advRoot_ST)
 
-        adjectiveRoot_ST.add(
-            aAsIf_S, ">cA", ContainsMorpheme(asIf, ly, agt, with_, justLike).not_()
+        self.graph.add(
+            adjectiveRoot_ST, aAsIf_S, ">cA", ContainsMorpheme(asIf, ly, agt, with_, justLike).not_()
         )
 
-        aAsIf_S.add_empty(adjectiveRoot_ST)
+        self.graph.add_empty(aAsIf_S, adjectiveRoot_ST)
 
-        adjectiveRoot_ST.add(
-            aAgt_S, ">cI", ContainsMorpheme(asIf, ly, agt, with_, justLike).not_()
+        self.graph.add(
+            adjectiveRoot_ST, aAgt_S, ">cI", ContainsMorpheme(asIf, ly, agt, with_, justLike).not_()
         )
-        aAgt_S.add_empty(noun_S)
+        self.graph.add_empty(aAgt_S, noun_S)
 
-        adjectiveRoot_ST.add(
-            justLike_S,
+        self.graph.add(
+            adjectiveRoot_ST, justLike_S,
             "+msI",
             NoSurfaceAfterDerivation().and_(ContainsMorpheme(justLike).not_()),
         )
 
-        adjectiveRoot_ST.add(
-            justLike_S,
+        self.graph.add(
+            adjectiveRoot_ST, justLike_S,
             "ImsI",
             not_have(PhoneticAttribute.LastLetterVowel)
                 .and_(NoSurfaceAfterDerivation())
                 .and_(ContainsMorpheme(justLike).not_()),
         )
 
-        adjectiveRoot_ST.add(become_S, "lAş", NoSurfaceAfterDerivation())
-        adjectiveRoot_ST.add(acquire_S, "lAn", NoSurfaceAfterDerivation())
+        self.graph.add(adjectiveRoot_ST, become_S, "lAş", NoSurfaceAfterDerivation())
+        self.graph.add(adjectiveRoot_ST, acquire_S, "lAn", NoSurfaceAfterDerivation())
 
         c1 = PreviousMorphemeIsAny(futPart, pastPart)
 
-        adjAfterVerb_S.add_empty(aPnon_ST, c1)
-        adjAfterVerb_S.add(aP1sg_ST, "Im", c1)
-        adjAfterVerb_S.add(aP2sg_ST, "In", c1)
-        adjAfterVerb_S.add(aP3sg_ST, "I", c1)
-        adjAfterVerb_S.add(aP1pl_ST, "ImIz", c1)
-        adjAfterVerb_S.add(aP2pl_ST, "InIz", c1)
-        adjAfterVerb_S.add(aP3pl_ST, "lArI", c1)
+        self.graph.add_empty(adjAfterVerb_S, aPnon_ST, c1)
+        self.graph.add(adjAfterVerb_S, aP1sg_ST, "Im", c1)
+        self.graph.add(adjAfterVerb_S, aP2sg_ST, "In", c1)
+        self.graph.add(adjAfterVerb_S, aP3sg_ST, "I", c1)
+        self.graph.add(adjAfterVerb_S, aP1pl_ST, "ImIz", c1)
+        self.graph.add(adjAfterVerb_S, aP2pl_ST, "InIz", c1)
+        self.graph.add(adjAfterVerb_S, aP3pl_ST, "lArI", c1)
 
-        adjectiveRoot_ST.add(ness_S, "lI~k")
-        adjectiveRoot_ST.add(ness_S, "lI!ğ")
+        self.graph.add(adjectiveRoot_ST, ness_S, "lI~k")
+        self.graph.add(adjectiveRoot_ST, ness_S, "lI!ğ")
 
-        adjAfterVerb_ST.add(ness_S, "lI~k", PreviousMorphemeIs(aorPart))
-        adjAfterVerb_ST.add(ness_S, "lI!ğ", PreviousMorphemeIs(aorPart))
+        self.graph.add(adjAfterVerb_ST, ness_S, "lI~k", PreviousMorphemeIs(aorPart))
+        self.graph.add(adjAfterVerb_ST, ness_S, "lI!ğ", PreviousMorphemeIs(aorPart))
 
     def connect_numeral_states(self):
-        numeralRoot_ST.add(ness_S, "lI~k")
-        numeralRoot_ST.add(ness_S, "lI!ğ")
-        numeralRoot_ST.add_empty(numZeroDeriv_S, HasTail())
-        numZeroDeriv_S.add_empty(noun_S)
-        numZeroDeriv_S.add_empty(nVerb_S)
-
-        numeralRoot_ST.add(
-            justLike_S,
+        self.graph.add(numeralRoot_ST, ness_S, "lI~k")
+        self.graph.add(numeralRoot_ST, ness_S, "lI!ğ")
+        self.graph.add_empty(numeralRoot_ST, numZeroDeriv_S, HasTail())
+        self.graph.add_empty(numZeroDeriv_S, noun_S)
+        self.graph.add_empty(numZeroDeriv_S, nVerb_S)
+
+        self.graph.add(
+            numeralRoot_ST, justLike_S,
             "+msI",
             NoSurfaceAfterDerivation().and_(ContainsMorpheme(justLike).not_()),
         )
 
-        numeralRoot_ST.add(
-            justLike_S,
+        self.graph.add(
+            numeralRoot_ST, justLike_S,
             "ImsI",
             not_have(PhoneticAttribute.LastLetterVowel)
                 .and_(NoSurfaceAfterDerivation())
@@ -1695,24 +1778,24 @@ class TurkishMorphotactics:
 
     def connect_verb_after_noun_adj_states(self):
         # elma-..-ε-yım
-        nVerb_S.add_empty(nPresent_S)
+        self.graph.add_empty(nVerb_S, nPresent_S)
 
         # elma-ydı, çorap-tı
-        nVerb_S.add(nPast_S, "+y>dI")
+        self.graph.add(nVerb_S, nPast_S, "+y>dI")
         # elma-ymış
-        nVerb_S.add(nNarr_S, "+ymIş")
+        self.graph.add(nVerb_S, nNarr_S, "+ymIş")
 
-        nVerb_S.add(nCond_S, "+ysA")
+        self.graph.add(nVerb_S, nCond_S, "+ysA")
 
-        nVerb_S.add(vWhile_S, "+yken")
+        self.graph.add(nVerb_S, vWhile_S, "+yken")
 
         # word "değil" is special. It contains negative suffix implicitly. Also it behaves like
         # noun->Verb Zero morpheme derivation. because it cannot have most Verb suffixes.
         # So we connect it to a separate root state "nVerbDegil" instead of Verb
-        degilRoot = self.lexicon.get_item_by_id("değil_Verb")
-        nVerbDegil_S.add_empty(nNeg_S, DictionaryItemIs(degilRoot))
+        degilRoot = "değil_Verb"
+        self.graph.add_empty(nVerbDegil_S, nNeg_S, DictionaryItemIs(degilRoot))
         # copy transitions from nVerb_S
-        nNeg_S.copy_outgoing_transitions_from(nVerb_S)
+        self.graph.copy_outgoing_transitions_from(nNeg_S, nVerb_S)
 
         noFamily = not_have(RootAttribute.FamilyMember)
         # for preventing elmamım, elmamdım
@@ -1745,19 +1828,19 @@ class TurkishMorphotactics:
                 .and_not(verbDeriv)
         )
         # elma-yım
-        nPresent_S.add(nA1sg_ST, "+yIm", allowA1sgTrans)
-        nPresent_S.add(nA2sg_ST, "sIn", allowA2sgTrans)
+        self.graph.add(nPresent_S, nA1sg_ST, "+yIm", allowA1sgTrans)
+        self.graph.add(nPresent_S, nA2sg_ST, "sIn", allowA2sgTrans)
 
         # elma-ε-ε-dır to non terminal A3sg. We do not allow ending with A3sg from empty Present tense.
-        nPresent_S.add_empty(nA3sg_S)
+        self.graph.add_empty(nPresent_S, nA3sg_S)
 
         # we allow `değil` to end with terminal A3sg from Present tense.
-        nPresent_S.add_empty(nA3sg_ST, DictionaryItemIs(degilRoot))
+        self.graph.add_empty(nPresent_S, nA3sg_ST, DictionaryItemIs(degilRoot))
 
         # elma-lar, elma-da-lar as Verb.
         # TODO: consider disallowing this for "elmalar" case.
-        nPresent_S.add(
-            nA3pl_ST,
+        self.graph.add(
+            nPresent_S, nA3pl_ST,
             "lAr",
             not_have(RootAttribute.CompoundP3sg)
                 # do not allow "okumak-lar"
@@ -1765,43 +1848,43 @@ class TurkishMorphotactics:
         )
 
         # elma-ydı-m. Do not allow "elmaya-yım" (Oflazer accepts this)
-        nPast_S.add(nA1sg_ST, "m", allowA1sgTrans)
-        nNarr_S.add(nA1sg_ST, "Im", allowA1sgTrans)
+        self.graph.add(nPast_S, nA1sg_ST, "m", allowA1sgTrans)
+        self.graph.add(nNarr_S, nA1sg_ST, "Im", allowA1sgTrans)
 
-        nPast_S.add(nA2sg_ST, "n", allowA2sgTrans)
-        nNarr_S.add(nA2sg_ST, "sIn", allowA2sgTrans)
+        self.graph.add(nPast_S, nA2sg_ST, "n", allowA2sgTrans)
+        self.graph.add(nNarr_S, nA2sg_ST, "sIn", allowA2sgTrans)
 
-        nPast_S.add(nA1pl_ST, "k", allowA1plTrans)
-        nNarr_S.add(nA1pl_ST, "Iz", allowA1plTrans)
-        nPresent_S.add(nA1pl_ST, "+yIz", allowA1plTrans)
+        self.graph.add(nPast_S, nA1pl_ST, "k", allowA1plTrans)
+        self.graph.add(nNarr_S, nA1pl_ST, "Iz", allowA1plTrans)
+        self.graph.add(nPresent_S, nA1pl_ST, "+yIz", allowA1plTrans)
 
-        nPast_S.add(nA2pl_ST, "InIz", allowA2plTrans)
-        nNarr_S.add(nA2pl_ST, "sInIz", allowA2plTrans)
-        nPresent_S.add(nA2pl_ST, "sInIz", allowA2plTrans)
+        self.graph.add(nPast_S, nA2pl_ST, "InIz", allowA2plTrans)
+        self.graph.add(nNarr_S, nA2pl_ST, "sInIz", allowA2plTrans)
+        self.graph.add(nPresent_S, nA2pl_ST, "sInIz", allowA2plTrans)
 
         # elma-ydı-lar.
-        nPast_S.add(
-            nA3pl_ST, "lAr", not_have(RootAttribute.CompoundP3sg).and_(allowA3plTrans)
+        self.graph.add(
+            nPast_S, nA3pl_ST, "lAr", not_have(RootAttribute.CompoundP3sg).and_(allowA3plTrans)
         )
         # elma-ymış-lar.
-        nNarr_S.add(
-            nA3pl_ST, "lAr", not_have(RootAttribute.CompoundP3sg).and_(allowA3plTrans)
+        self.graph.add(
+            nNarr_S, nA3pl_ST, "lAr", not_have(RootAttribute.CompoundP3sg).and_(allowA3plTrans)
         )
 
         # elma-ydı-ε
-        nPast_S.add_empty(nA3sg_ST)
+        self.graph.add_empty(nPast_S, nA3sg_ST)
         # elma-ymış-ε
-        nNarr_S.add_empty(nA3sg_ST)
+        self.graph.add_empty(nNarr_S, nA3sg_ST)
 
         # narr+cons is allowed but not past+cond
-        nNarr_S.add(nCond_S, "sA")
+        self.graph.add(nNarr_S, nCond_S, "sA")
 
-        nCond_S.add(nA1sg_ST, "m", allowA1sgTrans)
-        nCond_S.add(nA2sg_ST, "n", allowA2sgTrans)
-        nCond_S.add(nA1pl_ST, "k", allowA1plTrans)
-        nCond_S.add(nA2pl_ST, "nIz", allowA2plTrans)
-        nCond_S.add_empty(nA3sg_ST)
-        nCond_S.add(nA3pl_ST, "lAr")
+        self.graph.add(nCond_S, nA1sg_ST, "m", allowA1sgTrans)
+        self.graph.add(nCond_S, nA2sg_ST, "n", allowA2sgTrans)
+        self.graph.add(nCond_S, nA1pl_ST, "k", allowA1plTrans)
+        self.graph.add(nCond_S, nA2pl_ST, "nIz", allowA2plTrans)
+        self.graph.add_empty(nCond_S, nA3sg_ST)
+        self.graph.add(nCond_S, nA3pl_ST, "lAr")
 
         # for not allowing "elma-ydı-m-dır"
 
@@ -1810,129 +1893,129 @@ class TurkishMorphotactics:
         ).not_()
 
         # elma-yım-dır
-        nA1sg_ST.add(nCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(nA1sg_ST, nCop_ST, "dIr", rejectNoCopula)
         # elmasındır
-        nA2sg_ST.add(nCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(nA2sg_ST, nCop_ST, "dIr", rejectNoCopula)
         # elmayızdır
-        nA1pl_ST.add(nCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(nA1pl_ST, nCop_ST, "dIr", rejectNoCopula)
         # elmasınızdır
-        nA2pl_ST.add(nCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(nA2pl_ST, nCop_ST, "dIr", rejectNoCopula)
 
-        nA3sg_S.add(nCop_ST, ">dIr", rejectNoCopula)
+        self.graph.add(nA3sg_S, nCop_ST, ">dIr", rejectNoCopula)
 
-        nA3pl_ST.add(nCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(nA3pl_ST, nCop_ST, "dIr", rejectNoCopula)
 
         asIfCond = PreviousMorphemeIsAny(narr)
-        nA3sg_ST.add(vAsIf_S, ">cAsInA", asIfCond)
-        nA1sg_ST.add(vAsIf_S, ">cAsInA", asIfCond)
-        nA2sg_ST.add(vAsIf_S, ">cAsInA", asIfCond)
-        nA1pl_ST.add(vAsIf_S, ">cAsInA", asIfCond)
-        nA2pl_ST.add(vAsIf_S, ">cAsInA", asIfCond)
-        nA3pl_ST.add(vAsIf_S, ">cAsInA", asIfCond)
+        self.graph.add(nA3sg_ST, vAsIf_S, ">cAsInA", asIfCond)
+        self.graph.add(nA1sg_ST, vAsIf_S, ">cAsInA", asIfCond)
+        self.graph.add(nA2sg_ST, vAsIf_S, ">cAsInA", asIfCond)
+        self.graph.add(nA1pl_ST, vAsIf_S, ">cAsInA", asIfCond)
+        self.graph.add(nA2pl_ST, vAsIf_S, ">cAsInA", asIfCond)
+        self.graph.add(nA3pl_ST, vAsIf_S, ">cAsInA", asIfCond)
 
         # Copula can come before A3pl.
-        nPresent_S.add(nCopBeforeA3pl_S, ">dIr")
-        nCopBeforeA3pl_S.add(nA3pl_ST, "lAr")
+        self.graph.add(nPresent_S, nCopBeforeA3pl_S, ">dIr")
+        self.graph.add(nCopBeforeA3pl_S, nA3pl_ST, "lAr")
 
     def connect_pronoun_states(self):
         # ----------- Personal Pronouns ----------------------------
 
-        ben = self.lexicon.get_item_by_id("ben_Pron_Pers")
-        sen = self.lexicon.get_item_by_id("sen_Pron_Pers")
-        o = self.lexicon.get_item_by_id("o_Pron_Pers")
-        biz = self.lexicon.get_item_by_id("biz_Pron_Pers")
-        siz = self.lexicon.get_item_by_id("siz_Pron_Pers")
-        falan = self.lexicon.get_item_by_id("falan_Pron_Pers")
-        falanca = self.lexicon.get_item_by_id("falanca_Pron_Pers")
-
-        pronPers_S.add_empty(pA1sg_S, DictionaryItemIs(ben))
-        pronPers_S.add_empty(pA2sg_S, DictionaryItemIs(sen))
-        pronPers_S.add_empty(pA3sg_S, DictionaryItemIsAny(o, falan, falanca))
-        pronPers_S.add(
-            pA3pl_S, "nlAr", DictionaryItemIs(o)
+        ben = "ben_Pron_Pers"
+        sen = "sen_Pron_Pers"
+        o = "o_Pron_Pers"
+        biz = "biz_Pron_Pers"
+        siz = "siz_Pron_Pers"
+        falan = "falan_Pron_Pers"
+        falanca = "falanca_Pron_Pers"
+
+        self.graph.add_empty(pronPers_S, pA1sg_S, DictionaryItemIs(ben))
+        self.graph.add_empty(pronPers_S, pA2sg_S, DictionaryItemIs(sen))
+        self.graph.add_empty(pronPers_S, pA3sg_S, DictionaryItemIsAny(o, falan, falanca))
+        self.graph.add(
+            pronPers_S, pA3pl_S, "nlAr", DictionaryItemIs(o)
         )  # Oflazer does not have "onlar" as Pronoun root.
 
-        pronPers_S.add(pA3pl_S, "lAr", DictionaryItemIsAny(falan, falanca))
-        pronPers_S.add_empty(pA1pl_S, DictionaryItemIs(biz))
-        pronPers_S.add(pA1pl_S, "lAr", DictionaryItemIs(biz))
-        pronPers_S.add_empty(pA2pl_S, DictionaryItemIs(siz))
-        pronPers_S.add(pA2pl_S, "lAr", DictionaryItemIs(siz))
+        self.graph.add(pronPers_S, pA3pl_S, "lAr", DictionaryItemIsAny(falan, falanca))
+        self.graph.add_empty(pronPers_S, pA1pl_S, DictionaryItemIs(biz))
+        self.graph.add(pronPers_S, pA1pl_S, "lAr", DictionaryItemIs(biz))
+        self.graph.add_empty(pronPers_S, pA2pl_S, DictionaryItemIs(siz))
+        self.graph.add(pronPers_S, pA2pl_S, "lAr", DictionaryItemIs(siz))
 
         # --- modified `ben-sen` special state and transitions
-        pronPers_Mod_S.add_empty(pA1sgMod_S, DictionaryItemIs(ben))
-        pronPers_Mod_S.add_empty(pA2sgMod_S, DictionaryItemIs(sen))
-        pA1sgMod_S.add_empty(pPnonMod_S)
-        pA2sgMod_S.add_empty(pPnonMod_S)
-        pPnonMod_S.add(pDat_ST, "A")
+        self.graph.add_empty(pronPers_Mod_S, pA1sgMod_S, DictionaryItemIs(ben))
+        self.graph.add_empty(pronPers_Mod_S, pA2sgMod_S, DictionaryItemIs(sen))
+        self.graph.add_empty(pA1sgMod_S, pPnonMod_S)
+        self.graph.add_empty(pA2sgMod_S, pPnonMod_S)
+        self.graph.add(pPnonMod_S, pDat_ST, "A")
         # ----
 
         # Possesive connecitons are not used.
-        pA1sg_S.add_empty(pPnon_S)
-        pA2sg_S.add_empty(pPnon_S)
-        pA3sg_S.add_empty(pPnon_S)
-        pA1pl_S.add_empty(pPnon_S)
-        pA2pl_S.add_empty(pPnon_S)
-        pA3pl_S.add_empty(pPnon_S)
+        self.graph.add_empty(pA1sg_S, pPnon_S)
+        self.graph.add_empty(pA2sg_S, pPnon_S)
+        self.graph.add_empty(pA3sg_S, pPnon_S)
+        self.graph.add_empty(pA1pl_S, pPnon_S)
+        self.graph.add_empty(pA2pl_S, pPnon_S)
+        self.graph.add_empty(pA3pl_S, pPnon_S)
 
         # ------------ Noun -> Rel -> Pron ---------------------------
         # masanınki
-        pronAfterRel_S.add_empty(pA3sgRel_S)
-        pronAfterRel_S.add(pA3plRel_S, "lAr")
-        pA3sgRel_S.add_empty(pPnonRel_S)
-        pA3plRel_S.add_empty(pPnonRel_S)
-        pPnonRel_S.add_empty(pNom_ST)
-        pPnonRel_S.add(pDat_ST, "+nA")
-        pPnonRel_S.add(pAcc_ST, "+nI")
-        pPnonRel_S.add(pAbl_ST, "+ndAn")
-        pPnonRel_S.add(pLoc_ST, "+ndA")
-        pPnonRel_S.add(pIns_ST, "+ylA")
-        pPnonRel_S.add(pGen_ST, "+nIn")
+        self.graph.add_empty(pronAfterRel_S, pA3sgRel_S)
+        self.graph.add(pronAfterRel_S, pA3plRel_S, "lAr")
+        self.graph.add_empty(pA3sgRel_S, pPnonRel_S)
+        self.graph.add_empty(pA3plRel_S, pPnonRel_S)
+        self.graph.add_empty(pPnonRel_S, pNom_ST)
+        self.graph.add(pPnonRel_S, pDat_ST, "+nA")
+        self.graph.add(pPnonRel_S, pAcc_ST, "+nI")
+        self.graph.add(pPnonRel_S, pAbl_ST, "+ndAn")
+        self.graph.add(pPnonRel_S, pLoc_ST, "+ndA")
+        self.graph.add(pPnonRel_S, pIns_ST, "+ylA")
+        self.graph.add(pPnonRel_S, pGen_ST, "+nIn")
 
         # ------------ Demonstrative pronouns. ------------------------
 
-        bu = self.lexicon.get_item_by_id("bu_Pron_Demons")
+        bu = "bu_Pron_Demons"
 
-        su = self.lexicon.get_item_by_id("şu_Pron_Demons")
+        su = "şu_Pron_Demons"
 
-        o_demons = self.lexicon.get_item_by_id("o_Pron_Demons")
+        o_demons = "o_Pron_Demons"
 
-        pronDemons_S.add_empty(pA3sg_S)
-        pronDemons_S.add(pA3pl_S, "nlAr")
+        self.graph.add_empty(pronDemons_S, pA3sg_S)
+        self.graph.add(pronDemons_S, pA3pl_S, "nlAr")
 
         # ------------ Quantitiva Pronouns ----------------------------
 
-        birbiri = self.lexicon.get_item_by_id("birbiri_Pron_Quant")
-        biri = self.lexicon.get_item_by_id("biri_Pron_Quant")
-        bazi = self.lexicon.get_item_by_id("bazı_Pron_Quant")
-        bircogu = self.lexicon.get_item_by_id("birçoğu_Pron_Quant")
-        birkaci = self.lexicon.get_item_by_id("birkaçı_Pron_Quant")
-        beriki = self.lexicon.get_item_by_id("beriki_Pron_Quant")
-        cogu = self.lexicon.get_item_by_id("çoğu_Pron_Quant")
-        cumlesi = self.lexicon.get_item_by_id("cümlesi_Pron_Quant")
-        hep = self.lexicon.get_item_by_id("hep_Pron_Quant")
-        herbiri = self.lexicon.get_item_by_id("herbiri_Pron_Quant")
-        herkes = self.lexicon.get_item_by_id("herkes_Pron_Quant")
-        hicbiri = self.lexicon.get_item_by_id("hiçbiri_Pron_Quant")
-        hepsi = self.lexicon.get_item_by_id("hepsi_Pron_Quant")
-        kimi = self.lexicon.get_item_by_id("kimi_Pron_Quant")
-        kimse = self.lexicon.get_item_by_id("kimse_Pron_Quant")
-        oburku = self.lexicon.get_item_by_id("öbürkü_Pron_Quant")
-        oburu = self.lexicon.get_item_by_id("öbürü_Pron_Quant")
-        tumu = self.lexicon.get_item_by_id("tümü_Pron_Quant")
-        topu = self.lexicon.get_item_by_id("topu_Pron_Quant")
-        umum = self.lexicon.get_item_by_id("umum_Pron_Quant")
+        birbiri = "birbiri_Pron_Quant"
+        biri = "biri_Pron_Quant"
+        bazi = "bazı_Pron_Quant"
+        bircogu = "birçoğu_Pron_Quant"
+        birkaci = "birkaçı_Pron_Quant"
+        beriki = "beriki_Pron_Quant"
+        cogu = "çoğu_Pron_Quant"
+        cumlesi = "cümlesi_Pron_Quant"
+        hep = "hep_Pron_Quant"
+        herbiri = "herbiri_Pron_Quant"
+        herkes = "herkes_Pron_Quant"
+        hicbiri = "hiçbiri_Pron_Quant"
+        hepsi = "hepsi_Pron_Quant"
+        kimi = "kimi_Pron_Quant"
+        kimse = "kimse_Pron_Quant"
+        oburku = "öbürkü_Pron_Quant"
+        oburu = "öbürü_Pron_Quant"
+        tumu = "tümü_Pron_Quant"
+        topu = "topu_Pron_Quant"
+        umum = "umum_Pron_Quant"
 
         # we have separate A3pl and A3sg states for Quantitive Pronouns.
         # herkes and hep cannot be singular.
-        pronQuant_S.add_empty(
-            pQuantA3sg_S,
+        self.graph.add_empty(
+            pronQuant_S, pQuantA3sg_S,
             DictionaryItemIsAny(
                 herkes, umum, hepsi, cumlesi, hep, tumu, birkaci, topu
             ).not_(),
         )
 
-        pronQuant_S.add(
-            pQuantA3pl_S,
+        self.graph.add(
+            pronQuant_S, pQuantA3pl_S,
             "lAr",
             DictionaryItemIsAny(
                 hep,
@@ -1951,24 +2034,24 @@ class TurkishMorphotactics:
         )
 
         # bazılarınız -> A1pl+P1pl
-        pronQuant_S.add(pQuantA1pl_S, "lAr", DictionaryItemIsAny(bazi))
-        pronQuant_S.add(pQuantA2pl_S, "lAr", DictionaryItemIsAny(bazi))
+        self.graph.add(pronQuant_S, pQuantA1pl_S, "lAr", DictionaryItemIsAny(bazi))
+        self.graph.add(pronQuant_S, pQuantA2pl_S, "lAr", DictionaryItemIsAny(bazi))
 
         # Herkes is implicitly plural.
-        pronQuant_S.add_empty(
-            pQuantA3pl_S,
+        self.graph.add_empty(
+            pronQuant_S, pQuantA3pl_S,
             DictionaryItemIsAny(
                 herkes, umum, birkaci, hepsi, cumlesi, cogu, bircogu, tumu, topu
             ),
         )
 
         # connect "kimse" to Noun-A3sg and Noun-A3pl. It behaves like a noun.
-        pronQuant_S.add_empty(a3sg_S, DictionaryItemIs(kimse))
-        pronQuant_S.add(a3pl_S, "lAr", DictionaryItemIsAny(kimse))
+        self.graph.add_empty(pronQuant_S, a3sg_S, DictionaryItemIs(kimse))
+        self.graph.add(pronQuant_S, a3pl_S, "lAr", DictionaryItemIsAny(kimse))
 
         # for `birbiri-miz` `hep-imiz`
-        pronQuant_S.add_empty(
-            pQuantA1pl_S,
+        self.graph.add_empty(
+            pronQuant_S, pQuantA1pl_S,
             DictionaryItemIsAny(
                 biri,
                 bazi,
@@ -1986,8 +2069,8 @@ class TurkishMorphotactics:
         )
 
         # for `birbiri-niz` and `hep-iniz`
-        pronQuant_S.add_empty(
-            pQuantA2pl_S,
+        self.graph.add_empty(
+            pronQuant_S, pQuantA2pl_S,
             DictionaryItemIsAny(
                 biri,
                 bazi,
@@ -2006,19 +2089,19 @@ class TurkishMorphotactics:
 
         # this is used for birbir-ler-i, çok-lar-ı, birçok-lar-ı separate root and A3pl states are
         # used for this.
-        pronQuantModified_S.add_empty(pQuantModA3pl_S)
-        pQuantModA3pl_S.add(pP3pl_S, "lArI")
+        self.graph.add_empty(pronQuantModified_S, pQuantModA3pl_S)
+        self.graph.add(pQuantModA3pl_S, pP3pl_S, "lArI")
 
         # both `biri-ne` and `birisi-ne` or `birbirine` and `birbirisine` are accepted.
-        pQuantA3sg_S.add_empty(
-            pP3sg_S,
+        self.graph.add_empty(
+            pQuantA3sg_S, pP3sg_S,
             DictionaryItemIsAny(
                 biri, birbiri, kimi, herbiri, hicbiri, oburu, oburku, beriki
             ).and_(not_have(PhoneticAttribute.ModifiedPronoun)),
         )
 
-        pQuantA3sg_S.add(
-            pP3sg_S,
+        self.graph.add(
+            pQuantA3sg_S, pP3sg_S,
             "sI",
             DictionaryItemIsAny(
                 biri, bazi, kimi, birbiri, herbiri, hicbiri, oburku
@@ -2026,31 +2109,31 @@ class TurkishMorphotactics:
         )
 
         # there is no connection from pQuantA3pl to Pnon for preventing `biriler` (except herkes)
-        pQuantA3pl_S.add(
-            pP3pl_S, "I", DictionaryItemIsAny(biri, bazi, birbiri, kimi, oburku, beriki)
+        self.graph.add(
+            pQuantA3pl_S, pP3pl_S, "I", DictionaryItemIsAny(biri, bazi, birbiri, kimi, oburku, beriki)
         )
-        pQuantA3pl_S.add_empty(
-            pP3pl_S,
+        self.graph.add_empty(
+            pQuantA3pl_S, pP3pl_S,
             DictionaryItemIsAny(hepsi, birkaci, cumlesi, cogu, tumu, topu, bircogu),
         )
-        pQuantA3pl_S.add_empty(
-            pPnon_S, DictionaryItemIsAny(herkes, umum, oburku, beriki)
+        self.graph.add_empty(
+            pQuantA3pl_S, pPnon_S, DictionaryItemIsAny(herkes, umum, oburku, beriki)
         )
 
-        pQuantA1pl_S.add(pP1pl_S, "ImIz")
-        pQuantA2pl_S.add(pP2pl_S, "InIz")
+        self.graph.add(pQuantA1pl_S, pP1pl_S, "ImIz")
+        self.graph.add(pQuantA2pl_S, pP2pl_S, "InIz")
 
         # ------------ Question Pronouns ----------------------------
         # `kim` (kim_Pron_Ques), `ne` and `nere`
 
-        ne = self.lexicon.get_item_by_id("ne_Pron_Ques")
-        nere = self.lexicon.get_item_by_id("nere_Pron_Ques")
-        kim = self.lexicon.get_item_by_id("kim_Pron_Ques")
-        pronQues_S.add_empty(pQuesA3sg_S)
-        pronQues_S.add(pQuesA3pl_S, "lAr")
+        ne = "ne_Pron_Ques"
+        nere = "nere_Pron_Ques"
+        kim = "kim_Pron_Ques"
+        self.graph.add_empty(pronQues_S, pQuesA3sg_S)
+        self.graph.add(pronQues_S, pQuesA3pl_S, "lAr")
 
-        pQuesA3sg_S.add_all(
-            [
+        self.graph.add_all(
+            pQuesA3sg_S, [
                 (pPnon_S, ""),
                 (pP3sg_S, "+sI"),
                 (pP1sg_S, "Im", DictionaryItemIs(ne).not_()),
@@ -2062,16 +2145,16 @@ class TurkishMorphotactics:
             ]
         )
 
-        pQuesA3pl_S.add_all(
-            [(pPnon_S, ""), (pP3sg_S, "I"), (pP1sg_S, "Im"), (pP1pl_S, "ImIz")]
+        self.graph.add_all(
+            pQuesA3pl_S, [(pPnon_S, ""), (pP3sg_S, "I"), (pP1sg_S, "Im"), (pP1pl_S, "ImIz")]
         )
 
         # ------------ Reflexive Pronouns ----------------------------
         # `kendi`
 
-        kendi = self.lexicon.get_item_by_id("kendi_Pron_Reflex")
-        pronReflex_S.add_all(
-            [
+        kendi = "kendi_Pron_Reflex"
+        self.graph.add_all(
+            pronReflex_S, [
                 (pReflexA1sg_S, ""),
                 (pReflexA2sg_S, ""),
                 (pReflexA3sg_S, ""),
@@ -2081,13 +2164,13 @@ class TurkishMorphotactics:
             ]
         )
 
-        pReflexA1sg_S.add(pP1sg_S, "Im")
-        pReflexA2sg_S.add(pP2sg_S, "In")
-        pReflexA3sg_S.add(pP3sg_S, "+sI")
-        pReflexA2sg_S.add_empty(pP3sg_S)
-        pReflexA1pl_S.add(pP1pl_S, "ImIz")
-        pReflexA2pl_S.add(pP2pl_S, "InIz")
-        pReflexA3pl_S.add(pP3pl_S, "lArI")
+        self.graph.add(pReflexA1sg_S, pP1sg_S, "Im")
+        self.graph.add(pReflexA2sg_S, pP2sg_S, "In")
+        self.graph.add(pReflexA3sg_S, pP3sg_S, "+sI")
+        self.graph.add_empty(pReflexA2sg_S, pP3sg_S)
+        self.graph.add(pReflexA1pl_S, pP1pl_S, "ImIz")
+        self.graph.add(pReflexA2pl_S, pP2pl_S, "InIz")
+        self.graph.add(pReflexA3pl_S, pP3pl_S, "lArI")
 
         # ------------------------
         # Case connections for all
@@ -2096,8 +2179,8 @@ class TurkishMorphotactics:
 
         yGroup = DictionaryItemIsAny(ne, nere, falan, falanca, hep, herkes)
 
-        pPnon_S.add_all(
-            [
+        self.graph.add_all(
+            pPnon_S, [
                 (pNom_ST, ""),
                 # not allowing `ben-e` and `sen-e`. `ban-a` and `san-a` are using different states
                 (
@@ -2138,8 +2221,8 @@ class TurkishMorphotactics:
 
         conditionpP1sg_S = DictionaryItemIsAny(kim, ben, ne, nere, kendi)
 
-        pP1sg_S.add_all(
-            [
+        self.graph.add_all(
+            pP1sg_S, [
                 (pNom_ST, ""),
                 (pDat_ST, "+nA", nGroup),
                 (pAcc_ST, "+nI", nGroup),
@@ -2154,8 +2237,8 @@ class TurkishMorphotactics:
         )
 
         conditionP2sg = DictionaryItemIsAny(kim, sen, ne, nere, kendi)
-        pP2sg_S.add_all(
-            [
+        self.graph.add_all(
+            pP2sg_S, [
                 (pNom_ST, ""),
                 (pDat_ST, "+nA", nGroup),
                 (pAcc_ST, "+nI", nGroup),
@@ -2173,8 +2256,8 @@ class TurkishMorphotactics:
             kendi, kim, ne, nere, o, bazi, biri, birbiri, herbiri, hep, kimi, hicbiri
         )
 
-        pP3sg_S.add_all(
-            [
+        self.graph.add_all(
+            pP3sg_S, [
                 (pNom_ST, ""),
                 (pDat_ST, "+nA", nGroup),
                 (pAcc_ST, "+nI", nGroup),
@@ -2208,8 +2291,8 @@ class TurkishMorphotactics:
             bazi,
             hicbiri,
         )
-        pP1pl_S.add_all(
-            [
+        self.graph.add_all(
+            pP1pl_S, [
                 (pNom_ST, ""),
                 (pDat_ST, "+nA", nGroup),
                 (pAcc_ST, "+nI", nGroup),
@@ -2223,8 +2306,8 @@ class TurkishMorphotactics:
             ]
         )
 
-        pP2pl_S.add_all(
-            [
+        self.graph.add_all(
+            pP2pl_S, [
                 (pNom_ST, ""),
                 (pDat_ST, "+nA", nGroup),
                 (pAcc_ST, "+nI", nGroup),
@@ -2259,8 +2342,8 @@ class TurkishMorphotactics:
             topu,
         )
 
-        pP3pl_S.add_all(
-            [
+        self.graph.add_all(
+            pP3pl_S, [
                 (pNom_ST, ""),
                 (pDat_ST, "+nA", nGroup),
                 (pAcc_ST, "+nI", nGroup),
@@ -2274,49 +2357,49 @@ class TurkishMorphotactics:
             ]
         )
 
-        pNom_ST.add(
-            with_S, "+nlI", DictionaryItemIsAny(bu, su, o_demons, ben, sen, o, biz, siz)
+        self.graph.add(
+            pNom_ST, with_S, "+nlI", DictionaryItemIsAny(bu, su, o_demons, ben, sen, o, biz, siz)
         )
-        pNom_ST.add(with_S, "lI", DictionaryItemIsAny(nere))
-        pNom_ST.add(with_S, "+ylI", DictionaryItemIsAny(ne))
-        pNom_ST.add(
-            without_S,
+        self.graph.add(pNom_ST, with_S, "lI", DictionaryItemIsAny(nere))
+        self.graph.add(pNom_ST, with_S, "+ylI", DictionaryItemIsAny(ne))
+        self.graph.add(
+            pNom_ST, without_S,
             "+nsIz",
             DictionaryItemIsAny(nere, bu, su, o_demons, ben, sen, o, biz, siz),
         )
-        pNom_ST.add(without_S, "+ysIz", DictionaryItemIsAny(ne))
-        pGen_ST.add(
-            rel_S,
+        self.graph.add(pNom_ST, without_S, "+ysIz", DictionaryItemIsAny(ne))
+        self.graph.add(
+            pGen_ST, rel_S,
             "ki",
             DictionaryItemIsAny(nere, bu, su, o_demons, ne, sen, o, biz, siz),
         )
 
         notRelRepetition = HasTailSequence(rel, adj, zero, noun, a3sg, pnon, loc).not_()
-        pLoc_ST.add(rel_S, "ki", notRelRepetition)
+        self.graph.add(pLoc_ST, rel_S, "ki", notRelRepetition)
 
-        pIns_ST.add(vWhile_S, "+yken")
+        self.graph.add(pIns_ST, vWhile_S, "+yken")
 
         # ------------- Derivation connections ---------
 
-        pNom_ST.add_empty(pronZeroDeriv_S, HasTail())
-        pDat_ST.add_empty(pronZeroDeriv_S, HasTail())
-        pLoc_ST.add_empty(pronZeroDeriv_S, HasTail())
-        pAbl_ST.add_empty(pronZeroDeriv_S, HasTail())
-        pGen_ST.add_empty(pronZeroDeriv_S, HasTail())
-        pIns_ST.add_empty(pronZeroDeriv_S, HasTail())
+        self.graph.add_empty(pNom_ST, pronZeroDeriv_S, HasTail())
+        self.graph.add_empty(pDat_ST, pronZeroDeriv_S, HasTail())
+        self.graph.add_empty(pLoc_ST, pronZeroDeriv_S, HasTail())
+        self.graph.add_empty(pAbl_ST, pronZeroDeriv_S, HasTail())
+        self.graph.add_empty(pGen_ST, pronZeroDeriv_S, HasTail())
+        self.graph.add_empty(pIns_ST, pronZeroDeriv_S, HasTail())
 
-        pronZeroDeriv_S.add_empty(pvVerbRoot_S)
+        self.graph.add_empty(pronZeroDeriv_S, pvVerbRoot_S)
 
     def connect_verb_after_pronoun(self):
-        pvVerbRoot_S.add_empty(pvPresent_S)
+        self.graph.add_empty(pvVerbRoot_S, pvPresent_S)
 
-        pvVerbRoot_S.add(vWhile_S, "+yken")
+        self.graph.add(pvVerbRoot_S, vWhile_S, "+yken")
 
-        pvVerbRoot_S.add(pvPast_S, "+ydI")
+        self.graph.add(pvVerbRoot_S, pvPast_S, "+ydI")
 
-        pvVerbRoot_S.add(pvNarr_S, "+ymIş")
+        self.graph.add(pvVerbRoot_S, pvNarr_S, "+ymIş")
 
-        pvVerbRoot_S.add(pvCond_S, "+ysA")
+        self.graph.add(pvVerbRoot_S, pvCond_S, "+ysA")
 
         # disallow `benin, bizim with A1sg analysis etc.`
 
@@ -2330,92 +2413,92 @@ class TurkishMorphotactics:
 
         allowA2plTrans = PreviousGroupContains(pA2sg_S, pP2pl_S).not_()
 
-        pvPresent_S.add(pvA1sg_ST, "+yIm", allowA1sgTrans)
-        pvPresent_S.add(pvA2sg_ST, "sIn", allowA2sgTrans)
+        self.graph.add(pvPresent_S, pvA1sg_ST, "+yIm", allowA1sgTrans)
+        self.graph.add(pvPresent_S, pvA2sg_ST, "sIn", allowA2sgTrans)
         # We do not allow ending with A3sg from empty Present tense.
-        pvPresent_S.add_empty(nA3sg_S)
-        pvPresent_S.add(pvA1pl_ST, "+yIz", allowA1plTrans)
-        pvPresent_S.add(pvA2pl_ST, "sInIz")
-        pvPresent_S.add(pvA3pl_ST, "lAr", PreviousGroupContains(pLoc_ST))
-
-        pvPast_S.add(pvA1sg_ST, "m", allowA1sgTrans)
-        pvPast_S.add(pvA2sg_ST, "n", allowA2sgTrans)
-        pvPast_S.add(pvA1pl_ST, "k", allowA1plTrans)
-        pvPast_S.add(pvA2pl_ST, "InIz")
-        pvPast_S.add(pvA3pl_ST, "lAr")
-        pvPast_S.add_empty(pvA3sg_ST)
-
-        pvNarr_S.add(pvA1sg_ST, "Im", allowA1sgTrans)
-        pvNarr_S.add(pvA2sg_ST, "sIn", allowA2sgTrans)
-        pvNarr_S.add(pvA1pl_ST, "Iz", allowA1plTrans)
-        pvNarr_S.add(pvA2pl_ST, "sInIz")
-        pvNarr_S.add(pvA3pl_ST, "lAr")
-        pvNarr_S.add_empty(pvA3sg_ST)
+        self.graph.add_empty(pvPresent_S, nA3sg_S)
+        self.graph.add(pvPresent_S, pvA1pl_ST, "+yIz", allowA1plTrans)
+        self.graph.add(pvPresent_S, pvA2pl_ST, "sInIz")
+        self.graph.add(pvPresent_S, pvA3pl_ST, "lAr", PreviousGroupContains(pLoc_ST))
+
+        self.graph.add(pvPast_S, pvA1sg_ST, "m", allowA1sgTrans)
+        self.graph.add(pvPast_S, pvA2sg_ST, "n", allowA2sgTrans)
+        self.graph.add(pvPast_S, pvA1pl_ST, "k", allowA1plTrans)
+        self.graph.add(pvPast_S, pvA2pl_ST, "InIz")
+        self.graph.add(pvPast_S, pvA3pl_ST, "lAr")
+        self.graph.add_empty(pvPast_S, pvA3sg_ST)
+
+        self.graph.add(pvNarr_S, pvA1sg_ST, "Im", allowA1sgTrans)
+        self.graph.add(pvNarr_S, pvA2sg_ST, "sIn", allowA2sgTrans)
+        self.graph.add(pvNarr_S, pvA1pl_ST, "Iz", allowA1plTrans)
+        self.graph.add(pvNarr_S, pvA2pl_ST, "sInIz")
+        self.graph.add(pvNarr_S, pvA3pl_ST, "lAr")
+        self.graph.add_empty(pvNarr_S, pvA3sg_ST)
         # narr+cons is allowed but not past+cond
-        pvNarr_S.add(pvCond_S, "sA")
+        self.graph.add(pvNarr_S, pvCond_S, "sA")
 
-        pvCond_S.add(pvA1sg_ST, "m", allowA1sgTrans)
-        pvCond_S.add(pvA2sg_ST, "n", allowA2sgTrans)
-        pvCond_S.add(pvA1pl_ST, "k", allowA1plTrans)
-        pvCond_S.add(pvA2pl_ST, "nIz", allowA2plTrans)
-        pvCond_S.add_empty(pvA3sg_ST)
-        pvCond_S.add(pvA3pl_ST, "lAr")
+        self.graph.add(pvCond_S, pvA1sg_ST, "m", allowA1sgTrans)
+        self.graph.add(pvCond_S, pvA2sg_ST, "n", allowA2sgTrans)
+        self.graph.add(pvCond_S, pvA1pl_ST, "k", allowA1plTrans)
+        self.graph.add(pvCond_S, pvA2pl_ST, "nIz", allowA2plTrans)
+        self.graph.add_empty(pvCond_S, pvA3sg_ST)
+        self.graph.add(pvCond_S, pvA3pl_ST, "lAr")
 
         rejectNoCopula = CurrentGroupContainsAny(
             pvPast_S, pvCond_S, pvCopBeforeA3pl_S
         ).not_()
 
-        pvA1sg_ST.add(pvCop_ST, "dIr", rejectNoCopula)
-        pvA2sg_ST.add(pvCop_ST, "dIr", rejectNoCopula)
-        pvA1pl_ST.add(pvCop_ST, "dIr", rejectNoCopula)
-        pvA2pl_ST.add(pvCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(pvA1sg_ST, pvCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(pvA2sg_ST, pvCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(pvA1pl_ST, pvCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(pvA2pl_ST, pvCop_ST, "dIr", rejectNoCopula)
 
-        pvA3sg_S.add(pvCop_ST, ">dIr", rejectNoCopula)
+        self.graph.add(pvA3sg_S, pvCop_ST, ">dIr", rejectNoCopula)
 
-        pvA3pl_ST.add(pvCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(pvA3pl_ST, pvCop_ST, "dIr", rejectNoCopula)
 
         # Copula can come before A3pl.
-        pvPresent_S.add(pvCopBeforeA3pl_S, ">dIr")
-        pvCopBeforeA3pl_S.add(pvA3pl_ST, "lAr")
+        self.graph.add(pvPresent_S, pvCopBeforeA3pl_S, ">dIr")
+        self.graph.add(pvCopBeforeA3pl_S, pvA3pl_ST, "lAr")
 
     def connect_adverbs(self):
-        advNounRoot_ST.add_empty(avZero_S)
-        avZero_S.add_empty(avNounAfterAdvRoot_ST)
-        avNounAfterAdvRoot_ST.add_empty(avA3sg_S)
-        avA3sg_S.add_empty(avPnon_S)
-        avPnon_S.add(avDat_ST, "+yA")
+        self.graph.add_empty(advNounRoot_ST, avZero_S)
+        self.graph.add_empty(avZero_S, avNounAfterAdvRoot_ST)
+        self.graph.add_empty(avNounAfterAdvRoot_ST, avA3sg_S)
+        self.graph.add_empty(avA3sg_S, avPnon_S)
+        self.graph.add(avPnon_S, avDat_ST, "+yA")
 
-        advForVerbDeriv_ST.add_empty(avZeroToVerb_S)
-        avZeroToVerb_S.add_empty(nVerb_S)
+        self.graph.add_empty(advForVerbDeriv_ST, avZeroToVerb_S)
+        self.graph.add_empty(avZeroToVerb_S, nVerb_S)
 
     def connect_postpositives(self):
-        postpRoot_ST.add_empty(postpZero_S)
-        postpZero_S.add_empty(nVerb_S)
+        self.graph.add_empty(postpRoot_ST, postpZero_S)
+        self.graph.add_empty(postpZero_S, nVerb_S)
 
         # gibi is kind of special.
-        gibiGen = self.lexicon.get_item_by_id("gibi_Postp_PCGen")
-        gibiNom = self.lexicon.get_item_by_id("gibi_Postp_PCNom")
-        sonraAbl = self.lexicon.get_item_by_id("sonra_Postp_PCAbl")
-        postpZero_S.add_empty(
-            po2nRoot_S, DictionaryItemIsAny(gibiGen, gibiNom, sonraAbl)
+        gibiGen = "gibi_Postp_PCGen"
+        gibiNom = "gibi_Postp_PCNom"
+        sonraAbl = "sonra_Postp_PCAbl"
+        self.graph.add_empty(
+            postpZero_S, po2nRoot_S, DictionaryItemIsAny(gibiGen, gibiNom, sonraAbl)
         )
 
-        po2nRoot_S.add_empty(po2nA3sg_S)
-        po2nRoot_S.add(po2nA3pl_S, "lAr")
+        self.graph.add_empty(po2nRoot_S, po2nA3sg_S)
+        self.graph.add(po2nRoot_S, po2nA3pl_S, "lAr")
 
         # gibisi, gibim-e, gibi-e, gibi-mize
-        po2nA3sg_S.add(po2nP3sg_S, "+sI")
-        po2nA3sg_S.add(po2nP1sg_S, "m", DictionaryItemIsAny(gibiGen, gibiNom))
-        po2nA3sg_S.add(po2nP2sg_S, "n", DictionaryItemIsAny(gibiGen, gibiNom))
-        po2nA3sg_S.add(po2nP1pl_S, "miz", DictionaryItemIsAny(gibiGen, gibiNom))
-        po2nA3sg_S.add(po2nP2pl_S, "niz", DictionaryItemIsAny(gibiGen, gibiNom))
+        self.graph.add(po2nA3sg_S, po2nP3sg_S, "+sI")
+        self.graph.add(po2nA3sg_S, po2nP1sg_S, "m", DictionaryItemIsAny(gibiGen, gibiNom))
+        self.graph.add(po2nA3sg_S, po2nP2sg_S, "n", DictionaryItemIsAny(gibiGen, gibiNom))
+        self.graph.add(po2nA3sg_S, po2nP1pl_S, "miz", DictionaryItemIsAny(gibiGen, gibiNom))
+        self.graph.add(po2nA3sg_S, po2nP2pl_S, "niz", DictionaryItemIsAny(gibiGen, gibiNom))
 
         # gibileri
-        po2nA3pl_S.add(po2nP3sg_S, "+sI")
-        po2nA3pl_S.add_empty(po2nPnon_S)
+        self.graph.add(po2nA3pl_S, po2nP3sg_S, "+sI")
+        self.graph.add_empty(po2nA3pl_S, po2nPnon_S)
 
-        po2nP3sg_S.add_all(
-            [
+        self.graph.add_all(
+            po2nP3sg_S, [
                 (po2nNom_ST, ""),
                 (po2nDat_ST, "nA"),
                 (po2nLoc_ST, "ndA"),
@@ -2426,8 +2509,8 @@ class TurkishMorphotactics:
             ]
         )
 
-        po2nPnon_S.add_all(
-            [
+        self.graph.add_all(
+            po2nPnon_S, [
                 (po2nNom_ST, ""),
                 (po2nDat_ST, "A"),
                 (po2nLoc_ST, "dA"),
@@ -2439,17 +2522,17 @@ class TurkishMorphotactics:
             ]
         )
 
-        po2nP1sg_S.add(po2nDat_ST, "e")
-        po2nP2sg_S.add(po2nDat_ST, "e")
-        po2nP1pl_S.add(po2nDat_ST, "e")
-        po2nP2pl_S.add(po2nDat_ST, "e")
+        self.graph.add(po2nP1sg_S, po2nDat_ST, "e")
+        self.graph.add(po2nP2sg_S, po2nDat_ST, "e")
+        self.graph.add(po2nP1pl_S, po2nDat_ST, "e")
+        self.graph.add(po2nP2pl_S, po2nDat_ST, "e")
 
     def connect_verbs(self):
         # Imperative.
-        verbRoot_S.add_empty(vImp_S)
+        self.graph.add_empty(verbRoot_S, vImp_S)
 
-        vImp_S.add_all(
-            [
+        self.graph.add_all(
+            vImp_S, [
                 (vA2sg_ST, ""),  # oku
                 (vA2sg_ST, "sAnA"),  # oku
                 (vA3sg_ST, "sIn"),  # okusun
@@ -2467,34 +2550,34 @@ class TurkishMorphotactics:
         # 3- "Ir" form appears after some specific verbs but currently we treat them as separate verb.
         # such as "pişmek - pişirmek". Oflazer parses them as causative.
 
-        verbRoot_S.add(
-            vCausT_S,
+        self.graph.add(
+            verbRoot_S, vCausT_S,
             "t",
             HasRootAttribute(RootAttribute.Causative_t)
                 .or_(LastDerivationIs(vCausTir_S))
                 .and_not(LastDerivationIsAny(vCausT_S, vPass_S, vAble_S)),
         )
 
-        verbRoot_S.add(
-            vCausTir_S,
+        self.graph.add(
+            verbRoot_S, vCausTir_S,
             ">dIr",
             HasPhoneticAttribute(PhoneticAttribute.LastLetterConsonant).and_not(
                 LastDerivationIsAny(vCausTir_S, vPass_S, vAble_S)
             ),
         )
 
-        vCausT_S.add_empty(verbRoot_S)
-        vCausTir_S.add_empty(verbRoot_S)
+        self.graph.add_empty(vCausT_S, verbRoot_S)
+        self.graph.add_empty(vCausTir_S, verbRoot_S)
 
         # Progressive1 suffix. "-Iyor"
         # if last letter is a vowel, this is handled with verbRoot_VowelDrop_S root.
-        verbRoot_S.add(vProgYor_S, "Iyor", not_have(PhoneticAttribute.LastLetterVowel))
+        self.graph.add(verbRoot_S, vProgYor_S, "Iyor", not_have(PhoneticAttribute.LastLetterVowel))
 
         # For "aramak", the modified root "ar" connects to verbRoot_VowelDrop_S. Here it is connected to
         # progressive "Iyor" suffix. We use a separate root state for these for convenience.
-        verbRoot_VowelDrop_S.add(vProgYor_S, "Iyor")
-        vProgYor_S.add_all(
-            [
+        self.graph.add(verbRoot_VowelDrop_S, vProgYor_S, "Iyor")
+        self.graph.add_all(
+            vProgYor_S, [
                 (vA1sg_ST, "um"),
                 (vA2sg_ST, "sun"),
                 (vA3sg_ST, ""),
@@ -2510,9 +2593,9 @@ class TurkishMorphotactics:
         )
 
         # Progressive - 2 "-mAktA"
-        verbRoot_S.add(vProgMakta_S, "mAktA")
-        vProgMakta_S.add_all(
-            [
+        self.graph.add(verbRoot_S, vProgMakta_S, "mAktA")
+        self.graph.add_all(
+            vProgMakta_S, [
                 (vA1sg_ST, "yIm"),
                 (vA2sg_ST, "sIn"),
                 (vA3sg_ST, ""),
@@ -2531,18 +2614,18 @@ class TurkishMorphotactics:
         # For single syllable words, it forms as "ar-er". For others "ir-ır-ur-ür"
         # However there are exceptions to it as well. So dictionary items are marked as Aorist_I and
         # Aorist_A.
-        verbRoot_S.add(
-            vAor_S,
+        self.graph.add(
+            verbRoot_S, vAor_S,
             "Ir",
             HasRootAttribute(RootAttribute.Aorist_I).or_(HasAnySuffixSurface()),
         )
-        verbRoot_S.add(
-            vAor_S,
+        self.graph.add(
+            verbRoot_S, vAor_S,
             "Ar",
             HasRootAttribute(RootAttribute.Aorist_A).and_(HasAnySuffixSurface().not_()),
         )
-        vAor_S.add_all(
-            [
+        self.graph.add_all(
+            vAor_S, [
                 (vA1sg_ST, "Im"),
                 (vA2sg_ST, "sIn"),
                 (vA3sg_ST, ""),
@@ -2558,10 +2641,10 @@ class TurkishMorphotactics:
         )
 
         # Negative
-        verbRoot_S.add(vNeg_S, "mA", PreviousMorphemeIs(able).not_())
+        self.graph.add(verbRoot_S, vNeg_S, "mA", PreviousMorphemeIs(able).not_())
 
-        vNeg_S.add_all(
-            [
+        self.graph.add_all(
+            vNeg_S, [
                 (vImp_S, ""),
                 (vPast_S, "dI"),
                 (vFut_S, "yAcA~k"),
@@ -2596,15 +2679,15 @@ class TurkishMorphotactics:
 
         # Negative form is "m" before progressive "Iyor" because last vowel drops.
         # We use a separate negative state for this.
-        verbRoot_S.add(vNegProg1_S, "m")
-        vNegProg1_S.add(vProgYor_S, "Iyor")
+        self.graph.add(verbRoot_S, vNegProg1_S, "m")
+        self.graph.add(vNegProg1_S, vProgYor_S, "Iyor")
 
         # Negative Aorist
         # Aorist tense forms differently after negative. It can be "z" or empty.
-        vNeg_S.add(vAorNeg_S, "z")
-        vNeg_S.add_empty(vAorNegEmpty_S)
-        vAorNeg_S.add_all(
-            [
+        self.graph.add(vNeg_S, vAorNeg_S, "z")
+        self.graph.add_empty(vNeg_S, vAorNegEmpty_S)
+        self.graph.add_all(
+            vAorNeg_S, [
                 (vA2sg_ST, "sIn"),
                 (vA3sg_ST, ""),
                 (vA2pl_ST, "sInIz"),
@@ -2617,116 +2700,116 @@ class TurkishMorphotactics:
             ]
         )
 
-        vAorNegEmpty_S.add(vA1sg_ST, "m")
-        vAorNegEmpty_S.add(vA1pl_ST, "yIz")
+        self.graph.add(vAorNegEmpty_S, vA1sg_ST, "m")
+        self.graph.add(vAorNegEmpty_S, vA1pl_ST, "yIz")
         # oku-maz-ım TODO: not sure here.
-        vNeg_S.add(vAorPartNeg_S, "z")
-        vAorPartNeg_S.add_empty(adjAfterVerb_ST)
+        self.graph.add(vNeg_S, vAorPartNeg_S, "z")
+        self.graph.add_empty(vAorPartNeg_S, adjAfterVerb_ST)
 
         # Positive Ability.
         # This makes a Verb-Verb derivation.
-        verbRoot_S.add(vAble_S, "+yAbil", LastDerivationIs(vAble_S).not_())
+        self.graph.add(verbRoot_S, vAble_S, "+yAbil", LastDerivationIs(vAble_S).not_())
 
-        vAble_S.add_empty(verbRoot_S)
+        self.graph.add_empty(vAble_S, verbRoot_S)
 
         # Also for ability that comes before negative, we add a new root state.
         # From there only negative connections is possible.
-        vAbleNeg_S.add_empty(vAbleNegDerivRoot_S)
-        vAbleNegDerivRoot_S.add(vNeg_S, "mA")
-        vAbleNegDerivRoot_S.add(vNegProg1_S, "m")
+        self.graph.add_empty(vAbleNeg_S, vAbleNegDerivRoot_S)
+        self.graph.add(vAbleNegDerivRoot_S, vNeg_S, "mA")
+        self.graph.add(vAbleNegDerivRoot_S, vNegProg1_S, "m")
 
         # it is possible to have abil derivation after negative.
-        vNeg_S.add(vAble_S, "yAbil")
+        self.graph.add(vNeg_S, vAble_S, "yAbil")
 
         # Unable.
-        verbRoot_S.add(vUnable_S, "+yAmA", PreviousMorphemeIs(able).not_())
+        self.graph.add(verbRoot_S, vUnable_S, "+yAmA", PreviousMorphemeIs(able).not_())
         # careful here. We copy all outgoing transitions to "unable"
-        vUnable_S.copy_outgoing_transitions_from(vNeg_S)
-        verbRoot_S.add(vUnableProg1_S, "+yAm")
-        vUnableProg1_S.add(vProgYor_S, "Iyor")
+        self.graph.copy_outgoing_transitions_from(vUnable_S, vNeg_S)
+        self.graph.add(verbRoot_S, vUnableProg1_S, "+yAm")
+        self.graph.add(vUnableProg1_S, vProgYor_S, "Iyor")
 
         # Infinitive 1 "mAk"
         # Causes Verb to Noun derivation. It is connected to a special noun root state.
-        verbRoot_S.add(vInf1_S, "mA~k")
-        vInf1_S.add_empty(nounInf1Root_S)
+        self.graph.add(verbRoot_S, vInf1_S, "mA~k")
+        self.graph.add_empty(vInf1_S, nounInf1Root_S)
 
         # Infinitive 2 "mA"
         # Causes Verb to Noun derivation.
-        verbRoot_S.add(vInf2_S, "mA")
-        vInf2_S.add_empty(noun_S)
+        self.graph.add(verbRoot_S, vInf2_S, "mA")
+        self.graph.add_empty(vInf2_S, noun_S)
 
         # Infinitive 3 "+yUş"
         # Causes Verb to Noun derivation.
-        verbRoot_S.add(vInf3_S, "+yIş")
-        vInf3_S.add_empty(noun_S)
+        self.graph.add(verbRoot_S, vInf3_S, "+yIş")
+        self.graph.add_empty(vInf3_S, noun_S)
 
         # Agt 3 "+yIcI"
         # Causes Verb to Noun and Adj derivation.
-        verbRoot_S.add(vAgt_S, "+yIcI")
-        vAgt_S.add_empty(noun_S)
-        vAgt_S.add_empty(adjAfterVerb_ST)
+        self.graph.add(verbRoot_S, vAgt_S, "+yIcI")
+        self.graph.add_empty(vAgt_S, noun_S)
+        self.graph.add_empty(vAgt_S, adjAfterVerb_ST)
 
         # ActOf "mAcA"
         # Causes Verb to Noun and Adj derivation.
-        verbRoot_S.add(vActOf_S, "mAcA")
-        vActOf_S.add_empty(nounActOfRoot_S)
+        self.graph.add(verbRoot_S, vActOf_S, "mAcA")
+        self.graph.add_empty(vActOf_S, nounActOfRoot_S)
 
         # PastPart "oku-duğ-um"
-        verbRoot_S.add(vPastPart_S, ">dI~k")
-        verbRoot_S.add(vPastPart_S, ">dI!ğ")
-        vPastPart_S.add_empty(noun_S)
-        vPastPart_S.add_empty(adjAfterVerb_S)
+        self.graph.add(verbRoot_S, vPastPart_S, ">dI~k")
+        self.graph.add(verbRoot_S, vPastPart_S, ">dI!ğ")
+        self.graph.add_empty(vPastPart_S, noun_S)
+        self.graph.add_empty(vPastPart_S, adjAfterVerb_S)
 
         # FutPart "oku-yacağ-ım kitap"
-        verbRoot_S.add(vFutPart_S, "+yAcA~k")
-        verbRoot_S.add(vFutPart_S, "+yAcA!ğ")
-        vFutPart_S.add_empty(noun_S, HasTail())
-        vFutPart_S.add_empty(adjAfterVerb_S)
+        self.graph.add(verbRoot_S, vFutPart_S, "+yAcA~k")
+        self.graph.add(verbRoot_S, vFutPart_S, "+yAcA!ğ")
+        self.graph.add_empty(vFutPart_S, noun_S, HasTail())
+        self.graph.add_empty(vFutPart_S, adjAfterVerb_S)
 
         # FutPart "oku-yacağ-ım kitap"
-        verbRoot_S.add(vNarrPart_S, "mIş")
-        vNarrPart_S.add_empty(adjectiveRoot_ST)
+        self.graph.add(verbRoot_S, vNarrPart_S, "mIş")
+        self.graph.add_empty(vNarrPart_S, adjectiveRoot_ST)
 
         # AorPart "okunabilir-lik"
-        verbRoot_S.add(
-            vAorPart_S,
+        self.graph.add(
+            verbRoot_S, vAorPart_S,
             "Ir",
             HasRootAttribute(RootAttribute.Aorist_I).or_(HasAnySuffixSurface()),
         )
-        verbRoot_S.add(
-            vAorPart_S,
+        self.graph.add(
+            verbRoot_S, vAorPart_S,
             "Ar",
             HasRootAttribute(RootAttribute.Aorist_A).and_(HasAnySuffixSurface().not_()),
         )
-        vAorPart_S.add_empty(adjAfterVerb_ST)
+        self.graph.add_empty(vAorPart_S, adjAfterVerb_ST)
 
         # PresPart
-        verbRoot_S.add(vPresPart_S, "+yAn")
-        vPresPart_S.add_empty(noun_S, HasTail())
-        vPresPart_S.add_empty(adjAfterVerb_ST)  # connect to terminal Adj
+        self.graph.add(verbRoot_S, vPresPart_S, "+yAn")
+        self.graph.add_empty(vPresPart_S, noun_S, HasTail())
+        self.graph.add_empty(vPresPart_S, adjAfterVerb_ST)  # connect to terminal Adj
 
         # FeelLike
-        verbRoot_S.add(vFeelLike_S, "+yAsI")
-        vFeelLike_S.add_empty(noun_S, HasTail())
-        vFeelLike_S.add_empty(adjAfterVerb_ST)  # connect to terminal Adj
+        self.graph.add(verbRoot_S, vFeelLike_S, "+yAsI")
+        self.graph.add_empty(vFeelLike_S, noun_S, HasTail())
+        self.graph.add_empty(vFeelLike_S, adjAfterVerb_ST)  # connect to terminal Adj
 
         # NotState
-        verbRoot_S.add(vNotState_S, "mAzlI~k")
-        verbRoot_S.add(vNotState_S, "mAzlI!ğ")
-        vNotState_S.add_empty(noun_S)
+        self.graph.add(verbRoot_S, vNotState_S, "mAzlI~k")
+        self.graph.add(verbRoot_S, vNotState_S, "mAzlI!ğ")
+        self.graph.add_empty(vNotState_S, noun_S)
 
         # reciprocal
         # TODO: for reducing ambiguity for now remove reciprocal
 
-        # verbRoot_S.add(vRecip_S, "Iş", not_haveAny(RootAttribute.Reciprocal, RootAttribute.NonReciprocal)
+        # self.graph.add(verbRoot_S, vRecip_S, "Iş", not_haveAny(RootAttribute.Reciprocal, RootAttribute.NonReciprocal)
         #     .and_not(new ContainsMorpheme(recip)))
 
-        vRecip_S.add_empty(verbRoot_S)
-        vImplicitRecipRoot_S.add_empty(vRecip_S)
+        self.graph.add_empty(vRecip_S, verbRoot_S)
+        self.graph.add_empty(vImplicitRecipRoot_S, vRecip_S)
 
         # reflexive
-        vImplicitReflexRoot_S.add_empty(vReflex_S)
-        vReflex_S.add_empty(verbRoot_S)
+        self.graph.add_empty(vImplicitReflexRoot_S, vReflex_S)
+        self.graph.add_empty(vReflex_S, verbRoot_S)
 
         # Passive
         # Causes Verb-Verb derivation. Passive morpheme has three forms.
@@ -2735,28 +2818,28 @@ class TurkishMorphotactics:
         # 3- If Verb ends with other consonants: "nIl"
         # When loading dictionary, first and second case items are marked with Passive_In
 
-        verbRoot_S.add(
-            vPass_S,
+        self.graph.add(
+            verbRoot_S, vPass_S,
             "In",
             HasRootAttribute(RootAttribute.Passive_In).and_not(ContainsMorpheme(pass_)),
         )
-        verbRoot_S.add(
-            vPass_S,
+        self.graph.add(
+            verbRoot_S, vPass_S,
             "InIl",
             HasRootAttribute(RootAttribute.Passive_In).and_not(ContainsMorpheme(pass_)),
         )
-        verbRoot_S.add(
-            vPass_S,
+        self.graph.add(
+            verbRoot_S, vPass_S,
             "+nIl",
             PreviousStateIsAny(vCausT_S, vCausTir_S)
                 .or_(not_have(RootAttribute.Passive_In))
                 .and_not(ContainsMorpheme(pass_)),
         )
-        vPass_S.add_empty(verbRoot_S)
+        self.graph.add_empty(vPass_S, verbRoot_S)
 
         # Condition "oku-r-sa"
-        vCond_S.add_all(
-            [
+        self.graph.add_all(
+            vCond_S, [
                 (vA1sg_ST, "m"),
                 (vA2sg_ST, "n"),
                 (vA3sg_ST, ""),
@@ -2767,9 +2850,9 @@ class TurkishMorphotactics:
         )
 
         # Past "oku-du"
-        verbRoot_S.add(vPast_S, ">dI")
-        vPast_S.add_all(
-            [
+        self.graph.add(verbRoot_S, vPast_S, ">dI")
+        self.graph.add_all(
+            vPast_S, [
                 (vA1sg_ST, "m"),
                 (vA2sg_ST, "n"),
                 (vA3sg_ST, ""),
@@ -2779,12 +2862,12 @@ class TurkishMorphotactics:
             ]
         )
 
-        vPast_S.add(vCond_S, "ysA")
+        self.graph.add(vPast_S, vCond_S, "ysA")
 
         # Narrative "oku-muş"
-        verbRoot_S.add(vNarr_S, "mIş")
-        vNarr_S.add_all(
-            [
+        self.graph.add(verbRoot_S, vNarr_S, "mIş")
+        self.graph.add_all(
+            vNarr_S, [
                 (vA1sg_ST, "Im"),
                 (vA2sg_ST, "sIn"),
                 (vA3sg_ST, ""),
@@ -2794,15 +2877,15 @@ class TurkishMorphotactics:
             ]
         )
 
-        vNarr_S.add(vCond_S, "sA")
-        vNarr_S.add(vPastAfterTense_S, "tI")
-        vNarr_S.add(vCopBeforeA3pl_S, "tIr")
-        vNarr_S.add(vWhile_S, "ken")
-        vNarr_S.add(vNarrAfterTense_S, "mIş")
+        self.graph.add(vNarr_S, vCond_S, "sA")
+        self.graph.add(vNarr_S, vPastAfterTense_S, "tI")
+        self.graph.add(vNarr_S, vCopBeforeA3pl_S, "tIr")
+        self.graph.add(vNarr_S, vWhile_S, "ken")
+        self.graph.add(vNarr_S, vNarrAfterTense_S, "mIş")
 
         # Past after tense "oku-muş-tu"
-        vPastAfterTense_S.add_all(
-            [
+        self.graph.add_all(
+            vPastAfterTense_S, [
                 (vA1sg_ST, "m"),
                 (vA2sg_ST, "n"),
                 (vA3sg_ST, ""),
@@ -2813,8 +2896,8 @@ class TurkishMorphotactics:
         )
 
         # Narrative after tense "oku-r-muş"
-        vNarrAfterTense_S.add_all(
-            [
+        self.graph.add_all(
+            vNarrAfterTense_S, [
                 (vA1sg_ST, "Im"),
                 (vA2sg_ST, "sIn"),
                 # for preventing yap+ar+lar(A3pl)+mış+A3sg
@@ -2825,15 +2908,15 @@ class TurkishMorphotactics:
             ]
         )
 
-        vNarrAfterTense_S.add(vWhile_S, "ken")
-        vNarrAfterTense_S.add(vCopBeforeA3pl_S, "tIr")
+        self.graph.add(vNarrAfterTense_S, vWhile_S, "ken")
+        self.graph.add(vNarrAfterTense_S, vCopBeforeA3pl_S, "tIr")
 
         # Future "oku-yacak"
-        verbRoot_S.add(vFut_S, "+yAcA~k")
-        verbRoot_S.add(vFut_S, "+yAcA!ğ")
+        self.graph.add(verbRoot_S, vFut_S, "+yAcA~k")
+        self.graph.add(verbRoot_S, vFut_S, "+yAcA!ğ")
 
-        vFut_S.add_all(
-            [
+        self.graph.add_all(
+            vFut_S, [
                 (vA1sg_ST, "Im"),
                 (vA2sg_ST, "sIn"),
                 (vA3sg_ST, ""),
@@ -2843,11 +2926,11 @@ class TurkishMorphotactics:
             ]
         )
 
-        vFut_S.add(vCond_S, "sA")
-        vFut_S.add(vPastAfterTense_S, "tI")
-        vFut_S.add(vNarrAfterTense_S, "mIş")
-        vFut_S.add(vCopBeforeA3pl_S, "tIr")
-        vFut_S.add(vWhile_S, "ken")
+        self.graph.add(vFut_S, vCond_S, "sA")
+        self.graph.add(vFut_S, vPastAfterTense_S, "tI")
+        self.graph.add(vFut_S, vNarrAfterTense_S, "mIş")
+        self.graph.add(vFut_S, vCopBeforeA3pl_S, "tIr")
+        self.graph.add(vFut_S, vWhile_S, "ken")
 
         # `demek` and `yemek` are special because they are the only two verbs with two letters
         # and ends with a vowel.
@@ -2865,8 +2948,8 @@ class TurkishMorphotactics:
             everSince, repeat, almost, hastily, stay, start
         ).not_()
 
-        vDeYeRoot_S.add_all(
-            [
+        self.graph.add_all(
+            vDeYeRoot_S, [
                 (vFut_S, "yece~k", diYiCondition),
                 (vFut_S, "yece!ğ", diYiCondition),
                 (vProgYor_S, "yor", diYiCondition),
@@ -2890,8 +2973,8 @@ class TurkishMorphotactics:
             ]
         )
 
-        vDeYeRoot_S.add_all(
-            [
+        self.graph.add_all(
+            vDeYeRoot_S, [
                 (vCausTir_S, "dir", deYeCondition),
                 (vPass_S, "n", deYeCondition),
                 (vPass_S, "nil", deYeCondition),
@@ -2922,10 +3005,10 @@ class TurkishMorphotactics:
         )
 
         # verb `yemek` has an exception case for some imperatives.
-        vImpYemekYi_S.add_all([(vA2pl_ST, "yin"), (vA2pl_ST, "yiniz")])
+        self.graph.add_all(vImpYemekYi_S, [(vA2pl_ST, "yin"), (vA2pl_ST, "yiniz")])
 
-        vImpYemekYe_S.add_all(
-            [
+        self.graph.add_all(
+            vImpYemekYe_S, [
                 (vA2sg_ST, ""),
                 (vA2sg_ST, "sene"),
                 (vA3sg_ST, "sin"),
@@ -2935,9 +3018,9 @@ class TurkishMorphotactics:
         )
 
         # Optative (gel-e, gel-eyim gel-me-ye-yim)
-        verbRoot_S.add(vOpt_S, "+yA")
-        vOpt_S.add_all(
-            [
+        self.graph.add(verbRoot_S, vOpt_S, "+yA")
+        self.graph.add_all(
+            vOpt_S, [
                 (vA1sg_ST, "yIm"),
                 (vA2sg_ST, "sIn"),
                 (vA3sg_ST, ""),
@@ -2950,9 +3033,9 @@ class TurkishMorphotactics:
         )
 
         # Desire (gel-se, gel-se-m gel-me-se-m)
-        verbRoot_S.add(vDesr_S, "sA")
-        vDesr_S.add_all(
-            [
+        self.graph.add(verbRoot_S, vDesr_S, "sA")
+        self.graph.add_all(
+            vDesr_S, [
                 (vA1sg_ST, "m"),
                 (vA2sg_ST, "n"),
                 (vA3sg_ST, ""),
@@ -2964,9 +3047,9 @@ class TurkishMorphotactics:
             ]
         )
 
-        verbRoot_S.add(vNeces_S, "mAlI")
-        vNeces_S.add_all(
-            [
+        self.graph.add(verbRoot_S, vNeces_S, "mAlI")
+        self.graph.add_all(
+            vNeces_S, [
                 (vA1sg_ST, "yIm"),
                 (vA2sg_ST, "sIn"),
                 (vA3sg_ST, ""),
@@ -2989,196 +3072,196 @@ class TurkishMorphotactics:
         previousNotPastNarrCond = PreviousStateIsAny(
             vPastAfterTense_S, vNarrAfterTense_S, vCond_S
         ).not_()
-        vA3pl_ST.add(vPastAfterTense_ST, "dI", previousNotPastNarrCond)
-        vA3pl_ST.add(vNarrAfterTense_ST, "mIş", previousNotPastNarrCond)
-        vA3pl_ST.add(vCond_ST, "sA", previousNotPastNarrCond)
+        self.graph.add(vA3pl_ST, vPastAfterTense_ST, "dI", previousNotPastNarrCond)
+        self.graph.add(vA3pl_ST, vNarrAfterTense_ST, "mIş", previousNotPastNarrCond)
+        self.graph.add(vA3pl_ST, vCond_ST, "sA", previousNotPastNarrCond)
 
         a3plCopWhile = PreviousMorphemeIsAny(prog1, prog2, neces, fut, narr, aor)
-        vA3pl_ST.add(vCop_ST, "dIr", a3plCopWhile)
-        vA3pl_ST.add(vWhile_S, "ken", a3plCopWhile)
+        self.graph.add(vA3pl_ST, vCop_ST, "dIr", a3plCopWhile)
+        self.graph.add(vA3pl_ST, vWhile_S, "ken", a3plCopWhile)
 
         a3sgCopWhile = PreviousMorphemeIsAny(prog1, prog2, neces, fut, narr, aor)
-        vA1sg_ST.add(vCop_ST, "dIr", a3sgCopWhile)
-        vA2sg_ST.add(vCop_ST, "dIr", a3sgCopWhile)
-        vA3sg_ST.add(vCop_ST, ">dIr", a3sgCopWhile)
-        vA1pl_ST.add(vCop_ST, "dIr", a3sgCopWhile)
-        vA2pl_ST.add(vCop_ST, "dIr", a3sgCopWhile)
+        self.graph.add(vA1sg_ST, vCop_ST, "dIr", a3sgCopWhile)
+        self.graph.add(vA2sg_ST, vCop_ST, "dIr", a3sgCopWhile)
+        self.graph.add(vA3sg_ST, vCop_ST, ">dIr", a3sgCopWhile)
+        self.graph.add(vA1pl_ST, vCop_ST, "dIr", a3sgCopWhile)
+        self.graph.add(vA2pl_ST, vCop_ST, "dIr", a3sgCopWhile)
 
-        vCopBeforeA3pl_S.add(vA3pl_ST, "lAr")
+        self.graph.add(vCopBeforeA3pl_S, vA3pl_ST, "lAr")
 
         # Allow Past+A2pl+Cond  Past+A2sg+Cond (geldinse, geldinizse)
 
         previousPast = PreviousMorphemeIs(past).and_not(ContainsMorpheme(cond, desr))
-        vA2pl_ST.add(vCondAfterPerson_ST, "sA", previousPast)
-        vA2sg_ST.add(vCondAfterPerson_ST, "sA", previousPast)
-        vA1sg_ST.add(vCondAfterPerson_ST, "sA", previousPast)
-        vA1pl_ST.add(vCondAfterPerson_ST, "sA", previousPast)
-
-        verbRoot_S.add(vEverSince_S, "+yAgel", cMultiVerb)
-        verbRoot_S.add(vRepeat_S, "+yAdur", cMultiVerb)
-        verbRoot_S.add(vRepeat_S, "+yAgör", cMultiVerb)
-        verbRoot_S.add(vAlmost_S, "+yAyaz", cMultiVerb)
-        verbRoot_S.add(vHastily_S, "+yIver", cMultiVerb)
-        verbRoot_S.add(vStay_S, "+yAkal", cMultiVerb)
-        verbRoot_S.add(vStart_S, "+yAkoy", cMultiVerb)
-
-        vEverSince_S.add_empty(verbRoot_S)
-        vRepeat_S.add_empty(verbRoot_S)
-        vAlmost_S.add_empty(verbRoot_S)
-        vHastily_S.add_empty(verbRoot_S)
-        vStay_S.add_empty(verbRoot_S)
-        vStart_S.add_empty(verbRoot_S)
-
-        vA3sg_ST.add(vAsIf_S, ">cAsInA", PreviousMorphemeIsAny(aor, narr))
-
-        verbRoot_S.add(vWhen_S, "+yIncA")
-        verbRoot_S.add(vSinceDoingSo_S, "+yAlI")
-        verbRoot_S.add(vByDoingSo_S, "+yArAk")
-        verbRoot_S.add(vAdamantly_S, "+yAsIyA")
-        verbRoot_S.add(vAfterDoing_S, "+yIp")
-        verbRoot_S.add(vWithoutBeingAbleToHaveDoneSo_S, "+yAmAdAn")
-        verbRoot_S.add(vAsLongAs_S, ">dIkçA")
-        verbRoot_S.add(vWithoutHavingDoneSo_S, "mAdAn")
-        verbRoot_S.add(vWithoutHavingDoneSo_S, "mAksIzIn")
-
-        vAsIf_S.add_empty(advRoot_ST)
-        vSinceDoingSo_S.add_empty(advRoot_ST)
-        vByDoingSo_S.add_empty(advRoot_ST)
-        vAdamantly_S.add_empty(advRoot_ST)
-        vAfterDoing_S.add_empty(advRoot_ST)
-        vWithoutBeingAbleToHaveDoneSo_S.add_empty(advRoot_ST)
-        vAsLongAs_S.add_empty(advRoot_ST)
-        vWithoutHavingDoneSo_S.add_empty(advRoot_ST)
-        vWhile_S.add_empty(advRoot_ST)
-        vWhen_S.add_empty(advNounRoot_ST)
+        self.graph.add(vA2pl_ST, vCondAfterPerson_ST, "sA", previousPast)
+        self.graph.add(vA2sg_ST, vCondAfterPerson_ST, "sA", previousPast)
+        self.graph.add(vA1sg_ST, vCondAfterPerson_ST, "sA", previousPast)
+        self.graph.add(vA1pl_ST, vCondAfterPerson_ST, "sA", previousPast)
+
+        self.graph.add(verbRoot_S, vEverSince_S, "+yAgel", cMultiVerb)
+        self.graph.add(verbRoot_S, vRepeat_S, "+yAdur", cMultiVerb)
+        self.graph.add(verbRoot_S, vRepeat_S, "+yAgör", cMultiVerb)
+        self.graph.add(verbRoot_S, vAlmost_S, "+yAyaz", cMultiVerb)
+        self.graph.add(verbRoot_S, vHastily_S, "+yIver", cMultiVerb)
+        self.graph.add(verbRoot_S, vStay_S, "+yAkal", cMultiVerb)
+        self.graph.add(verbRoot_S, vStart_S, "+yAkoy", cMultiVerb)
+
+        self.graph.add_empty(vEverSince_S, verbRoot_S)
+        self.graph.add_empty(vRepeat_S, verbRoot_S)
+        self.graph.add_empty(vAlmost_S, verbRoot_S)
+        self.graph.add_empty(vHastily_S, verbRoot_S)
+        self.graph.add_empty(vStay_S, verbRoot_S)
+        self.graph.add_empty(vStart_S, verbRoot_S)
+
+        self.graph.add(vA3sg_ST, vAsIf_S, ">cAsInA", PreviousMorphemeIsAny(aor, narr))
+
+        self.graph.add(verbRoot_S, vWhen_S, "+yIncA")
+        self.graph.add(verbRoot_S, vSinceDoingSo_S, "+yAlI")
+        self.graph.add(verbRoot_S, vByDoingSo_S, "+yArAk")
+        self.graph.add(verbRoot_S, vAdamantly_S, "+yAsIyA")
+        self.graph.add(verbRoot_S, vAfterDoing_S, "+yIp")
+        self.graph.add(verbRoot_S, vWithoutBeingAbleToHaveDoneSo_S, "+yAmAdAn")
+        self.graph.add(verbRoot_S, vAsLongAs_S, ">dIkçA")
+        self.graph.add(verbRoot_S, vWithoutHavingDoneSo_S, "mAdAn")
+        self.graph.add(verbRoot_S, vWithoutHavingDoneSo_S, "mAksIzIn")
+
+        self.graph.add_empty(vAsIf_S, advRoot_ST)
+        self.graph.add_empty(vSinceDoingSo_S, advRoot_ST)
+        self.graph.add_empty(vByDoingSo_S, advRoot_ST)
+        self.graph.add_empty(vAdamantly_S, advRoot_ST)
+        self.graph.add_empty(vAfterDoing_S, advRoot_ST)
+        self.graph.add_empty(vWithoutBeingAbleToHaveDoneSo_S, advRoot_ST)
+        self.graph.add_empty(vAsLongAs_S, advRoot_ST)
+        self.graph.add_empty(vWithoutHavingDoneSo_S, advRoot_ST)
+        self.graph.add_empty(vWhile_S, advRoot_ST)
+        self.graph.add_empty(vWhen_S, advNounRoot_ST)
 
     def connect_question(self):
         # mı
-        questionRoot_S.add_empty(qPresent_S)
+        self.graph.add_empty(questionRoot_S, qPresent_S)
         # mıydı
-        questionRoot_S.add(qPast_S, "ydI")
+        self.graph.add(questionRoot_S, qPast_S, "ydI")
         # mıymış
-        questionRoot_S.add(qNarr_S, "ymIş")
+        self.graph.add(questionRoot_S, qNarr_S, "ymIş")
 
         # mıyım
-        qPresent_S.add(qA1sg_ST, "yIm")
+        self.graph.add(qPresent_S, qA1sg_ST, "yIm")
         # mısın
-        qPresent_S.add(qA2sg_ST, "sIn")
+        self.graph.add(qPresent_S, qA2sg_ST, "sIn")
         # mı
-        qPresent_S.add_empty(qA3sg_ST)
+        self.graph.add_empty(qPresent_S, qA3sg_ST)
 
         # mıydım
-        qPast_S.add(qA1sg_ST, "m")
+        self.graph.add(qPast_S, qA1sg_ST, "m")
         # mıymışım
-        qNarr_S.add(qA1sg_ST, "Im")
+        self.graph.add(qNarr_S, qA1sg_ST, "Im")
 
         # mıydın
-        qPast_S.add(qA2sg_ST, "n")
+        self.graph.add(qPast_S, qA2sg_ST, "n")
         # mıymışsın
-        qNarr_S.add(qA2sg_ST, "sIn")
+        self.graph.add(qNarr_S, qA2sg_ST, "sIn")
 
         # mıydık
-        qPast_S.add(qA1pl_ST, "k")
+        self.graph.add(qPast_S, qA1pl_ST, "k")
         # mıymışız
-        qNarr_S.add(qA1pl_ST, "Iz")
+        self.graph.add(qNarr_S, qA1pl_ST, "Iz")
         # mıyız
-        qPresent_S.add(qA1pl_ST, "+yIz")
+        self.graph.add(qPresent_S, qA1pl_ST, "+yIz")
 
         # mıydınız
-        qPast_S.add(qA2pl_ST, "InIz")
+        self.graph.add(qPast_S, qA2pl_ST, "InIz")
         # mıymışsınız
-        qNarr_S.add(qA2pl_ST, "sInIz")
+        self.graph.add(qNarr_S, qA2pl_ST, "sInIz")
         # mısınız
-        qPresent_S.add(qA2pl_ST, "sInIz")
+        self.graph.add(qPresent_S, qA2pl_ST, "sInIz")
 
         # mıydılar
-        qPast_S.add(qA3pl_ST, "lAr")
+        self.graph.add(qPast_S, qA3pl_ST, "lAr")
         # mıymışlar
-        qNarr_S.add(qA3pl_ST, "lAr")
+        self.graph.add(qNarr_S, qA3pl_ST, "lAr")
 
         # mıydı
-        qPast_S.add_empty(qA3sg_ST)
+        self.graph.add_empty(qPast_S, qA3sg_ST)
         # mıymış
-        qNarr_S.add_empty(qA3sg_ST)
+        self.graph.add_empty(qNarr_S, qA3sg_ST)
 
         # for not allowing "mı-ydı-m-dır"
 
         rejectNoCopula = CurrentGroupContainsAny(qPast_S).not_()
 
         # mıyımdır
-        qA1sg_ST.add(qCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(qA1sg_ST, qCop_ST, "dIr", rejectNoCopula)
         # mısındır
-        qA2sg_ST.add(qCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(qA2sg_ST, qCop_ST, "dIr", rejectNoCopula)
         # mıdır
-        qA3sg_ST.add(qCop_ST, ">dIr", rejectNoCopula)
+        self.graph.add(qA3sg_ST, qCop_ST, ">dIr", rejectNoCopula)
         # mıyızdır
-        qA1pl_ST.add(qCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(qA1pl_ST, qCop_ST, "dIr", rejectNoCopula)
         # mısınızdır
-        qA2pl_ST.add(qCop_ST, "dIr", rejectNoCopula)
+        self.graph.add(qA2pl_ST, qCop_ST, "dIr", rejectNoCopula)
 
         # Copula can come before A3pl.
-        qPresent_S.add(pvCopBeforeA3pl_S, "dIr")
-        qCopBeforeA3pl_S.add(qA3pl_ST, "lAr")
+        self.graph.add(qPresent_S, pvCopBeforeA3pl_S, "dIr")
+        self.graph.add(qCopBeforeA3pl_S, qA3pl_ST, "lAr")
 
     def connect_imek(self):
         # idi
-        imekRoot_S.add(imekPast_S, "di")
+        self.graph.add(imekRoot_S, imekPast_S, "di")
         # imiş
-        imekRoot_S.add(imekNarr_S, "miş")
+        self.graph.add(imekRoot_S, imekNarr_S, "miş")
         # ise
-        imekRoot_S.add(imekCond_S, "se")
+        self.graph.add(imekRoot_S, imekCond_S, "se")
 
         # idim, idin, idi, idik, idiniz, idiler
-        imekPast_S.add(imekA1sg_ST, "m")
-        imekPast_S.add(imekA2sg_ST, "n")
-        imekPast_S.add_empty(imekA3sg_ST)
-        imekPast_S.add(imekA1pl_ST, "k")
-        imekPast_S.add(imekA2pl_ST, "niz")
-        imekPast_S.add(imekA3pl_ST, "ler")
+        self.graph.add(imekPast_S, imekA1sg_ST, "m")
+        self.graph.add(imekPast_S, imekA2sg_ST, "n")
+        self.graph.add_empty(imekPast_S, imekA3sg_ST)
+        self.graph.add(imekPast_S, imekA1pl_ST, "k")
+        self.graph.add(imekPast_S, imekA2pl_ST, "niz")
+        self.graph.add(imekPast_S, imekA3pl_ST, "ler")
 
         # imişim, imişsin, imiş, imişiz, imişsiniz, imişler
-        imekNarr_S.add(imekA1sg_ST, "im")
-        imekNarr_S.add(imekA2sg_ST, "sin")
-        imekNarr_S.add_empty(imekA3sg_ST)
-        imekNarr_S.add(imekA1pl_ST, "iz")
-        imekNarr_S.add(imekA2pl_ST, "siniz")
-        imekNarr_S.add(imekA3pl_ST, "ler")
-
-        imekPast_S.add(imekCond_S, "yse")
-        imekNarr_S.add(imekCond_S, "se")
-
-        imekCond_S.add(imekA1sg_ST, "m")
-        imekCond_S.add(imekA2sg_ST, "n")
-        imekCond_S.add_empty(imekA3sg_ST)
-        imekCond_S.add(imekA1pl_ST, "k")
-        imekCond_S.add(imekA2pl_ST, "niz")
-        imekCond_S.add(imekA3pl_ST, "ler")
+        self.graph.add(imekNarr_S, imekA1sg_ST, "im")
+        self.graph.add(imekNarr_S, imekA2sg_ST, "sin")
+        self.graph.add_empty(imekNarr_S, imekA3sg_ST)
+        self.graph.add(imekNarr_S, imekA1pl_ST, "iz")
+        self.graph.add(imekNarr_S, imekA2pl_ST, "siniz")
+        self.graph.add(imekNarr_S, imekA3pl_ST, "ler")
+
+        self.graph.add(imekPast_S, imekCond_S, "yse")
+        self.graph.add(imekNarr_S, imekCond_S, "se")
+
+        self.graph.add(imekCond_S, imekA1sg_ST, "m")
+        self.graph.add(imekCond_S, imekA2sg_ST, "n")
+        self.graph.add_empty(imekCond_S, imekA3sg_ST)
+        self.graph.add(imekCond_S, imekA1pl_ST, "k")
+        self.graph.add(imekCond_S, imekA2pl_ST, "niz")
+        self.graph.add(imekCond_S, imekA3pl_ST, "ler")
 
         # for not allowing "i-di-m-dir"
 
         rejectNoCopula = CurrentGroupContainsAny(imekPast_S).not_()
 
         # imişimdir, imişsindir etc.
-        imekA1sg_ST.add(imekCop_ST, "dir", rejectNoCopula)
-        imekA2sg_ST.add(imekCop_ST, "dir", rejectNoCopula)
-        imekA3sg_ST.add(imekCop_ST, "tir", rejectNoCopula)
-        imekA1pl_ST.add(imekCop_ST, "dir", rejectNoCopula)
-        imekA2pl_ST.add(imekCop_ST, "dir", rejectNoCopula)
-        imekA3pl_ST.add(imekCop_ST, "dir", rejectNoCopula)
+        self.graph.add(imekA1sg_ST, imekCop_ST, "dir", rejectNoCopula)
+        self.graph.add(imekA2sg_ST, imekCop_ST, "dir", rejectNoCopula)
+        self.graph.add(imekA3sg_ST, imekCop_ST, "tir", rejectNoCopula)
+        self.graph.add(imekA1pl_ST, imekCop_ST, "dir", rejectNoCopula)
+        self.graph.add(imekA2pl_ST, imekCop_ST, "dir", rejectNoCopula)
+        self.graph.add(imekA3pl_ST, imekCop_ST, "dir", rejectNoCopula)
 
     def handle_post_processing_connections(self):
         # Passive has an exception for some verbs like `kavurmak` or `savurmak`.
         # add passive state connection to modified root `kavr` etc.
-        verbLastVowelDropModRoot_S.add(vPass_S, "Il")
+        self.graph.add(verbLastVowelDropModRoot_S, vPass_S, "Il")
         # for not allowing `kavur-ul` add all verb connections to
         # unmodified `kavur` root and remove only the passive.
-        verbLastVowelDropUnmodRoot_S.copy_outgoing_transitions_from(verbRoot_S)
-        verbLastVowelDropUnmodRoot_S.remove_transitions_to(pass_)
+        self.graph.copy_outgoing_transitions_from(verbLastVowelDropUnmodRoot_S, verbRoot_S)
+        self.graph.remove_transitions_to(verbLastVowelDropUnmodRoot_S, pass_)
 
     def get_root_state(self, dict_item, attrs=None):
         root = self.item_root_states.get(dict_item.id_)
         attrs = (
-            attrs.copy()
+            attrs
             if attrs is not None
             else calculate_phonetic_attributes(dict_item.pronunciation)
         )
@@ -3186,7 +3269,7 @@ class TurkishMorphotactics:
             return root
         # Verbs like "aramak" drops their last vowel when  connected to "Iyor" Progressive suffix.
         # those modified roots are connected to a separate root state called verbRoot_VowelDrop_S.
-        if PhoneticAttribute.LastLetterDropped in attrs:
+        if attrs & PhoneticAttribute.LastLetterDropped:
             return verbRoot_VowelDrop_S
         if dict_item.has_attribute(RootAttribute.Reciprocal):
             return vImplicitRecipRoot_S
@@ -3196,6 +3279,11 @@ class TurkishMorphotactics:
             if dict_item.secondary_pos == SecondaryPos.ProperNoun:
                 return nounProper_S
             elif dict_item.secondary_pos == SecondaryPos.Abbreviation:
+                # abbreviations with a guessed pronunciation that reads them as a word ("Gib", "Bur") would
+                # match stems of common words with suffixes ("gib-i", "bur-da"), they are only accepted alone.
+                if dict_item.has_attribute(RootAttribute.PronunciationGuessed) and \
+                        dict_item.pronunciation == dict_item.root:
+                    return nounNoSuffix_S
                 return nounAbbrv_S
             elif dict_item.secondary_pos in [
                 SecondaryPos.Email,
@@ -3284,7 +3372,7 @@ class StemTransition(MorphemeTransition):
         self,
         dict_item: DictionaryItem,
         to_: MorphemeState,
-        attrs: Set = None,
+        attrs: int = None,
         surface: str = None,
     ):
         super().__init__(root_S, to_, None)
@@ -3299,7 +3387,7 @@ class StemTransition(MorphemeTransition):
         self.attrs = (
             calculate_phonetic_attributes(dict_item.pronunciation)
             if attrs is None
-            else attrs.copy()
+            else int(attrs)
         )
 
     def __str__(self):
@@ -3316,7 +3404,7 @@ class StemTransition(MorphemeTransition):
         )
 
     def __hash__(self):
-        return hash((self.surface, self.dict_item, frozenset(self.attrs)))
+        return hash((self.surface, self.dict_item, self.attrs))
 
 
 class SuffixTransition(MorphemeTransition):
@@ -3332,6 +3420,8 @@ class SuffixTransition(MorphemeTransition):
         self.condition = condition
         self.parse_conditions_from_template()
         self.token_list = list(SuffixTemplateTokenizer(self.surface_template))
+        # predicate compiled from condition, set when graph is frozen.
+        self.predicate = None
 
     def __str__(self):
         template_str = f":{self.surface_template}" if self.surface_template else ""
@@ -3351,11 +3441,26 @@ class SuffixTransition(MorphemeTransition):
         return hash((self.from_.id_, self.to_.id_, self.surface_template))
 
     def can_pass(self, path):
-        return self.condition is None or self.condition.accept(path)
-
-    def connect(self):
-        self.from_.add_outgoing([self])
-        self.to_.add_incoming([self])
+        if self.condition is None:
+            return True
+        if self.predicate is not None:
+            return self.predicate(path)
+        return self.condition.accept(path)
+
+    def compile(self):
+        self.predicate = compile_condition(self.condition)
+
+    def __getstate__(self):
+        # compiled predicates are closures and can not be pickled, they are compiled again when loaded.
+        state = self.__dict__.copy()
+        state['predicate'] = self.predicate is not None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.predicate = None
+        if state['predicate']:
+            self.compile()
 
     # adds vowel-consonant expectation related automatically.
     # TODO: consider moving this to morphotactics somehow.
@@ -3430,7 +3535,7 @@ class SurfaceTransition:
 
 
 def generate_surface(
-    transition: SurfaceTransition, phonetic_attributes: Set[PhoneticAttribute]
+    transition: SurfaceTransition, phonetic_attributes: int
 ) -> str:
     index = 0
     result = []
@@ -3438,36 +3543,36 @@ def generate_surface(
         if token.type_ == "LETTER":
             result.append(token.letter)
         elif token.type_ == "A_VOWEL":
-            if index == 0 and PhoneticAttribute.LastLetterVowel in phonetic_attributes:
+            if index == 0 and phonetic_attributes & PhoneticAttribute.LastLetterVowel:
                 continue
-            if PhoneticAttribute.LastVowelBack in phonetic_attributes:
+            if phonetic_attributes & PhoneticAttribute.LastVowelBack:
                 result.append("a")
-            elif PhoneticAttribute.LastVowelFrontal in phonetic_attributes:
+            elif phonetic_attributes & PhoneticAttribute.LastVowelFrontal:
                 result.append("e")
             else:
                 raise ValueError(f"Cannot generate A form from {phonetic_attributes}")
         elif token.type_ == "I_VOWEL":
 
-            if index == 0 and PhoneticAttribute.LastLetterVowel in phonetic_attributes:
+            if index == 0 and phonetic_attributes & PhoneticAttribute.LastLetterVowel:
                 continue
-            elif PhoneticAttribute.LastVowelFrontal in phonetic_attributes:
-                if PhoneticAttribute.LastVowelUnrounded in phonetic_attributes:
+            elif phonetic_attributes & PhoneticAttribute.LastVowelFrontal:
+                if phonetic_attributes & PhoneticAttribute.LastVowelUnrounded:
                     result.append("i")
                 else:
                     result.append("ü")
-            elif PhoneticAttribute.LastVowelBack in phonetic_attributes:
-                if PhoneticAttribute.LastVowelUnrounded in phonetic_attributes:
+            elif phonetic_attributes & PhoneticAttribute.LastVowelBack:
+                if phonetic_attributes & PhoneticAttribute.LastVowelUnrounded:
                     result.append("ı")
                 else:
                     result.append("u")
             else:
                 raise ValueError(f"Cannot generate I form from {phonetic_attributes}")
         elif token.type_ == "APPEND":
-            if PhoneticAttribute.LastLetterVowel in phonetic_attributes:
+            if phonetic_attributes & PhoneticAttribute.LastLetterVowel:
                 result.append(token.letter)
         elif token.type_ == "DEVOICE_FIRST":
             ld = token.letter
-            if PhoneticAttribute.LastLetterVoiceless in phonetic_attributes:
+            if phonetic_attributes & PhoneticAttribute.LastLetterVoiceless:
                 ld = tr.devoice(ld)
             result.append(ld)
         elif token.type_ in ["LAST_VOICED", "LAST_NOT_VOICED"]:
@@ -3532,38 +3637,94 @@ class SuffixTemplateTokenizer:
             return SuffixTemplateToken("LETTER", c)
 
 
+class PathSummary(NamedTuple):
+    """
+    History of a search path as needed by conditions: the last derivational state, bitsets of states and
+    morphemes in the current and previous inflectional groups, bitset of all morphemes of the path,
+    and whether a suffix with surface was seen after the last derivation or root.
+    """
+    last_derivation: Optional[MorphemeState]
+    current_group_states: int
+    current_group_morphemes: int
+    previous_group_states: int
+    previous_group_morphemes: int
+    morphemes: int
+    surface_after_derivation: bool
+
+    @classmethod
+    def extend(cls, summary: Optional["PathSummary"], transition: SurfaceTransition) -> "PathSummary":
+        state = transition.state
+        if summary is None:
+            summary = _EMPTY_SUMMARY
+        morphemes = summary.morphemes | state.morpheme_bit
+        # a derivation starts a new inflectional group.
+        if state.derivative:
+            return cls(state, state.bit, state.morpheme_bit, summary.current_group_states,
+                       summary.current_group_morphemes, morphemes, False)
+        surface_after_derivation = not state.pos_root and (
+                summary.surface_after_derivation or len(transition.surface) > 0)
+        return cls(summary.last_derivation,
+                   summary.current_group_states | state.bit,
+                   summary.current_group_morphemes | state.morpheme_bit,
+                   summary.previous_group_states,
+                   summary.previous_group_morphemes,
+                   morphemes,
+                   surface_after_derivation)
+
+
+_EMPTY_SUMMARY = PathSummary(None, 0, 0, 0, 0, 0, False)
+
+
 class SearchPath:
     """
     This class represents a path in morphotactics graph. During analysis many SearchPaths are created
     and surviving paths are used for generating analysis results.
-    :param tail: letters left to parse
+
+    Paths are persistent: a path keeps its last transition and a link to the path it was extended from,
+    so extending a path does not copy its history. The `transitions` list is built on first access.
+    Phonetic attributes are shared with the paths created from this one and must not be modified.
+    History conditions use the `summary` of a path instead of scanning its transitions.
+    All paths of an analysis refer to the same input word, letters left to parse start at `pos`.
+    :param word: input word
+    :param pos: position of the first letter left to parse
+    :param parent: path this path was extended from, None for the initial path.
     """
 
     def __init__(
         self,
-        tail: str,
-        current_state: MorphemeState,
-        transitions: List[SurfaceTransition],
-        phonetic_attributes: Set[PhoneticAttribute],
+        word: str,
+        pos: int,
+        last_transition: SurfaceTransition,
+        phonetic_attributes: int,
         terminal: bool,
+        parent: "SearchPath" = None,
     ):
-        self.tail = tail
-        self.current_state = current_state
-        self.transitions = transitions
+        self.word = word
+        self.pos = pos
+        self.last_transition = last_transition
+        self.current_state = last_transition.state
         self.phonetic_attributes = phonetic_attributes
         self.terminal = terminal
+        self.parent = parent
+        if parent is None:
+            self.stem_transition = last_transition.lexical_transition
+            self.depth = 1
+        else:
+            self.stem_transition = parent.stem_transition
+            self.depth = parent.depth + 1
         self.contains_derivation = False
         self.contains_suffix_with_surface = False
+        self._transitions = None
+        self._summary = None
 
     @classmethod
-    def initial(cls, stem_transition: StemTransition, tail: str):
-        morphemes = []
+    def initial(cls, stem_transition: StemTransition, word: str, pos: int = 0):
+        """ Creates the path for `stem_transition`, with letters of `word` after `pos` left to parse. """
         root = SurfaceTransition(stem_transition.surface, stem_transition)
-        morphemes.append(root)
         return cls(
-            tail,
-            stem_transition.to_,
-            morphemes,
+            word,
+            pos,
+            root,
             stem_transition.attrs,
             stem_transition.to_.terminal,
         )
@@ -3576,7 +3737,7 @@ class SearchPath:
     def __repr__(self):
         return f"SearchPath({self.dict_item.id_}) (-{self.tail})({self.transitions})"
 
-    def copy(self, surface_node: SurfaceTransition, phonetic_attributes: Set = None):
+    def copy(self, surface_node: SurfaceTransition, phonetic_attributes: int = None):
         phonetic_attributes = (
             calculate_phonetic_attributes(
                 surface_node.surface, self.phonetic_attributes
@@ -3585,11 +3746,8 @@ class SearchPath:
             else phonetic_attributes
         )
         is_terminal = surface_node.state.terminal
-        hist = self.transitions[:]
-        hist.append(surface_node)
-        new_tail = self.tail[len(surface_node.surface):]
         path = SearchPath(
-            new_tail, surface_node.state, hist, phonetic_attributes.copy(), is_terminal
+            self.word, self.pos + len(surface_node.surface), surface_node, phonetic_attributes, is_terminal, self
         )
         path.contains_suffix_with_surface = (
             self.contains_suffix_with_surface or len(surface_node.surface) > 0
@@ -3600,14 +3758,42 @@ class SearchPath:
         return path
 
     @property
-    def stem_transition(self):
-        return self.transitions[0].lexical_transition
+    def tail(self):
+        return self.word[self.pos:]
+
+    @property
+    def has_tail(self):
+        return self.pos < len(self.word)
+
+    @property
+    def transitions(self) -> List[SurfaceTransition]:
+        """ Surface transitions from the stem to the current state. Returned list must not be modified. """
+        if self._transitions is None:
+            transitions = [None] * self.depth
+            path = self
+            for i in range(self.depth - 1, -1, -1):
+                transitions[i] = path.last_transition
+                path = path.parent
+            self._transitions = transitions
+        return self._transitions
+
+    @property
+    def summary(self) -> "PathSummary":
+        """
+        Summary of the path history, derived from the summary of the parent and the last transition.
+        It is calculated on first access, most paths are rejected before a history condition is checked.
+        """
+        if self._summary is None:
+            self._summary = PathSummary.extend(
+                None if self.parent is None else self.parent.summary, self.last_transition
+            )
+        return self._summary
 
     @property
     def previous_state(self):
-        if len(self.transitions) < 2:
+        if self.parent is None:
             return None
-        return self.transitions[-2].state
+        return self.parent.current_state
 
     @property
     def is_terminal(self):
@@ -3616,10 +3802,6 @@ class SearchPath:
     def has_dictionary_item(self, dict_item):
         return self.stem_transition.item == dict_item
 
-    @property
-    def last_transition(self):
-        return self.transitions[-1]
-
     @property
     def dict_item(self):
         return self.stem_transition.dict_item
@@ -0,0 +1,113 @@
+"""
+Parallel analysis of large texts.
+
+Lemmatization is CPU bound, a single interpreter uses one core. `ParallelMorphAnalyzer` splits text into
+chunks of sentences and analyzes them in a pool of worker processes, each holding its own analyzer.
+"""
+import multiprocessing
+from typing import List, Tuple
+
+from trLemmer.morphology import MorphAnalyzer, _deadline, make_tokenizer
+
+# analyzer of a worker process, set by `_init_worker`.
+_analyzer = None
+
+
+def _init_worker(analyzer, snapshot, analyzer_kwargs):
+    global _analyzer
+    if analyzer is None:
+        if snapshot is not None:
+            analyzer = MorphAnalyzer.from_snapshot(snapshot, **analyzer_kwargs)
+        else:
+            analyzer = MorphAnalyzer(**analyzer_kwargs)
+    _analyzer = analyzer
+
+
+def _lemmatize_sentences(args):
+    sentence_tokens, offsets, deadline = args
+    return [_analyzer._lemmatized(sentence, tokens, offsets, deadline) for sentence, tokens in sentence_tokens]
+
+
+def _analyze_sentences(args):
+    sentence_tokens, offsets, deadline = args
+    return [_analyzer._analyzed(sentence, tokens, offsets, deadline) for sentence, tokens in sentence_tokens]
+
+
+class ParallelMorphAnalyzer:
+    """
+    Runs `lemmatize_text` and `analyze_text` of a `MorphAnalyzer` in a process pool.
+
+        >>> from trLemmer.parallel import ParallelMorphAnalyzer
+        >>> with ParallelMorphAnalyzer(workers=4) as lemmer:
+        ...     lemmas = lemmer.lemmatize_text(text)
+
+    With the `fork` start method (default where available) workers inherit `analyzer`, or an analyzer
+    built in this process, without copying it. With other start methods every worker builds its own
+    analyzer, from `snapshot` if it is given, `analyzer_kwargs` are passed to the `MorphAnalyzer`
+    constructor or `from_snapshot`.
+
+    The pool is started on first use and reused by later calls, `close()` stops it.
+    :param workers: number of worker processes, number of CPUs by default.
+    :param chunk_size: number of sentences sent to a worker at a time.
+    """
+
+    def __init__(self, analyzer=None, workers=None, chunk_size=32, snapshot=None, start_method=None,
+                 **analyzer_kwargs):
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        self.context = multiprocessing.get_context(start_method)
+        if self.context.get_start_method() == 'fork':
+            if analyzer is None:
+                analyzer = (MorphAnalyzer.from_snapshot(snapshot, **analyzer_kwargs) if snapshot is not None
+                            else MorphAnalyzer(**analyzer_kwargs))
+            self._initargs = (analyzer, None, {})
+        elif analyzer is not None:
+            raise ValueError("Analyzer objects can only be shared with the 'fork' start method, "
+                             "use snapshot or analyzer arguments instead")
+        else:
+            self._initargs = (None, snapshot, analyzer_kwargs)
+        self.analyzer = analyzer
+        # sentences are split in this process, with the tokenizer workers use.
+        self.tokenizer = (analyzer.tokenizer if analyzer is not None
+                          else make_tokenizer(analyzer_kwargs.get('tokenizer', 'native')))
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = self.context.Pool(self.workers, initializer=_init_worker, initargs=self._initargs)
+        return self._pool
+
+    def _map_sentences(self, function, text, offsets, timeout):
+        # monotonic clock is system wide, workers compare the deadline of this process with their own clock.
+        deadline = _deadline(timeout)
+        sentences = self.tokenizer.sentence_tokens(text)
+        chunks = [(sentences[i:i + self.chunk_size], offsets, deadline)
+                  for i in range(0, len(sentences), self.chunk_size)]
+        result = []
+        for chunk_result in self.pool.imap(function, chunks):
+            result.extend(chunk_result)
+        return result
+
+    def lemmatize_text(self, text: str, offsets=False, timeout: float = None) -> List[Tuple[str, List]]:
+        """ Same as `MorphAnalyzer.lemmatize_text`, sentences are lemmatized by worker processes. """
+        return self._map_sentences(_lemmatize_sentences, text, offsets, timeout)
+
+    def analyze_text(self, text: str, offsets=False, timeout: float = None):
+        """ Same as `MorphAnalyzer.analyze_text`, sentences are analyzed by worker processes. """
+        return self._map_sentences(_analyze_sentences, text, offsets, timeout)
+
+    def close(self):
+        """ Stops the worker processes. """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
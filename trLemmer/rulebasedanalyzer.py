@@ -1,5 +1,6 @@
 import collections
-from typing import Optional
+import time
+from typing import List, NamedTuple, Optional
 
 from trLemmer.attributes import PhoneticAttribute, calculate_phonetic_attributes, RootAttribute
 from trLemmer.lexicon import DictionaryItem
@@ -9,52 +10,145 @@ import logging
 logging.basicConfig(level=logging.ERROR)
 
 
+class SearchLimits(NamedTuple):
+    """
+    Bounds of the graph search of a single word.
+    :param max_repeating_suffix: when more than `prune_threshold` paths are alive, paths with the same
+    suffix more than `max_repeating_suffix` times in a row ("ettir-t-tir-t") are dropped.
+    :param prune_threshold: number of live paths that triggers pruning of cyclic paths.
+    :param max_paths: maximum number of live paths, further paths are dropped.
+    :param max_expansions: maximum number of paths visited for a word, search stops after that.
+    """
+    max_repeating_suffix: int = 3
+    prune_threshold: int = 30
+    max_paths: int = 1000
+    max_expansions: int = 10000
+
+
+DEFAULT_LIMITS = SearchLimits()
+
+
+class SearchResult(NamedTuple):
+    """
+    Successful paths of a search, `truncated` is True if search limits dropped any paths or the deadline
+    stopped the search.
+    """
+    paths: List[SearchPath]
+    truncated: bool
+
+
+class AnalysisResult(NamedTuple):
+    """ Analyses of a word, `truncated` is True if search limits were hit and analyses may be missing. """
+    analyses: tuple
+    truncated: bool
+
+
+class LemmaResult(NamedTuple):
+    """ Lemmas of a word in the order they were found, `truncated` is the same as in `AnalysisResult`. """
+    lemmas: tuple
+    truncated: bool
+
+
 class RuleBasedAnalyzer:
     """
     This is a Morphological Analyzer implementation. Instances of this class are not thread safe if
     instantiated with forDebug() factory constructor method.
+
+    Search of a word is bounded by `limits`, so malformed or adversarial input can not cause unbounded
+    work. Search also stops at a `deadline` (a `time.monotonic()` value), which is checked before every
+    expansion round. Results of searches that hit the limits or the deadline are marked as truncated.
     """
 
-    def __init__(self, morphotactics):
+    def __init__(self, morphotactics, limits: SearchLimits = None):
         self.morphotactics = morphotactics
         self.stem_transitions = morphotactics.stem_transitions
+        self.graph = morphotactics.graph
+        self.limits = limits if limits is not None else DEFAULT_LIMITS
 
     def analyze(self, word):
+        return list(self.analyze_result(word).analyses)
 
+    def initial_paths(self, word) -> List[SearchPath]:
         # get stem candidates.
         candidates = self.stem_transitions.prefix_matches(word)
 
         # generate initial search paths.
         paths = []
         for candidate in candidates:
-            length = len(candidate.surface)
-            tail = word[length:]
-            paths.append(SearchPath.initial(candidate, tail))
+            paths.append(SearchPath.initial(candidate, word, len(candidate.surface)))
+        return paths
+
+    def analyze_result(self, word, deadline: float = None) -> AnalysisResult:
+        """ Analyses of `word` and whether search limits or the `deadline` were hit. """
         # search graph.
-        result_paths = self.search(paths)
+        result_paths, truncated = self.search(self.initial_paths(word), deadline)
 
         # generate results from successful paths.
         result = []
         for path in result_paths:
             analysis = parse_analysis(path)
             result.append(analysis)
-        return result
+        return AnalysisResult(tuple(result), truncated)
 
-    def search(self, current_paths):
-        # searches through morphotactics graph.
-        if len(current_paths) > 30:
-            current_paths = self.prune_cyclic_paths(current_paths)
+    def lemmas_result(self, word, deadline: float = None) -> LemmaResult:
+        """
+        Lemmas of `word`, same as lemmas of `analyze_result`. Search stops following paths of a lemma
+        once a path of it is accepted, and no analyses are built.
+        """
+        result_paths, truncated = self.search(self.initial_paths(word), deadline, lemmas_only=True)
+        return LemmaResult(tuple(path.dict_item.lemma for path in result_paths), truncated)
+
+    def first_path(self, word) -> SearchResult:
+        """
+        Depth first search for a path that parses `word`, longest stems are tried first. Returns at most
+        one path, `truncated` is True if `limits.max_expansions` paths were visited before one was found.
+        """
+        # prefix matches are ordered by length, longest stems are popped first.
+        stack = self.initial_paths(word)
+        expansions = 0
+        while stack:
+            if expansions >= self.limits.max_expansions:
+                return SearchResult([], True)
+            expansions += 1
+            path = stack.pop()
+            if not path.has_tail:
+                if path.is_terminal and not path.phonetic_attributes & PhoneticAttribute.CannotTerminate:
+                    return SearchResult([path], False)
+            new_paths = self.advance(path)
+            new_paths.reverse()
+            stack.extend(new_paths)
+        return SearchResult([], False)
+
+    def search(self, current_paths, deadline: float = None, lemmas_only=False) -> SearchResult:
+        """
+        Searches through morphotactics graph and returns paths that parse the whole word. With `lemmas_only`
+        only the first accepted path of each lemma is returned, other paths of the lemma are dropped.
+        """
+        expansions = 0
+        truncated = False
         result = []
+        # lemmas of accepted paths in `lemmas_only` search.
+        found = set() if lemmas_only else None
         # new Paths are generated with matching transitions.
         while len(current_paths) > 0:
+            if deadline is not None and time.monotonic() > deadline:
+                truncated = True
+                break
+            current_paths, dropped = self.bound_paths(current_paths, expansions)
+            truncated |= dropped
+            expansions += len(current_paths)
             all_new_paths = []
             for path in current_paths:
+                if found is not None and path.dict_item.lemma in found:
+                    continue
                 # if there are no more letters to consume and path can be terminated, we accept this
                 # path as a correct result.
-                if len(path.tail) == 0:
-                    if path.is_terminal and PhoneticAttribute.CannotTerminate not in path.phonetic_attributes:
+                if not path.has_tail:
+                    if path.is_terminal and not path.phonetic_attributes & PhoneticAttribute.CannotTerminate:
                         logging.warning(f"APPENDING RESULT: {path}")
                         result.append(path)
+                        if found is not None:
+                            found.add(path.dict_item.lemma)
                         continue
                 # Creates new paths with outgoing and matching transitions.
                 new_paths = self.advance(path)
@@ -64,7 +158,7 @@ class RuleBasedAnalyzer:
                 logging.debug('')
                 all_new_paths.extend(new_paths)
             current_paths = all_new_paths
-        return result
+        return SearchResult(result, truncated)
 
     def advance(self, path: SearchPath):
         """
@@ -76,10 +170,9 @@ class RuleBasedAnalyzer:
         """
         new_paths = []
         # for all outgoing transitions.
-        # print(f"\n\n ADVANCE {path} for {len(path.current_state.outgoing)} transitions")
-        for transition in path.current_state.outgoing:
+        for transition in self.graph.transitions_from(path.current_state):
             # if tail is empty and this transitions surface is not empty, no need to check.
-            if len(path.tail) == 0 and transition.has_surface_form:
+            if not path.has_tail and transition.has_surface_form:
                 logging.debug(f"Rejecting path {path}: Path and transition surface mismatch: ")
                 continue
 
@@ -88,7 +181,7 @@ class RuleBasedAnalyzer:
                 path.phonetic_attributes)
 
             # no need to go further if generated surface form is not a prefix of the paths's tail.
-            tail_starts_with = path.tail.startswith(surface)
+            tail_starts_with = path.word.startswith(surface, path.pos)
             if not tail_starts_with:
                 logging.debug(f"Rejecting path {path}: tail doesnt start with {path.tail}-{surface}")
                 continue
@@ -109,23 +202,21 @@ class RuleBasedAnalyzer:
             surface_transition = SurfaceTransition(surface, transition)
 
             # if tail is equal to surface, no need to calculate phonetic attributes.
-            tail_equals_surface = path.tail == surface
+            tail_equals_surface = path.pos + len(surface) == len(path.word)
             attributes = path.phonetic_attributes if tail_equals_surface \
-                else calculate_phonetic_attributes(surface, frozenset(path.phonetic_attributes))
+                else calculate_phonetic_attributes(surface, path.phonetic_attributes)
 
             # This is required for suffixes like `cik` and `ciğ`
             # an extra attribute is added if "cik" or "ciğ" is generated and matches the tail.
             # if "cik" is generated, ExpectsConsonant attribute is added, so only a consonant starting
             # suffix can follow. Likewise, if "ciğ" is produced, a vowel starting suffix is allowed.
-            if PhoneticAttribute.CannotTerminate in attributes:
-                attributes.discard(PhoneticAttribute.CannotTerminate)
+            attributes &= ~PhoneticAttribute.CannotTerminate
             last_token = transition.last_template_token
             if last_token.type_ == 'LAST_VOICED':
-                attributes.add(PhoneticAttribute.ExpectsConsonant)
+                attributes |= PhoneticAttribute.ExpectsConsonant
             elif last_token.type_ == 'LAST_NOT_VOICED':
-                attributes.add(PhoneticAttribute.ExpectsVowel)
-                attributes.add(PhoneticAttribute.CannotTerminate)
-            p = path.copy(surface_transition, attributes)
+                attributes |= PhoneticAttribute.ExpectsVowel | PhoneticAttribute.CannotTerminate
+            p = path.copy(surface_transition, int(attributes))
             logging.debug(f"P path: {p}")
             new_paths.append(p)
         logging.debug(f"FINAL: ")
@@ -134,24 +225,64 @@ class RuleBasedAnalyzer:
         # print()
         return new_paths
 
-    # for preventing excessive branching during search, we remove paths that has more than
-    # MAX_REPEATING_SUFFIX_TYPE_COUNT morpheme-state types.
-    def prune_cyclic_paths(self, tokens):
+    def stem_lemmas(self, word) -> tuple:
+        """
+        Lemmas of the dictionary items with the longest stems `word` starts with, a cheap guess for words
+        whose search was truncated before any analysis was found.
+        """
+        candidates = self.stem_transitions.prefix_matches(word)
+        if not candidates:
+            return ()
+        length = max(len(c.surface) for c in candidates)
+        return tuple(dict.fromkeys(c.dict_item.lemma for c in candidates if len(c.surface) == length))
+
+    def bound_paths(self, paths, expansions: int):
+        """
+        Applies search limits to the live `paths` of a search that visited `expansions` paths so far.
+        Items of `paths` are search paths, or (state id, search path) pairs.
+        Returns the paths to expand and whether any paths were dropped.
+        """
+        limits = self.limits
+        truncated = False
+        if len(paths) > limits.prune_threshold:
+            pruned = self.prune_cyclic_paths(paths)
+            truncated = len(pruned) < len(paths)
+            paths = pruned
+        budget = min(limits.max_paths, limits.max_expansions - expansions)
+        if len(paths) > budget:
+            paths = paths[:max(budget, 0)]
+            truncated = True
+        return paths, truncated
+
+    def prune_cyclic_paths(self, paths):
+        """
+        For preventing excessive branching during search, removes paths that have the same suffix more
+        than `limits.max_repeating_suffix` times in a row. Empty transitions are skipped, states like
+        verbRoot_S are passed again after every derivation and do not count.
+        """
+        limit = self.limits.max_repeating_suffix
         result = []
-        for token in tokens:
-            remove = False
-            type_counts = {}
-            for node in token.transitions:
-                if type_counts.addOrIncrement(node.getState().id) > MAX_REPEATING_SUFFIX_TYPE_COUNT:
-                    remove = True
+        for item in paths:
+            path = item[1] if isinstance(item, tuple) else item
+            previous = None
+            repeats = 0
+            for transition in path.transitions:
+                if not transition.surface:
+                    continue
+                morpheme = transition.morpheme
+                repeats = repeats + 1 if morpheme is previous else 1
+                if repeats > limit:
                     break
-                if not remove:
-                    result.append(token)
+                previous = morpheme
+            else:
+                result.append(item)
         return result
 
 
 _Single_Analysis = collections.namedtuple('SingleAnalysis', 'stem, morphemes, derivation_count, dict_item, '
                                                             'group_boundaries')
+# pickle finds classes by their name, analyses are stored in snapshots with cached results.
+SingleAnalysis = _Single_Analysis
 
 
 def parse_analysis(search_path: SearchPath) -> _Single_Analysis:
@@ -0,0 +1,120 @@
+"""
+Precompiled analyzer snapshots.
+
+Building an analyzer means loading the lexicon, connecting the morphotactics graph and generating
+stem transitions for every dictionary item. A snapshot stores the result of all three steps in a
+single pickle file, so a new process can load it with one bulk read. Most of the load time is spent
+creating the Python objects of the lexicon and stem transitions, so it is a fraction of a build from
+the dictionaries, not a constant.
+
+A snapshot carries a hash of the source dictionaries and the package version. If any of them changed,
+the snapshot is considered stale and `load_snapshot` returns None.
+
+Analysis cache entries can be stored along with the analyzer, so a warmed cache is loaded in the
+same read.
+"""
+import gc
+import hashlib
+import io
+import os
+import pickle
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from trLemmer import __version__
+from trLemmer import morphotactics as mt
+from trLemmer.lexicon import RootLexicon
+
+SNAPSHOT_FORMAT = 10
+
+# Morpheme states are module level objects. They are stored by name and resolved to the objects of
+# the loading process, so conditions, graph and stem transitions keep pointing to the same states.
+_state_names = {state: name for name, state in vars(mt).items() if isinstance(state, mt.MorphemeState)}
+
+
+def source_hash():
+    """Hash of the package version and all bundled dictionary resources."""
+    h = hashlib.sha256()
+    h.update(f"{__version__}:{SNAPSHOT_FORMAT}".encode('utf8'))
+    resources = RootLexicon.DEFAULT_DICTIONARY_RESOURCES + [RootLexicon.BINARY_LEXICON_RESOURCE]
+    for resource in resources:
+        h.update(resource.encode('utf8'))
+        h.update((RootLexicon.RESOURCES_DIR / resource).read_bytes())
+    return h.hexdigest()
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if isinstance(obj, mt.MorphemeState):
+            return 'state', _state_names[obj]
+        if isinstance(obj, mt.Morpheme):
+            return 'morpheme', obj.id_
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind, name = pid
+        if kind == 'state':
+            return getattr(mt, name)
+        if kind == 'morpheme':
+            return mt.morphemes[name]
+        raise pickle.UnpicklingError(f"Unknown persistent id: {pid}")
+
+
+class Snapshot(NamedTuple):
+    morphotactics: object
+    cache_entries: List[Tuple]
+
+
+def save_snapshot(morphotactics, path, cache_entries=()):
+    """
+    Writes the lexicon, morphotactics graph and stem transitions of `morphotactics` to `path`.
+    :param cache_entries: (key, value) pairs of analysis cache entries to store with the analyzer.
+    """
+    header = {'format': SNAPSHOT_FORMAT, 'version': __version__, 'source_hash': source_hash()}
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        _SnapshotPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(Snapshot(morphotactics, list(cache_entries)))
+    # rename is atomic, so concurrent readers never see a partially written snapshot.
+    tmp_path.replace(path)
+
+
+def is_fresh(header):
+    return (header.get('format') == SNAPSHOT_FORMAT
+            and header.get('version') == __version__
+            and header.get('source_hash') == source_hash())
+
+
+def load_snapshot(path):
+    """
+    Loads a snapshot written by `save_snapshot`.
+    :return: TurkishMorphotactics object with connected graph and stem transitions,
+    or None if snapshot does not exist or is stale.
+    """
+    snapshot = read_snapshot(path)
+    return snapshot.morphotactics if snapshot is not None else None
+
+
+def read_snapshot(path) -> Optional[Snapshot]:
+    """ Same as `load_snapshot`, returns the stored analysis cache entries as well. """
+    path = Path(path)
+    if not path.exists():
+        return None
+    # the whole file is read with a single call and unpickled from memory.
+    stream = io.BytesIO(path.read_bytes())
+    header = pickle.load(stream)
+    if not is_fresh(header):
+        return None
+    # snapshot contains hundreds of thousands of small objects, garbage collection passes triggered
+    # while they are created take as long as unpickling itself.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        snapshot = _SnapshotUnpickler(stream).load()
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return snapshot
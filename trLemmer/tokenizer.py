@@ -0,0 +1,236 @@
+"""
+Turkish word tokenizer and sentence splitter.
+
+Tokens are found with a single regular expression. Words keep their apostrophe suffixes ("Ankara'da"),
+numbers keep decimal and thousands separators ("1.000,5"), and abbreviations of the bundled
+abbreviations dictionary, initials and dotted letter chains keep their periods ("Dr.", "A.", "T.C.").
+Sentences end at terminal punctuation that is followed by a token that can start a sentence, or at
+blank lines.
+
+`sentence_tokens` scans a text once and returns its sentences and tokens with their offsets in the text,
+and the normalized form of each token used for dictionary lookup.
+
+`NltkTokenizer` provides the same interface on top of nltk punkt models, if nltk is installed.
+"""
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+from trLemmer import tr
+
+ABBREVIATIONS_RESOURCE = Path(__file__).parent / 'resources' / 'tr' / 'abbreviations.dict'
+
+TERMINAL_PUNCTUATION = set(".!?…")
+# punctuation that belongs to the sentence before it when it follows a sentence end directly.
+CLOSING_PUNCTUATION = set("\"'”’»)]")
+# punctuation a sentence can start with.
+OPENING_PUNCTUATION = set("\"'“‘«([-–—")
+
+_BLANK_LINE = re.compile(r"\n[^\S\n]*\n")
+
+_TOKEN_RE = re.compile(
+    r"(?:https?://|www\.)[^\s\"'<>()]*[^\s\"'<>().,;:!?]"
+    r"|[\w.+-]+@\w+(?:[.-]\w+)*\.\w+"
+    r"|\d+(?:[.,:/]\d+)*(?:['’]\w+)?"
+    r"|(?:[^\W\d_]\.){2,}"
+    r"|\w+(?:['’-]\w+)*(?:(?P<period>\.)(?![\d_.]))?"
+    r"|\.\.\.|[!?]+|\S"
+)
+
+# a word and its period, as abbreviations glued to a previous one ("Dr." of "Prof.Dr.").
+_ABBREVIATION_PART_RE = re.compile(r"\w+\.(?![\d_.])")
+
+
+class Token(NamedTuple):
+    """ A token of a text. `text[start:end]` of the original text is `text`. """
+    text: str
+    normalized: str
+    start: int
+    end: int
+
+
+class Sentence(NamedTuple):
+    """ A sentence of a text. `text[start:end]` of the original text is `text`. """
+    text: str
+    start: int
+    end: int
+
+
+def normalize_token(token: str, folded: str = None) -> str:
+    """ Form of a token used for dictionary lookup: lower case, without circumflexes and apostrophes. """
+    folded = folded if folded is not None else tr.fold(token)
+    if "'" in folded or "’" in folded:
+        folded = folded.replace("'", "").replace("’", "")
+    return folded
+
+
+def load_abbreviations(path=ABBREVIATIONS_RESOURCE) -> Set[str]:
+    """
+    Reads abbreviations from a dictionary file, first word of each line without the period. Lower case
+    forms are added for abbreviations without vowels ("Vb" -> "vb"), those can not be regular words.
+    """
+    result = set()
+    with open(path, encoding='utf8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            abbreviation = line.split()[0].rstrip('.')
+            if not abbreviation:
+                continue
+            result.add(abbreviation)
+            lower = tr.lower(abbreviation)
+            if len(abbreviation) > 1 and not tr.contains_vowel(lower):
+                result.add(lower)
+    return result
+
+
+class TurkishTokenizer:
+    """
+    Regular expression based tokenizer and sentence splitter.
+
+        >>> tokenizer = TurkishTokenizer()
+        >>> tokenizer.tokenize("Dr. Ali 3,5 kg elma aldı.")
+        ['Dr.', 'Ali', '3,5', 'kg', 'elma', 'aldı', '.']
+        >>> tokenizer.split_sentences("Dün geldi. Bugün gitti!")
+        ['Dün geldi.', 'Bugün gitti!']
+
+    :param abbreviations: abbreviations without their period, the bundled dictionary by default.
+    """
+
+    def __init__(self, abbreviations: Iterable[str] = None):
+        self.abbreviations = set(abbreviations) if abbreviations is not None else load_abbreviations()
+
+    def spans(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """ Yields (token, start, end) triples of tokens of `text`. """
+        abbreviations = self.abbreviations
+        glued_end = 0
+        for match in _TOKEN_RE.finditer(text):
+            start, end = match.span()
+            if start < glued_end:
+                continue
+            if match.lastgroup == 'period':
+                # a word followed by a period is an abbreviation, an initial ("A. Veli"), or a word at the end
+                # of a sentence.
+                word_end = end - 1
+                word = text[start:word_end]
+                if word in abbreviations:
+                    # abbreviations glued together ("Prof.Dr.") are a single token.
+                    glued = _ABBREVIATION_PART_RE.match(text, end)
+                    while glued is not None and glued.group()[:-1] in abbreviations:
+                        end = glued_end = glued.end()
+                        glued = _ABBREVIATION_PART_RE.match(text, end)
+                elif not (len(word) == 1 and word.isupper()):
+                    yield word, start, word_end
+                    yield '.', word_end, end
+                    continue
+                yield text[start:end], start, end
+                continue
+            yield match.group(), start, end
+
+    def tokenize(self, text: str) -> List[str]:
+        """ Splits `text` into word, number and punctuation tokens. """
+        return [token for token, _, _ in self.spans(text)]
+
+    def tokens(self, text: str) -> List[Token]:
+        """ Tokens of `text` with their normalized forms and offsets. """
+        # text is folded once, normalized forms of tokens are slices of it.
+        folded = tr.fold(text)
+        return [Token(token, normalize_token(token, folded[start:end]), start, end)
+                for token, start, end in self.spans(text)]
+
+    def sentence_tokens(self, text: str) -> List[Tuple[Sentence, List[Token]]]:
+        """ Sentences of `text` and their tokens, with offsets in `text`. """
+        tokens = self.tokens(text)
+        result = []
+        for first, last in _sentence_ranges(text, tokens):
+            start, end = tokens[first].start, tokens[last - 1].end
+            result.append((Sentence(text[start:end], start, end), tokens[first:last]))
+        return result
+
+    def sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """ (start, end) offsets of the sentences of `text`. """
+        tokens = [Token(token, None, start, end) for token, start, end in self.spans(text)]
+        return [(tokens[first].start, tokens[last - 1].end) for first, last in _sentence_ranges(text, tokens)]
+
+    def split_sentences(self, text: str) -> List[str]:
+        """ Splits `text` into sentences. Sentences are substrings of `text`. """
+        return [text[start:end] for start, end in self.sentence_spans(text)]
+
+
+def _sentence_ranges(text: str, tokens: List[Token]) -> Iterator[Tuple[int, int]]:
+    """ Yields (first, last) index ranges of sentences in `tokens` of `text`. """
+    first = 0
+    i = 0
+    while i < len(tokens):
+        token, _, _, end = tokens[i]
+        i += 1
+        # lower case abbreviations ("vb.") can end a sentence, titles ("Dr.") can not.
+        if token[-1] in TERMINAL_PUNCTUATION and not token[0].isupper() and not token[0].isdigit():
+            # a period right after a number makes it an ordinal ("1. Dünya Savaşı"), it ends a sentence
+            # only before an opening quote or bracket, or a blank line.
+            ordinal = (token == '.' and i > 1 and tokens[i - 2].text.isdigit()
+                       and tokens[i - 2].end == tokens[i - 1].start)
+            # closing quotes and brackets right after the terminal punctuation belong to the sentence.
+            while i < len(tokens) and tokens[i].text in CLOSING_PUNCTUATION and tokens[i].start == end:
+                end = tokens[i].end
+                i += 1
+            if i < len(tokens) and not _starts_sentence(tokens[i].text):
+                continue
+            if (ordinal and i < len(tokens) and tokens[i].text[0] not in OPENING_PUNCTUATION
+                    and not _BLANK_LINE.search(text, end, tokens[i].start)):
+                continue
+        elif i < len(tokens) and not _BLANK_LINE.search(text, end, tokens[i].start):
+            continue
+        yield first, i
+        first = i
+
+
+def _starts_sentence(token: str) -> bool:
+    first = token[0]
+    return first.isupper() or first.isdigit() or first in OPENING_PUNCTUATION
+
+
+class NltkTokenizer:
+    """ Tokenizer and sentence splitter of nltk with Turkish punkt models, requires nltk and its data. """
+
+    def __init__(self):
+        try:
+            from nltk.tokenize import word_tokenize, sent_tokenize
+        except ImportError:
+            raise ImportError("nltk tokenizer requires nltk, install it with `pip install nltk`")
+        self._word_tokenize = word_tokenize
+        self._sent_tokenize = sent_tokenize
+
+    def tokenize(self, text: str) -> List[str]:
+        return self._word_tokenize(text.replace("'", "").replace("’", ""), language="turkish")
+
+    def split_sentences(self, text: str) -> List[str]:
+        return self._sent_tokenize(text, language="turkish")
+
+    def tokens(self, text: str, start: int = 0, end: int = None) -> List[Token]:
+        """
+        Tokens of `text[start:end]`. nltk does not report offsets, tokens are searched in the text; a token
+        nltk changed (quotes, removed apostrophes) gets the empty span at the end of the previous token.
+        """
+        end = end if end is not None else len(text)
+        result = []
+        position = start
+        for token in self.tokenize(text[start:end]):
+            token_start = text.find(token, position, end)
+            if token_start < 0:
+                token_start = token_end = position
+            else:
+                token_end = position = token_start + len(token)
+            result.append(Token(token, normalize_token(token), token_start, token_end))
+        return result
+
+    def sentence_tokens(self, text: str) -> List[Tuple[Sentence, List[Token]]]:
+        result = []
+        position = 0
+        for sentence in self.split_sentences(text):
+            start = text.find(sentence, position)
+            start = start if start >= 0 else position
+            end = position = start + len(sentence)
+            result.append((Sentence(sentence, start, end), self.tokens(text, start, end)))
+        return result
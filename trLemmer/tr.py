@@ -109,3 +109,16 @@ decircumflex = str.maketrans(circumflex, noncircumflex)
 
 def normalize_circumflex(word):
     return word.translate(decircumflex)
+
+
+# lower case and circumflex normalization in a single translation. Every character is mapped to a single
+# character, so offsets in the folded text are the same as in the original text.
+fold_table = {code: ord(normalize_circumflex(chr(lower_code)))
+              for code, lower_code in upper_to_lower.items()}
+for code, plain_code in decircumflex.items():
+    fold_table.setdefault(code, plain_code)
+
+
+def fold(text):
+    """ Same as normalize_circumflex(lower(text)), keeps the length of text. """
+    return text.translate(fold_table)